@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+
+# local stand-in for the ASCIO APIv3 (SOAP) and the TLDKit (JSON) => benchmarks can run without touching the real registrar
+#   GET  /v3/aws.wsdl        => minimal v3 wsdl (only the operations & fields used by the collection)
+#   POST /v3/aws             => GetDomains, AvailabilityInfo, CreateOrder, GetOrder
+#   GET  /tldkit/<TLD>       => TLDKit document (supports ETag/If-None-Match)
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from threading import Thread, Lock
+from time import sleep
+from random import random
+from json import dumps as json_dumps
+from xml.sax.saxutils import escape
+from datetime import datetime, timedelta, timezone
+from argparse import ArgumentParser
+from xml.etree.ElementTree import fromstring as xml_fromstring
+
+NS = 'http://www.ascio.com/2013/02'
+SOAP_NS = 'http://schemas.xmlsoap.org/soap/envelope/'
+NIL = 'xmlns:i="http://www.w3.org/2001/XMLSchema-instance" i:nil'  # the api sends empty fields as nil-elements
+TLDS = ['com', 'net', 'org', 'de', 'at', 'it', 'eu', 'fr']
+TLDKIT_COMMANDS = [
+    'REGISTER', 'DELETE', 'CONTACT UPDATE', 'NAMESERVER UPDATE', 'OWNER CHANGE', 'RENEW', 'TRANSFER', 'AUTORENEW',
+    'RESTORE', 'EXPIRE', 'REGISTRANT DETAILS UPDATE', 'TRANSFER AWAY',
+]
+CONTACT_FIELDS = [
+    'FirstName', 'LastName', 'OrgName', 'Address1', 'Address2', 'City', 'State', 'PostalCode', 'CountryCode', 'Phone',
+    'Fax', 'Email', 'Type', 'Details', 'OrganisationNumber', 'Number', 'VatNumber', 'RegistrantDate', 'Handle',
+]
+GET_DOMAINS_FIELDS = [
+    ('OrderSort', 'xs:string'), ('Status', 'xs:string'), ('Tlds', 'tns:ArrayOfstring'), ('ObjectNames', 'tns:ArrayOfstring'),
+    ('DomainType', 'xs:string'), ('DomainComment', 'xs:string'), ('ExpireFromDate', 'xs:dateTime'), ('ExpireToDate', 'xs:dateTime'),
+    ('PageInfo', 'tns:PagingInfo'), ('CreationFromDate', 'xs:dateTime'), ('CreationToDate', 'xs:dateTime'),
+    ('Handles', 'tns:ArrayOfstring'), ('OwnerName', 'xs:string'), ('OwnerOrganizationName', 'xs:string'), ('OwnerEmail', 'xs:string'),
+    ('ContactFirstName', 'xs:string'), ('ContactLastName', 'xs:string'), ('ContactOrganizationName', 'xs:string'),
+    ('ContactEmail', 'xs:string'), ('NameServerHostName', 'xs:string'), ('NameServerIPv4', 'xs:string'),
+    ('NameServerIPv6', 'xs:string'), ('CustomerReferenceExternalId', 'xs:string'), ('CustomerReferenceDescription', 'xs:string'),
+]
+RESULT_FIELDS = [('ResultCode', 'xs:int'), ('ResultMessage', 'xs:string'), ('Errors', 'tns:ArrayOfstring')]
+OPERATIONS = {
+    # operation: (request-type, response-type)
+    'GetDomains': ('GetDomainsRequest', 'GetDomainsResponse'),
+    'AvailabilityInfo': ('AvailabilityInfoRequest', 'AvailabilityInfoResponse'),
+    'CreateOrder': ('DomainOrderRequest', 'CreateOrderResponse'),
+    'GetOrder': ('GetOrderRequest', 'GetOrderResponse'),
+}
+
+
+def _complex_type(name: str, fields: list) -> str:
+    elements = ''.join(
+        f'<xs:element name="{field}" type="{field_type}" minOccurs="0" maxOccurs="{"unbounded" if many else 1}" nillable="true"/>'
+        for field, field_type, many in [(*field, False) if len(field) == 2 else field for field in fields]
+    )
+    return f'<xs:complexType name="{name}"><xs:sequence>{elements}</xs:sequence></xs:complexType>'
+
+
+def build_wsdl(address: str) -> str:
+    contact = [(field, 'xs:string') for field in CONTACT_FIELDS]
+    types = [
+        _complex_type('ArrayOfstring', [('string', 'xs:string', True)]),
+        _complex_type('PagingInfo', [('PageIndex', 'xs:int'), ('PageSize', 'xs:int')]),
+        _complex_type('Contact', contact),
+        _complex_type('NameServer', [('HostName', 'xs:string'), ('IpAddress', 'xs:string'), ('IpV6Address', 'xs:string'), ('Handle', 'xs:string')]),
+        _complex_type('NameServers', [(f'NameServer{i}', 'tns:NameServer') for i in range(1, 14)]),
+        _complex_type('Trademark', [('Country', 'xs:string'), ('Name', 'xs:string'), ('Number', 'xs:string')]),
+        _complex_type('PrivacyProxy', [('Type', 'xs:string')]),
+        _complex_type('DomainInfo', [
+            ('DomainName', 'xs:string'), ('DomainHandle', 'xs:string'), ('Status', 'xs:string'), ('Comment', 'xs:string'),
+            ('Created', 'xs:dateTime'), ('Expires', 'xs:dateTime'), ('Owner', 'tns:Contact'), ('Admin', 'tns:Contact'),
+            ('Tech', 'tns:Contact'), ('Billing', 'tns:Contact'), ('Reseller', 'tns:Contact'), ('NameServers', 'tns:NameServers'),
+            ('DnsSecKeys', 'tns:ArrayOfstring'), ('PrivacyProxy', 'tns:PrivacyProxy'), ('Trademark', 'tns:Trademark'),
+        ]),
+        _complex_type('ArrayOfDomainInfo', [('DomainInfo', 'tns:DomainInfo', True)]),
+        _complex_type('GetDomainsRequest', GET_DOMAINS_FIELDS),
+        _complex_type('GetDomainsResponse', [*RESULT_FIELDS, ('DomainInfos', 'tns:ArrayOfDomainInfo'), ('TotalCount', 'xs:int')]),
+        _complex_type('AvailabilityInfoRequest', [('DomainName', 'xs:string'), ('Quality', 'xs:string')]),
+        _complex_type('Product', [('OrderType', 'xs:string'), ('ObjectType', 'xs:string'), ('Period', 'xs:int')]),
+        _complex_type('PriceInfo', [('Price', 'xs:decimal'), ('Currency', 'xs:string'), ('Product', 'tns:Product')]),
+        _complex_type('ArrayOfPriceInfo', [('PriceInfo', 'tns:PriceInfo', True)]),
+        _complex_type('AvailabilityInfoResponse', [
+            *RESULT_FIELDS, ('DomainName', 'xs:string'), ('DomainType', 'xs:string'), ('Currency', 'xs:string'),
+            ('Prices', 'tns:ArrayOfPriceInfo'),
+        ]),
+        _complex_type('Domain', [
+            ('Name', 'xs:string'), ('Owner', 'tns:Contact'), ('Admin', 'tns:Contact'), ('Tech', 'tns:Contact'),
+            ('Billing', 'tns:Contact'), ('NameServers', 'tns:NameServers'), ('DiscloseSocialData', 'xs:string'),
+            ('LocalPresence', 'xs:string'), ('Trademark', 'tns:Trademark'),
+        ]),
+        _complex_type('DomainOrderRequest', [('Type', 'xs:string'), ('Domain', 'tns:Domain'), ('Comments', 'xs:string')]),
+        _complex_type('OrderInfo', [('OrderId', 'xs:string'), ('Status', 'xs:string'), ('Type', 'xs:string'), ('Created', 'xs:dateTime')]),
+        _complex_type('CreateOrderResponse', [*RESULT_FIELDS, ('OrderInfo', 'tns:OrderInfo')]),
+        _complex_type('GetOrderRequest', [('OrderId', 'xs:string')]),
+        _complex_type('GetOrderResponse', [*RESULT_FIELDS, ('OrderInfo', 'tns:OrderInfo')]),
+    ]
+    elements = ''.join(
+        f'<xs:element name="{operation}"><xs:complexType><xs:sequence>'
+        f'<xs:element name="request" type="tns:{request}" minOccurs="0" nillable="true"/>'
+        f'</xs:sequence></xs:complexType></xs:element>'
+        f'<xs:element name="{operation}Response"><xs:complexType><xs:sequence>'
+        f'<xs:element name="{operation}Result" type="tns:{response}" minOccurs="0" nillable="true"/>'
+        f'</xs:sequence></xs:complexType></xs:element>'
+        for operation, (request, response) in OPERATIONS.items()
+    )
+    messages = ''.join(
+        f'<wsdl:message name="{operation}In"><wsdl:part name="parameters" element="tns:{operation}"/></wsdl:message>'
+        f'<wsdl:message name="{operation}Out"><wsdl:part name="parameters" element="tns:{operation}Response"/></wsdl:message>'
+        for operation in OPERATIONS
+    )
+    port_operations = ''.join(
+        f'<wsdl:operation name="{operation}"><wsdl:input message="tns:{operation}In"/><wsdl:output message="tns:{operation}Out"/></wsdl:operation>'
+        for operation in OPERATIONS
+    )
+    binding_operations = ''.join(
+        f'<wsdl:operation name="{operation}"><soap:operation soapAction="{NS}/IAscioService/{operation}" style="document"/>'
+        f'<wsdl:input><soap:body use="literal"/></wsdl:input><wsdl:output><soap:body use="literal"/></wsdl:output></wsdl:operation>'
+        for operation in OPERATIONS
+    )
+
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        f'<wsdl:definitions xmlns:wsdl="http://schemas.xmlsoap.org/wsdl/" xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/" '
+        f'xmlns:xs="http://www.w3.org/2001/XMLSchema" xmlns:tns="{NS}" targetNamespace="{NS}">'
+        f'<wsdl:types><xs:schema targetNamespace="{NS}" elementFormDefault="qualified">{"".join(types)}{elements}</xs:schema></wsdl:types>'
+        f'{messages}'
+        f'<wsdl:portType name="IAscioService">{port_operations}</wsdl:portType>'
+        f'<wsdl:binding name="BasicHttpBinding_IAscioService" type="tns:IAscioService">'
+        f'<soap:binding transport="http://schemas.xmlsoap.org/soap/http"/>{binding_operations}</wsdl:binding>'
+        f'<wsdl:service name="AscioService"><wsdl:port name="BasicHttpBinding_IAscioService" binding="tns:BasicHttpBinding_IAscioService">'
+        f'<soap:address location="{address}"/></wsdl:port></wsdl:service>'
+        '</wsdl:definitions>'
+    )
+
+
+def _xml(key: str, value) -> str:
+    if value is None:
+        return f'<{key} {NIL}="true"/>'
+
+    if isinstance(value, list):
+        return ''.join(_xml(key, entry) for entry in value)
+
+    if isinstance(value, dict):
+        if all(sub_value == [] for sub_value in value.values()):
+            # empty arrays => zeep only parses empty elements into objects if they carry an attribute
+            return f'<{key} {NIL}="false"/>'
+
+        return f"<{key}>{''.join(_xml(sub_key, sub_value) for sub_key, sub_value in value.items())}</{key}>"
+
+    return f'<{key}>{escape(str(value))}</{key}>'
+
+
+def _contact(name: str, role: str) -> dict:
+    return {
+        'FirstName': 'Max', 'LastName': 'Mustermann', 'OrgName': 'Example GmbH', 'Address1': 'Street 1', 'City': 'Graz',
+        'PostalCode': '8010', 'CountryCode': 'AT', 'Phone': '+43.1234567', 'Email': f'{role}@{name}',
+        'Handle': f'{role[:3].upper()}{abs(hash(name)) % 100000}',
+    }
+
+
+def build_portfolio(size: int) -> list:
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    domains = []
+
+    for i in range(size):
+        name = f'domain{i:06d}.{TLDS[i % len(TLDS)]}'
+        domains.append({
+            'DomainName': name,
+            'DomainHandle': f'DOM{i:08d}',
+            'Status': 'ACTIVE',
+            'Comment': None,
+            'Created': (now - timedelta(days=size - i)).isoformat(),
+            'Expires': (now + timedelta(days=i % 365)).isoformat(),
+            'Owner': _contact(name=name, role='owner'),
+            'Admin': _contact(name=name, role='admin'),
+            'Tech': _contact(name=name, role='tech'),
+            'Billing': _contact(name=name, role='billing'),
+            'NameServers': {
+                f'NameServer{n}': {'HostName': f'ns{n}.example.net' if n <= 2 else None, 'IpAddress': None, 'IpV6Address': None}
+                for n in range(1, 14)
+            },
+            'DnsSecKeys': {'string': [f'key-{i}-{n}' for n in range(2)]},
+            'PrivacyProxy': {'Type': 'None'},
+            'Trademark': {'Country': None},
+        })
+
+    return domains
+
+
+def build_tldkit(tld: str) -> dict:
+    # big enough to be comparable to the real documents
+    return {
+        'Tld': tld,
+        'LocalPresenceOffered': tld in ['de', 'it', 'eu', 'fr'],
+        'LocalPresenceRequired': tld in ['it'],
+        'Processes': [
+            {
+                'Command': command,
+                'DocumentationRequired': tld == 'it' and command == 'OWNER CHANGE',
+                'Procedure': 'Contact roles does not exist' if tld == 'eu' and command == 'CONTACT UPDATE' else f'{command} procedure. ' * 40,
+                'Notes': [f'note {n}' for n in range(20)],
+            } for command in TLDKIT_COMMANDS
+        ],
+        'Rules': {f'rule{n}': 'x' * 200 for n in range(200)},
+    }
+
+
+class FakeAscio:
+    def __init__(self, portfolio_size: int = 10000, latency: float = 0.0, fail_rate: float = 0.0):
+        self.portfolio = build_portfolio(size=portfolio_size)
+        self.names = {domain['DomainName'] for domain in self.portfolio}
+        self.latency = latency
+        self.fail_rate = fail_rate  # share of calls answered with 'HTTP 503' => transient faults
+        self.orders = 0
+        self._lock = Lock()
+
+    @staticmethod
+    def _success(**fields) -> dict:
+        return {'ResultCode': 200, 'ResultMessage': 'OK', 'Errors': {'string': []}, **fields}
+
+    def get_domains(self, request: dict) -> dict:
+        names = set(request.get('ObjectNames') or [])
+        tlds = set(request.get('Tlds') or [])
+        handles = set(request.get('Handles') or [])
+        owner_email = request.get('OwnerEmail')
+        nameserver = request.get('NameServerHostName')
+        domains = [
+            domain for domain in self.portfolio
+            if (len(names) == 0 or domain['DomainName'] in names) and (len(tlds) == 0 or domain['DomainName'].rsplit('.', 1)[1] in tlds)
+            and (len(handles) == 0 or domain['DomainHandle'] in handles)
+            and (owner_email is None or domain['Owner']['Email'] == owner_email)
+            and (nameserver is None or any(ns['HostName'] == nameserver for ns in domain['NameServers'].values()))
+        ]
+        page_size = int(request.get('PageSize') or 1000)
+        page_index = int(request.get('PageIndex') or 1)
+        page = domains[(page_index - 1) * page_size:page_index * page_size]
+        return self._success(DomainInfos={'DomainInfo': page}, TotalCount=len(domains))
+
+    def availability_info(self, request: dict) -> dict:
+        name = request.get('DomainName')
+        available = name not in self.names
+        return {
+            **self._success(),
+            'ResultMessage': 'Available' if available else 'Not Available',
+            'DomainName': name,
+            'DomainType': 'Premium' if name.startswith('premium') else 'Standard',
+            'Currency': 'EUR',
+            'Prices': {'PriceInfo': [
+                {'Price': '12.50', 'Currency': 'EUR', 'Product': {'OrderType': order_type, 'ObjectType': 'Domain', 'Period': 1}}
+                for order_type in ['Register', 'Renew', 'Transfer']
+            ]},
+        }
+
+    def create_order(self, request: dict) -> dict:
+        with self._lock:
+            self.orders += 1
+            order_id = f'TEST{self.orders:08d}'
+
+        return self._success(OrderInfo={'OrderId': order_id, 'Status': 'Received', 'Type': request.get('Type')})
+
+    def get_order(self, request: dict) -> dict:
+        return self._success(OrderInfo={'OrderId': request.get('OrderId'), 'Status': 'Completed'})
+
+    def handle(self, operation: str, request: dict) -> dict:
+        if self.latency > 0:
+            sleep(self.latency)
+
+        return {
+            'GetDomains': self.get_domains,
+            'AvailabilityInfo': self.availability_info,
+            'CreateOrder': self.create_order,
+            'GetOrder': self.get_order,
+        }[operation](request)
+
+
+def _localname(element) -> str:
+    return element.tag.rsplit('}', 1)[-1]
+
+
+def _parse_request(body: bytes) -> tuple:
+    # flat view of the request => enough for the fake
+    envelope = xml_fromstring(body)
+    operation = envelope.find(f'{{{SOAP_NS}}}Body')[0]
+    request = {}
+
+    for element in operation.iter():
+        name = _localname(element)
+
+        if name in ['ObjectNames', 'Tlds', 'Handles']:
+            request[name] = [child.text for child in element]
+
+        elif len(element) == 0 and element.text is not None:
+            request.setdefault(name, element.text)
+
+    return _localname(operation), request
+
+
+def make_handler(fake: FakeAscio):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True  # headers and body are written separately => would add ~40ms per call
+
+        def _send(self, status: int, body: bytes, content_type: str, headers: dict = None):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path.startswith('/v3/aws.wsdl'):
+                address = f'http://{self.headers["Host"]}/v3/aws'
+                self._send(200, build_wsdl(address=address).encode('utf-8'), 'text/xml; charset=utf-8')
+
+            elif self.path.startswith('/tldkit/'):
+                tld = self.path.rsplit('/', 1)[1]
+                etag = f'"{tld}-1"'
+                if self.headers.get('If-None-Match') == etag:
+                    self._send(304, b'', 'application/json')
+
+                else:
+                    if fake.latency > 0:
+                        sleep(fake.latency)
+
+                    self._send(200, json_dumps(build_tldkit(tld=tld)).encode('utf-8'), 'application/json', {'ETag': etag})
+
+            else:
+                self._send(404, b'', 'text/plain')
+
+        def do_POST(self):
+            if fake.fail_rate > 0 and random() < fake.fail_rate:
+                self.rfile.read(int(self.headers['Content-Length']))
+                self._send(503, b'Service Unavailable', 'text/plain')
+                return
+
+            operation, request = _parse_request(self.rfile.read(int(self.headers['Content-Length'])))
+            result = fake.handle(operation=operation, request=request)
+            body = (
+                f'<s:Envelope xmlns:s="{SOAP_NS}"><s:Body>'
+                f'<{operation}Response xmlns="{NS}">{_xml(f"{operation}Result", result)}</{operation}Response>'
+                '</s:Body></s:Envelope>'
+            )
+            self._send(200, body.encode('utf-8'), 'text/xml; charset=utf-8')
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # default of 5 drops connections of concurrent clients
+
+
+def start(
+        port: int = 0, portfolio_size: int = 10000, latency: float = 0.0, fail_rate: float = 0.0, background: bool = True,
+) -> ThreadingHTTPServer:
+    # port 0 => random free port; see server.server_address
+    #   background: serve in a daemon-thread; else the caller has to run server.serve_forever()
+    fake = FakeAscio(portfolio_size=portfolio_size, latency=latency, fail_rate=fail_rate)
+    server = _Server(('127.0.0.1', port), make_handler(fake))
+    if background:
+        Thread(target=server.serve_forever, daemon=True).start()
+
+    return server
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Fake ASCIO APIv3 & TLDKit server')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--portfolio-size', type=int, default=10000)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every api-call')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='Share of api-calls that fail with HTTP 503')
+    cli = parser.parse_args()
+
+    fake_server = start(
+        port=cli.port, portfolio_size=cli.portfolio_size, latency=cli.latency, fail_rate=cli.fail_rate, background=False,
+    )
+    print(f'WSDL:   http://127.0.0.1:{cli.port}/v3/aws.wsdl')
+    print(f'TLDKit: http://127.0.0.1:{cli.port}/tldkit')
+    print('export ASCIO_API_WSDL=... ASCIO_TLDKIT_URL=... to use it')
+
+    try:
+        fake_server.serve_forever()
+
+    except KeyboardInterrupt:
+        pass
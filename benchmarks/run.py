@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+
+# offline benchmarks of the hot paths => runs against the local fake-server (see fake_server.py)
+#   python3 benchmarks/run.py [--portfolio-size 10000] [--rounds 20] [--latency 0.0] [--json results.json]
+
+from os import environ, path, symlink, makedirs
+from sys import path as sys_path
+from tempfile import mkdtemp
+from time import perf_counter
+from statistics import median
+from json import dumps as json_dumps
+from argparse import ArgumentParser
+from traceback import format_exc
+
+from fake_server import start
+
+REPO_DIR = path.dirname(path.dirname(path.abspath(__file__)))
+USER = 'benchmark'
+PASSWORD = 'benchmark'
+CREDENTIALS = {'user': USER, 'password': PASSWORD}
+CONTACT = {
+    'FirstName': 'Max', 'LastName': 'Mustermann', 'OrgName': 'Example GmbH', 'Address1': 'Street 1', 'City': 'Graz',
+    'PostalCode': '8010', 'CountryCode': 'AT', 'Phone': '+43.1234567',
+}
+
+
+class FakeModule:
+    # minimal stand-in for the AnsibleModule used by the register-module
+    def __init__(self, params: dict, check_mode: bool):
+        self.params = params
+        self.check_mode = check_mode
+
+    def warn(self, msg: str):
+        pass
+
+    def fail_json(self, **kwargs):
+        raise RuntimeError(kwargs)
+
+
+class FakeEnvironment:  # pylint: disable=R0903
+    # fake-server & the environment pointing the collection to it; close() restores the previous state
+    #   the collection is linked into '<tmp_dir>/collections/ansible_collections' => it can be imported without installing it
+    def __init__(self, tmp_dir: str, portfolio_size: int, latency: float, fail_rate: float = 0.0):
+        self.server = start(portfolio_size=portfolio_size, latency=latency, fail_rate=fail_rate)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        self.collections_dir = f'{tmp_dir}/collections'
+
+        # must be set before the collection gets imported
+        env = {
+            'ASCIO_API_WSDL': f'{self.url}/v3/aws.wsdl',
+            'ASCIO_TLDKIT_URL': f'{self.url}/tldkit',
+            'ASCIO_WSDL_CACHE_FILE': f'{tmp_dir}/wsdl.sqlite',
+            'ASCIO_RATE_LIMIT_DIR': tmp_dir,
+            'ASCIO_CIRCUIT_DIR': tmp_dir,
+            # measure the code, not the limiter
+            'ASCIO_RATE_LIMIT': environ.get('ASCIO_RATE_LIMIT', '0'),
+            'ASCIO_TLDKIT_RATE_LIMIT': environ.get('ASCIO_TLDKIT_RATE_LIMIT', '0'),
+        }
+        self.previous_env = {key: environ.get(key) for key in env}
+        environ.update(env)
+
+        makedirs(f'{self.collections_dir}/ansible_collections/niceshopsorg')
+        symlink(REPO_DIR, f'{self.collections_dir}/ansible_collections/niceshopsorg/ascio')
+        sys_path.insert(0, self.collections_dir)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+        for key, value in self.previous_env.items():
+            if value is None:
+                environ.pop(key, None)
+
+            else:
+                environ[key] = value
+
+        if self.collections_dir in sys_path:
+            sys_path.remove(self.collections_dir)
+
+
+def _stats(name: str, durations: list, items: int) -> dict:
+    durations = sorted(durations)
+
+    def _percentile(p: int) -> float:
+        return durations[min(len(durations) - 1, int(len(durations) * p / 100))]
+
+    return {
+        'name': name,
+        'rounds': len(durations),
+        'throughput': round(items * len(durations) / sum(durations), 1),  # items per second
+        'p50_ms': round(median(durations) * 1000, 2),
+        'p90_ms': round(_percentile(90) * 1000, 2),
+        'p99_ms': round(_percentile(99) * 1000, 2),
+        'max_ms': round(durations[-1] * 1000, 2),
+    }
+
+
+def bench(name: str, func, rounds: int, items: int = 1) -> dict:
+    try:
+        func()  # warm-up => wsdl-loading and caches are measured separately
+
+        durations = []
+        for _ in range(rounds):
+            start_time = perf_counter()
+            func()
+            durations.append(perf_counter() - start_time)
+
+        return _stats(name=name, durations=durations, items=items)
+
+    # pylint: disable=W0718
+    except Exception as error:
+        return {'name': name, 'error': str(error), 'traceback': format_exc()}
+
+
+def register_params(tmp_dir: str) -> dict:
+    return {
+        **CREDENTIALS, 'domain': 'domain000001.net', 'nameservers': ['ns1.example.net', 'ns2.example.net'],
+        'contact_owner': CONTACT, 'contact_admin': CONTACT, 'contact_tech': CONTACT, 'contact_billing': CONTACT,
+        'premium': False, 'max_price': None, 'whois_hide': False, 'update_only_ns': False, 'force': False,
+        'tld_cache': tmp_dir, 'lp': False, 'index_max_age': None, 'error_patterns': None,
+        'plan_file': None, 'apply_plan': False, 'skip_pending_orders': False,
+    }
+
+
+def _benchmarks(tmp_dir: str, portfolio_size: int) -> list:
+    # pylint: disable=C0415,E0401
+    from ansible_collections.niceshopsorg.ascio.plugins.module_utils.api_base import ascio_api
+    from ansible_collections.niceshopsorg.ascio.plugins.module_utils.api_async import ascio_api_many
+    from ansible_collections.niceshopsorg.ascio.plugins.module_utils.api_get_domains import ascio_get_domains
+    from ansible_collections.niceshopsorg.ascio.plugins.module_utils import tldkit
+    from ansible_collections.niceshopsorg.ascio.plugins.modules.register import Register
+    from ansible_collections.niceshopsorg.ascio.plugins.filter.ascio_get import FilterModule
+
+    page_size = len(ascio_get_domains(params={**CREDENTIALS, 'results_page': 1})['DomainInfos']['DomainInfo'])
+    filter_result = {'data': ascio_get_domains(params={**CREDENTIALS, 'all_pages': True})['DomainInfos']}
+    filters = FilterModule().filters()
+    params = register_params(tmp_dir=tmp_dir)
+    availability_calls = [
+        {'method': 'AvailabilityInfo', **CREDENTIALS, 'request': {'DomainName': f'free{i}.com', 'Quality': 'Smart'}}
+        for i in range(50)
+    ]
+
+    def _tldkit_cold():
+        tldkit._REGISTRY.clear()  # pylint: disable=W0212
+        tldkit.TLD(user=USER, password=PASSWORD, domain='it', tld_cache=mkdtemp(dir=tmp_dir)).docs_required()
+
+    def _tldkit_warm():
+        tldkit.TLD(user=USER, password=PASSWORD, domain='it', tld_cache=tmp_dir).docs_required()
+
+    return [
+        ('get_domains.page', lambda: ascio_get_domains(params={**CREDENTIALS, 'results_page': 1}), page_size),
+        ('get_domains.all_pages', lambda: ascio_get_domains(params={**CREDENTIALS, 'all_pages': True}), portfolio_size),
+        ('get_domains.filter_owner', lambda: ascio_get_domains(
+            params={**CREDENTIALS, 'filter_owner_email': 'owner@domain000001.net'},
+        ), 1),
+        ('api.availability', lambda: ascio_api(
+            method='AvailabilityInfo', **CREDENTIALS, request={'DomainName': 'free.com', 'Quality': 'Smart'},
+        ), 1),
+        ('api_async.availability_x50', lambda: ascio_api_many(calls=availability_calls), len(availability_calls)),
+        ('register.check', lambda: Register(module=FakeModule(params=params, check_mode=True)).check(), 1),
+        ('register.set', lambda: Register(module=FakeModule(params=params, check_mode=False)).set(), 1),
+        ('tldkit.cold', _tldkit_cold, 1),
+        ('tldkit.warm', _tldkit_warm, 1),
+        ('filter.results', lambda: filters['ascio_filter_results'](filter_result), portfolio_size),
+        ('filter.csv', lambda: filters['ascio_write_domain_csv'](
+            filters['ascio_filter_results'](filter_result), f'{tmp_dir}/domains.csv',
+        ), portfolio_size),
+    ]
+
+
+def main():
+    parser = ArgumentParser(description='Offline benchmarks of the ASCIO collection')
+    parser.add_argument('--portfolio-size', type=int, default=10000, help='Domains served by the fake-server')
+    parser.add_argument('--rounds', type=int, default=20, help='Measured rounds per benchmark')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds the fake-server adds to every call')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='Share of api-calls the fake-server fails with HTTP 503')
+    parser.add_argument('--json', type=str, default=None, help='Write the results to this file')
+    args = parser.parse_args()
+
+    tmp_dir = mkdtemp(prefix='ascio_benchmark_')
+    fake = FakeEnvironment(tmp_dir=tmp_dir, portfolio_size=args.portfolio_size, latency=args.latency, fail_rate=args.fail_rate)
+    print(f'Fake-server: {fake.url} | Portfolio: {args.portfolio_size} domains | Rounds: {args.rounds}\n')
+
+    results = []
+    for name, func, items in _benchmarks(tmp_dir=tmp_dir, portfolio_size=args.portfolio_size):
+        result = bench(name=name, func=func, rounds=args.rounds, items=items)
+        results.append(result)
+
+        if 'error' in result:
+            print(f"{name:<30} FAILED: {result['error']}")
+
+        else:
+            print(
+                f"{name:<30} {result['throughput']:>10}/s  p50 {result['p50_ms']:>8}ms  p90 {result['p90_ms']:>8}ms  "
+                f"p99 {result['p99_ms']:>8}ms  max {result['max_ms']:>8}ms"
+            )
+
+    fake.close()
+    if args.json is not None:
+        with open(args.json, 'w', encoding='utf-8') as target:
+            target.write(json_dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
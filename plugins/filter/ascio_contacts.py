@@ -0,0 +1,16 @@
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.contacts import contact_rules
+
+
+class FilterModule(object):
+
+    def filters(self):
+        return {
+            "ascio_contacts": self.contacts,
+        }
+
+    @staticmethod
+    def contacts(domains: list, tld_config, contacts: dict = None) -> dict:
+        # builds the contacts of all domains using the tld-config (dict or path to the json-file)
+        #   contacts: overwrite the defaults of the config; 'all' or per role => {'owner': {'Email': ..}}
+        #   => {'domains': entries for the 'domains' param of the register-module, 'errors': {domain: errors}}
+        return contact_rules(config=tld_config).normalize(domains=domains, contacts=contacts)
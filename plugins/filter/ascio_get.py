@@ -1,4 +1,13 @@
 from csv import DictWriter
+from functools import lru_cache
+
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.projection import DomainProjection
+
+
+@lru_cache(maxsize=32)
+def _projection(remove_fields: tuple, keep_fields: tuple) -> DomainProjection:
+    # filters are evaluated on every templating => the projection is only compiled once per field-selection
+    return DomainProjection(remove_fields=list(remove_fields), keep_fields=list(keep_fields))
 
 
 class FilterModule(object):
@@ -10,34 +19,17 @@ class FilterModule(object):
         }
 
     @staticmethod
-    def filter_results(result: dict, remove_fields: list = None) -> dict:
+    def filter_results(result: dict, remove_fields: list = None, keep_fields: list = None) -> dict:
         # will only output domain and its nameservers (cleaned)
-        domains = {}
-        if remove_fields is None:
-            remove_fields = []
-
-        remove_fields.append('DomainName')
-
+        #   keep_fields/remove_fields can address nested fields by path: 'Owner.Email'
         if 'data' not in result:
-            return domains
-
-        for domain_raw in result['data']['DomainInfo']:
-            domain_simple = {**domain_raw, 'NameServers': []}
-            for field in remove_fields:
-                try:
-                    domain_simple.pop(field)
-
-                except KeyError:
-                    pass
-
-            for ns in domain_raw['NameServers'].values():
-                for ns_field in ['HostName', 'IpAddress', 'IpV6Address']:
-                    if ns[ns_field] is not None:
-                        domain_simple['NameServers'].append(ns[ns_field])
-
-            domains[domain_raw['DomainName']] = domain_simple
+            return {}
 
-        return domains
+        projection = _projection(
+            remove_fields=(*(remove_fields or []), 'DomainName'),
+            keep_fields=tuple(keep_fields or []),
+        )
+        return projection.by_name(result['data']['DomainInfo'])
 
     @staticmethod
     def write_domain_csv(data: dict, file: str) -> bool:
@@ -48,7 +40,7 @@ class FilterModule(object):
         try:
             columns = list(data_list[0].keys())
 
-            with open(file, 'w', encoding='uft-8') as target:
+            with open(file, 'w', encoding='utf-8', newline='') as target:
                 writer = DictWriter(target, fieldnames=columns)
                 writer.writeheader()
                 for entry in data_list:
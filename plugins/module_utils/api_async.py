@@ -0,0 +1,113 @@
+from asyncio import run as asyncio_run
+from asyncio import Semaphore, gather
+from sys import exc_info as sys_exc_info
+from threading import Lock
+
+from httpx import AsyncClient as HttpAsyncClient
+from httpx import Client as HttpClient
+from httpx import Limits
+from zeep import AsyncClient, Settings
+from zeep.transports import AsyncTransport
+
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.api_base import AscioClient, API_WSDL, CALL_METHOD, finish_response, error_response, \
+    check_response, circuit_open_response
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.call_policy import API_RATE_LIMITER, call_with_retry_async, call_timeout
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.circuit_breaker import CIRCUIT_BREAKER
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.metrics import METRICS
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils import config as api_config
+
+# asynchronous variant of the api-layer => many requests can be in-flight at once from a single process
+#   the sync wrapper (ascio_api_many) can be used by the modules directly
+
+DEFAULT_CONCURRENCY = 20
+
+
+class _TimeoutTransport(AsyncTransport):
+    # per-method timeouts; every gathered task has its own context => CALL_METHOD is not shared between them
+    async def post(self, address, message, headers):
+        method = CALL_METHOD.get()
+
+        with METRICS.timer(f'api.{method}.network'):
+            response = await self.client.post(address, content=message, headers=headers, timeout=call_timeout(method))
+
+        METRICS.count(name=f'api.{method}.request_bytes', value=len(message))
+        METRICS.count(name=f'api.{method}.response_bytes', value=len(response.content))
+        check_response(response)
+        return response
+
+
+class AsyncAscioClient(AscioClient):
+    # the wsdl is still loaded synchronously (and cached); only the operations are async
+    @staticmethod
+    def _build_client(wsdl: str, cache) -> AsyncClient:
+        return AsyncClient(
+            wsdl=wsdl,
+            settings=Settings(strict=False),
+            transport=_TimeoutTransport(cache=cache, wsdl_client=HttpClient()),
+        )
+
+    def session(self, concurrency: int) -> HttpAsyncClient:
+        # the http-client is bound to the running event-loop => one pooled client per run
+        http_client = HttpAsyncClient(limits=Limits(max_connections=concurrency, max_keepalive_connections=concurrency))
+        self.client.transport.client = http_client
+        return http_client
+
+    async def call(self, method: str, user: str, password: str, request: dict, request_type: str = None):
+        operation, kwargs = self._prepare(method=method, user=user, password=password, request=request, request_type=request_type)
+
+        # includes the time waiting for the event-loop while other calls are in flight
+        with METRICS.timer(f'api.{method}.call'):
+            return await operation(**kwargs)
+
+
+_CLIENT = {}
+_CLIENT_LOCK = Lock()
+_RUN_LOCK = Lock()
+
+
+def get_async_client(wsdl: str = API_WSDL) -> AsyncAscioClient:
+    with _CLIENT_LOCK:
+        if wsdl not in _CLIENT:
+            _CLIENT[wsdl] = AsyncAscioClient(wsdl=wsdl)
+
+        return _CLIENT[wsdl]
+
+
+async def ascio_api_async(method: str, user: str, password: str, request: dict, request_type: str = None, *, exclude: list = None) -> dict:
+    circuit = CIRCUIT_BREAKER.open_state(user=user, password=password)
+    if circuit is not None:
+        return circuit_open_response(method=method, circuit=circuit)
+
+    response = await call_with_retry_async(
+        name=f'api.{method}',
+        coroutine_func=lambda: get_async_client().call(method=method, user=user, password=password, request=request, request_type=request_type),
+        limiter=API_RATE_LIMITER,
+        idempotent=method not in api_config.NON_IDEMPOTENT_METHODS,
+    )
+    return finish_response(method=method, user=user, password=password, response=response, exclude=exclude)
+
+
+async def _bounded(semaphore: Semaphore, coroutine):
+    async with semaphore:
+        try:
+            return await coroutine
+
+        # pylint: disable=W0718
+        except Exception as error:
+            exc_type, _, _ = sys_exc_info()
+            return error_response(errors=[str(exc_type), str(error)])
+
+
+async def ascio_api_gather(calls: list, concurrency: int = DEFAULT_CONCURRENCY) -> list:
+    # calls: list of ascio_api keyword-arguments; the responses keep the order of the calls
+    client = get_async_client()
+    semaphore = Semaphore(concurrency)
+
+    async with client.session(concurrency=concurrency):
+        return await gather(*[_bounded(semaphore, ascio_api_async(**call)) for call in calls])
+
+
+def ascio_api_many(calls: list, concurrency: int = DEFAULT_CONCURRENCY) -> list:
+    # sync wrapper; failed calls are returned as error-responses
+    with _RUN_LOCK:
+        return asyncio_run(ascio_api_gather(calls=calls, concurrency=concurrency))
@@ -0,0 +1,127 @@
+from sqlite3 import connect
+from contextlib import closing
+from json import dumps as json_dumps
+from json import loads as json_loads
+from os import path
+from time import time
+
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.api_base import ascio_api
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.api_async import ascio_api_many
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.cache import account_file, ensure_dir
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils import config as api_config
+
+# for api see:
+#   https://aws.ascio.info/api-v3/python/availabilityinfo
+
+# added as utils since this function is used in multiple modules
+
+
+def _availability_request(user: str, password: str, domain: str) -> dict:
+    return {
+        'method': 'AvailabilityInfo',
+        'user': user,
+        'password': password,
+        'request': {
+            "DomainName": domain,
+            "Quality": "QualityTest",
+        },
+    }
+
+
+def parse_availability(response: dict) -> dict:
+    result = {
+        'available': False,
+        'premium': False,
+        'price': None,
+        'price_currency': None,
+        'msg': response['ResultMessage'],
+        'errors': [],
+        'failed': False,
+    }
+
+    if response['ResultMessage'] == api_config.DOMAIN_AVAILABLE_RESULT:
+        result['available'] = True
+
+    if response['ResultCode'] in api_config.RESULT_CODE_SUCCESS and len(response['Errors']['string']) == 0:
+        if response['DomainType'] != api_config.DOMAIN_TYPE_STANDARD:
+            result['premium'] = True
+
+        for info in response['Prices']['PriceInfo']:
+            if info['Product']['OrderType'] == 'Register':
+                result['price'] = float(info['Price'])
+
+        result['price_currency'] = response['Currency']
+
+    else:
+        result['errors'].extend(response['Errors']['string'])
+        result['failed'] = True
+
+    return result
+
+
+def ascio_get_availability(user: str, password: str, domain: str) -> dict:
+    # check availability of domain and its price
+    return parse_availability(ascio_api(**_availability_request(user=user, password=password, domain=domain)))
+
+
+class AvailabilityCache:
+    # short-lived cache => domains are not re-priced multiple times within a run
+    def __init__(self, user: str, cache_dir: str = api_config.CACHE_DIR, ttl: int = api_config.AVAILABILITY_CACHE_TTL):
+        self.cache_dir = path.expanduser(cache_dir)
+        self.cache_file = account_file(directory=self.cache_dir, file=api_config.AVAILABILITY_CACHE_FILE, user=user)
+        self.ttl = ttl
+
+    def _connect(self):
+        ensure_dir(self.cache_dir)
+        connection = connect(self.cache_file, timeout=30)
+        connection.execute('CREATE TABLE IF NOT EXISTS availability (domain TEXT PRIMARY KEY, checked REAL NOT NULL, result TEXT NOT NULL)')
+        return connection
+
+    def get(self, domains: list) -> dict:
+        if self.ttl <= 0 or len(domains) == 0:
+            return {}
+
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                f"SELECT domain, result FROM availability WHERE checked >= ? AND domain IN ({', '.join(['?'] * len(domains))})",
+                [time() - self.ttl, *domains],
+            ).fetchall()
+
+        return {row[0]: json_loads(row[1]) for row in rows}
+
+    def put(self, results: dict):
+        if self.ttl <= 0:
+            return
+
+        checked = time()
+
+        with closing(self._connect()) as connection:
+            with connection:
+                connection.execute('DELETE FROM availability WHERE checked < ?', (checked - self.ttl,))
+                connection.executemany(
+                    'INSERT OR REPLACE INTO availability (domain, checked, result) VALUES (?, ?, ?)',
+                    [(domain, checked, json_dumps(result)) for domain, result in results.items() if not result['failed']],
+                )
+
+
+def ascio_get_availability_many(user: str, password: str, domains: list, concurrency: int = 20, cache: AvailabilityCache = None) -> dict:
+    # checks multiple domains concurrently; results of the last 'ttl' seconds are re-used
+    results = {} if cache is None else cache.get(domains=domains)
+    missing = [domain for domain in domains if domain not in results]
+
+    if len(missing) > 0:
+        responses = ascio_api_many(
+            calls=[_availability_request(user=user, password=password, domain=domain) for domain in missing],
+            concurrency=concurrency,
+        )
+        checked = {}
+
+        for domain, response in zip(missing, responses):
+            checked[domain] = {**parse_availability(response), 'cached': False}
+
+        if cache is not None:
+            cache.put(results={domain: {**result, 'cached': True} for domain, result in checked.items()})
+
+        results.update(checked)
+
+    return {domain: results[domain] for domain in domains}
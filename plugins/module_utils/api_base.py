@@ -1,44 +1,207 @@
 from zeep import xsd, Client, Settings
-from zeep.helpers import serialize_object as serialize_zeep_object
-from json import dumps as json_dumps
-from json import loads as json_loads
-from datetime import datetime
+from zeep.cache import SqliteCache
+from zeep.transports import Transport
+from zeep.exceptions import TransportError
+from zeep.xsd.valueobjects import CompoundValue
+from os import environ, path, makedirs
+from threading import Lock
+from contextvars import ContextVar
+from time import strftime, localtime
 
-DEBUG_LOG = True
-DEBUG_LOG_FILE = '/tmp/ascio_api_request.log'
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils import config as api_config
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.api_log import API_LOG
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.metrics import METRICS
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.call_policy import API_RATE_LIMITER, call_with_retry, call_timeout
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.circuit_breaker import CIRCUIT_BREAKER
 
+# the endpoint and disk-cache can be tuned per controller without touching the modules
+API_WSDL = environ.get('ASCIO_API_WSDL', api_config.API_WSDL)
+WSDL_CACHE_FILE = environ.get('ASCIO_WSDL_CACHE_FILE', api_config.WSDL_CACHE_FILE)
+WSDL_CACHE_TTL = int(environ.get('ASCIO_WSDL_CACHE_TTL', api_config.WSDL_CACHE_TTL))
 
-def ascio_api(method: str, user: str, password: str, request: dict, request_type: str = None) -> dict:
+
+# method of the call currently running in this thread/task
+CALL_METHOD = ContextVar('ascio_call_method', default='unknown')
+
+
+def check_response(response):
+    # error-pages that are no soap-response (p.e. of a proxy) => zeep would fail to parse them as it runs non-strict
+    #   raised as TransportError so the call-policy can retry them
+    if response.status_code >= 400 and 'xml' not in response.headers.get('Content-Type', ''):
+        raise TransportError(
+            message=f'Server returned HTTP {response.status_code}',
+            status_code=response.status_code,
+            content=response.content,
+        )
+
+
+class _MeteredTransport(Transport):
+    def post(self, address, message, headers):
+        method = CALL_METHOD.get()
+
+        with METRICS.timer(f'api.{method}.network'):
+            response = self.session.post(address, data=message, headers=headers, timeout=call_timeout(method))
+
+        METRICS.count(name=f'api.{method}.request_bytes', value=len(message))
+        METRICS.count(name=f'api.{method}.response_bytes', value=len(response.content))
+        check_response(response)
+        return response
+
+
+class AscioClient:
+    # process-wide api session => the wsdl is only parsed once and request-types are only resolved once
+    def __init__(self, wsdl: str = API_WSDL, cache_file: str = WSDL_CACHE_FILE, cache_ttl: int = WSDL_CACHE_TTL):
+        with METRICS.timer('api.wsdl_load'):
+            self.client = self._build_client(wsdl=wsdl, cache=self._build_cache(cache_file=cache_file, cache_ttl=cache_ttl))
+
+        self.client.set_ns_prefix('v3', api_config.API_NAMESPACE)
+        self.header = xsd.Element(
+            f'{{{api_config.API_NAMESPACE}}}SecurityHeaderDetails',
+            xsd.ComplexType([
+                xsd.Element(
+                    f'{{{api_config.API_NAMESPACE}}}Account',
+                    xsd.String()),
+                xsd.Element(
+                    f'{{{api_config.API_NAMESPACE}}}Password',
+                    xsd.String())
+            ])
+        )
+        self.types = {}
+        self._types_lock = Lock()
+
+    @staticmethod
+    def _build_client(wsdl: str, cache) -> Client:
+        return Client(wsdl=wsdl, settings=Settings(strict=False), transport=_MeteredTransport(cache=cache))
+
+    @staticmethod
+    def _build_cache(cache_file: str, cache_ttl: int):
+        # persistent wsdl/xsd cache => repeated module runs on the controller will not download the schema again
+        if cache_ttl <= 0:
+            return None
+
+        cache_file = path.expanduser(cache_file)
+
+        try:
+            makedirs(path.dirname(cache_file), exist_ok=True)
+            return SqliteCache(path=cache_file, timeout=cache_ttl)
+
+        except OSError:
+            # cache-directory is not writable => we can still work without it
+            return None
+
+    def get_type(self, request_type: str):
+        with self._types_lock:
+            if request_type not in self.types:
+                self.types[request_type] = self.client.get_type(request_type)
+
+            return self.types[request_type]
+
+    def _prepare(self, method: str, user: str, password: str, request: dict, request_type: str = None) -> tuple:
+        # (operation, its keyword-arguments); shared by the sync and async client
+        with METRICS.timer(f'api.{method}.prepare'):
+            header_value = self.header(
+                Account=user,
+                Password=password,
+            )
+            if request_type is not None:
+                request = self.get_type(request_type)(**request)
+
+            API_LOG.log(method=method, request=request)
+
+        CALL_METHOD.set(method)
+        return getattr(self.client.service, method), {'_soapheaders': [header_value], 'request': request}
+
+    def call(self, method: str, user: str, password: str, request: dict, request_type: str = None):
+        operation, kwargs = self._prepare(method=method, user=user, password=password, request=request, request_type=request_type)
+
+        # serialization, round-trip and parsing of the response
+        with METRICS.timer(f'api.{method}.call'):
+            return operation(**kwargs)
+
+
+_CLIENTS = {}
+_CLIENTS_LOCK = Lock()
+
+
+def get_client(wsdl: str = API_WSDL) -> AscioClient:
+    # re-use the client of this process if it was already initialized
+    with _CLIENTS_LOCK:
+        if wsdl not in _CLIENTS:
+            _CLIENTS[wsdl] = AscioClient(wsdl=wsdl)
+
+        return _CLIENTS[wsdl]
+
+
+def ascio_api(method: str, user: str, password: str, request: dict, request_type: str = None, *, exclude: list = None) -> dict:
     # abstraction function since this basic construct is used for all ascio APIv3 calls
-    wsdl = "https://aws.ascio.com/v3/aws.wsdl"
-    settings = Settings(strict=False)
-    client = Client(wsdl=wsdl, settings=settings)
-
-    client.set_ns_prefix('v3', 'http://www.ascio.com/2013/02')
-    header = xsd.Element(
-        '{http://www.ascio.com/2013/02}SecurityHeaderDetails',
-        xsd.ComplexType([
-            xsd.Element(
-                '{http://www.ascio.com/2013/02}Account',
-                xsd.String()),
-            xsd.Element(
-                '{http://www.ascio.com/2013/02}Password',
-                xsd.String())
-        ])
-    )
-    header_value = header(
-        Account=user,
-        Password=password,
+    #   exclude: response-fields (on any level) that are not needed by the caller => they are dropped while converting
+    #   transient faults are retried and the calls are rate-limited (see call_policy.py)
+    #   calls of blocked accounts are skipped (see circuit_breaker.py)
+    circuit = CIRCUIT_BREAKER.open_state(user=user, password=password)
+    if circuit is not None:
+        return circuit_open_response(method=method, circuit=circuit)
+
+    response = call_with_retry(
+        name=f'api.{method}',
+        func=lambda: get_client().call(method=method, user=user, password=password, request=request, request_type=request_type),
+        limiter=API_RATE_LIMITER,
+        idempotent=method not in api_config.NON_IDEMPOTENT_METHODS,
     )
-    if request_type is not None:
-        request_type = client.get_type(request_type)
-        request = request_type(**request)
-
-    if DEBUG_LOG:
-        with open(DEBUG_LOG_FILE, 'a+', encoding='utf-8') as log:
-            log.write(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - Request for method '{method}': '{request}'\n\n")
-
-    _method = getattr(client.service, method)
-    response = _method(_soapheaders=[header_value], request=request)
-    response_dict = serialize_zeep_object(response, dict)
-    return json_loads(json_dumps(response_dict, default=str))  # json dump/load used to get rid of unsupported data-types
+
+    return finish_response(method=method, user=user, password=password, response=response, exclude=exclude)
+
+
+def finish_response(method: str, user: str, password: str, response, exclude: list = None) -> dict:
+    # converts the zeep-response and records account-level errors; shared by the sync and async api
+    with METRICS.timer(f'api.{method}.convert'):
+        response = response_to_dict(response, exclude=exclude)
+
+    CIRCUIT_BREAKER.record(user=user, password=password, response=response)
+    return response
+
+
+_PLAIN_TYPES = (str, int, float, bool, type(None))
+
+
+def response_to_dict(response, exclude: list = None) -> dict:
+    # single pass over the zeep objects; data-types json does not support (datetime, Decimal, ..) are converted to
+    #   strings the same way 'json_dumps(default=str)' did => the output did not change
+    exclude = frozenset(exclude or [])
+
+    def _convert(value):
+        if isinstance(value, _PLAIN_TYPES):
+            return value
+
+        if isinstance(value, CompoundValue):
+            value = value.__values__
+
+        if isinstance(value, dict):
+            return {key: _convert(sub_value) for key, sub_value in value.items() if key not in exclude}
+
+        if isinstance(value, (list, tuple)):
+            return [_convert(entry) for entry in value]
+
+        return str(value)
+
+    return _convert(response)
+
+
+def error_response(errors: list) -> dict:
+    # same structure as failed api-responses => callers can handle local errors the same way
+    return {
+        'ResultCode': 0,
+        'ResultMessage': None,
+        'Errors': {'string': errors},
+    }
+
+
+def circuit_open_response(method: str, circuit: dict) -> dict:
+    # skipped call => the fields callers read before checking the result are set as well
+    METRICS.count(name=f'api.{method}.skipped')
+    response = error_response(errors=[
+        f"Call skipped as the account is blocked ({circuit['reason']}) - "
+        f"calls are suspended until {strftime('%Y-%m-%d %H:%M:%S', localtime(circuit['open_until']))}",
+        circuit['error'],
+    ])
+    response.update({'OrderInfo': None, 'DomainInfos': None, 'TotalCount': 0})
+    return response
@@ -3,6 +3,10 @@ from ansible_collections.niceshopsorg.ascio.plugins.module_utils import config a
 
 from sys import exc_info as sys_exc_info
 from traceback import format_exc
+from concurrent.futures import ThreadPoolExecutor
+from math import ceil
+from collections import deque
+from itertools import islice
 
 # for api see:
 #   https://aws.ascio.info/api-v3/python/getdomains
@@ -11,49 +15,110 @@ from traceback import format_exc
 # added as utils since this function is used in multiple modules
 
 
-def ascio_get_domains(params: dict) -> dict:
+def _build_request(parameters: dict, page: int) -> dict:
+    return {
+        "OrderSort": parameters['order_by'],
+        "Status": parameters['filter_status'],
+        "Tlds": {"string": parameters['filter_tld']},
+        "ObjectNames": {"string": parameters['filter_names']},
+        "DomainType": parameters['filter_type'],
+        "DomainComment": parameters['filter_comment'],
+        "ExpireFromDate": parameters['filter_expire_from'],
+        "ExpireToDate": parameters['filter_expire_to'],
+        "PageInfo": {
+            "PageIndex": page,
+            "PageSize": parameters['results'],
+        },
+        "CreationFromDate": parameters['filter_creation_from'],
+        "CreationToDate": parameters['filter_creation_to'],
+        "Handles": {"string": parameters['filter_handles']},
+        "OwnerName": parameters['filter_owner_name'],
+        "OwnerOrganizationName": parameters['filter_owner_organization'],
+        "OwnerEmail": parameters['filter_owner_email'],
+        "ContactFirstName": parameters['filter_contact_first_name'],
+        "ContactLastName": parameters['filter_contact_last_name'],
+        "ContactOrganizationName": parameters['filter_contact_organization'],
+        "ContactEmail": parameters['filter_contact_email'],
+        "NameServerHostName": parameters['filter_nameserver_hostname'],
+        "NameServerIPv4": parameters['filter_nameserver_ipv4'],
+        "NameServerIPv6": parameters['filter_nameserver_ipv6'],
+        "CustomerReferenceExternalId": parameters['filter_customer_reference_id'],
+        "CustomerReferenceDescription": parameters['filter_customer_reference_description'],
+    }
+
+
+def _page_failed(response: dict) -> bool:
+    return response['ResultCode'] not in api_config.RESULT_CODE_SUCCESS or len(response['Errors']['string']) > 0
+
+
+def _page_domains(response: dict) -> list:
+    if response['DomainInfos'] is None or response['DomainInfos']['DomainInfo'] is None:
+        return []
+
+    return response['DomainInfos']['DomainInfo']
+
+
+def _unique_domains(page_callback):
+    # pages can overlap if domains were added or removed while paging => every domain is passed on only once
+    seen = set()
+
+    def _callback(domains: list):
+        unique = []
+        for domain in domains:
+            name = domain['DomainName'].lower()
+            if name not in seen:
+                seen.add(name)
+                unique.append(domain)
+
+        page_callback(unique)
+
+    return _callback
+
+
+def _get_page(parameters: dict, page: int) -> dict:
+    # single page; transient faults are retried by the call-policy (see call_policy.py)
+    return ascio_api(
+        method='GetDomains',
+        user=parameters['user'],
+        password=parameters['password'],
+        request=_build_request(parameters=parameters, page=page),
+        exclude=parameters['exclude_fields'],
+    )
+
+
+def _get_other_pages(parameters: dict, first_response: dict):
+    # the first response tells us how many pages exist => fetch the remaining ones concurrently
+    #   pages are yielded in order and only 'page_workers' pages are in flight => memory stays bounded for the export
+    pages = ceil(first_response['TotalCount'] / parameters['results'])
+    remaining = iter(range(parameters['results_page'] + 1, pages + 1))
+    workers = max(1, min(parameters['page_workers'], pages - parameters['results_page']))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque(
+            pool.submit(_get_page, parameters=parameters, page=page)
+            for page in islice(remaining, workers)
+        )
+
+        while len(pending) > 0:
+            response = pending.popleft().result()
+            page = next(remaining, None)
+            if page is not None:
+                pending.append(pool.submit(_get_page, parameters=parameters, page=page))
+
+            yield response
+
+
+def ascio_get_domains(params: dict, page_callback=None) -> dict:
+    # page_callback: called with the domains of every page instead of collecting them => 'DomainInfos' will be None
     # overwriting default parameters with custom supplied ones
     _parameters = api_config.GET_DOMAINS_DEFAULTS.copy()
     _parameters.update(params)
 
     try:
-        response = ascio_api(
-            method='GetDomains',
-            user=_parameters['user'],
-            password=_parameters['password'],
-            request={
-                "OrderSort": _parameters['order_by'],
-                "Status": _parameters['filter_status'],
-                "Tlds": {"string": _parameters['filter_tld']},
-                "ObjectNames": {"string": _parameters['filter_names']},
-                "DomainType": _parameters['filter_type'],
-                "DomainComment": _parameters['filter_comment'],
-                "ExpireFromDate": _parameters['filter_expire_from'],
-                "ExpireToDate": _parameters['filter_expire_to'],
-                "PageInfo": {
-                    "PageIndex": _parameters['results_page'],
-                    "PageSize": _parameters['results'],
-                },
-                # "Handles": {"string": [""]},
-                # "CreationFromDate": "2021-10-12T13:08:56.956+02:00",
-                # "CreationToDate": "2021-10-12T13:08:56.956+02:00",
-                # "OwnerName": "OwnerNameTest",
-                # "OwnerOrganizationName": "OwnerOrganizationNameTest",
-                # "OwnerEmail": "OwnerEmailTest",
-                # "ContactFirstName": "ContactFirstNameTest",
-                # "ContactLastName": "ContactLastNameTest",
-                # "ContactOrganizationName": "ContactOrganizationNameTest",
-                # "ContactEmail": "ContactEmailTest",
-                # "NameServerHostName": "NameServerHostNameTest",
-                # "NameServerIPv4": "NameServerIPv4Test",
-                # "NameServerIPv6": "NameServerIPv6Test",
-                # "CustomerReferenceExternalId": "CustomerReferenceExternalIdTest",
-                # "CustomerReferenceDescription": "CustomerReferenceDescriptionTest",
-            }
-        )
+        response = _get_page(parameters=_parameters, page=_parameters['results_page'])
         # todo: remove useless stuff from 'data' => what do we want to do with that data?
 
-        return {
+        result = {
             'DomainInfos': response['DomainInfos'],
             'TotalCount': response['TotalCount'],
             'Errors': response['Errors'],
@@ -61,6 +126,34 @@ def ascio_get_domains(params: dict) -> dict:
             'ResultMessage': response['ResultMessage'],
         }
 
+        streamed = page_callback is not None
+        domains = []
+        if _parameters['all_pages']:
+            page_callback = _unique_domains(page_callback if streamed else domains.extend)
+
+        if streamed:
+            if not _page_failed(response):
+                page_callback(_page_domains(response))
+
+            result['DomainInfos'] = None
+
+        if _parameters['all_pages'] and not _page_failed(response):
+            if not streamed:
+                page_callback(_page_domains(response))
+
+            for page_response in _get_other_pages(parameters=_parameters, first_response=response):
+                if _page_failed(page_response):
+                    result['Errors']['string'].extend(page_response['Errors']['string'])
+                    result['ResultCode'] = page_response['ResultCode']
+                    result['ResultMessage'] = page_response['ResultMessage']
+
+                page_callback(_page_domains(page_response))
+
+            if not streamed:
+                result['DomainInfos'] = {'DomainInfo': domains}
+
+        return result
+
     # pylint: disable=W0718
     except Exception as error:
         exc_type, _, _ = sys_exc_info()
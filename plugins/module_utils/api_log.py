@@ -0,0 +1,157 @@
+from logging import getLogger, Formatter, DEBUG
+from logging.handlers import QueueHandler, QueueListener, WatchedFileHandler
+from queue import SimpleQueue
+from random import random
+from os import environ
+from datetime import datetime
+from json import dumps as json_dumps
+from threading import Lock
+from atexit import register as atexit_register
+
+from ansible.module_utils.common.warnings import warn
+from zeep.helpers import serialize_object as serialize_zeep_object
+
+# api-call logging; configurable via module-params or environment:
+#   ASCIO_API_LOG: off | sampled | full
+#   ASCIO_API_LOG_FILE, ASCIO_API_LOG_SAMPLE_RATE, ASCIO_API_LOG_REDACT (comma-separated fields)
+# requests are serialized and written by a background thread => logging is not part of the request hot-path
+# the file is shared by all forks => it is only appended to and has to be rotated externally (p.e. logrotate)
+
+LOG_MODES = ['off', 'sampled', 'full']
+LOG_DEFAULTS = {
+    'mode': 'off',
+    'file': '/tmp/ascio_api_request.log',
+    'sample_rate': 0.1,
+    'redact': [
+        'Password', 'AuthInfo', 'FirstName', 'LastName', 'OrgName', 'Address1', 'Address2', 'City', 'State', 'PostalCode',
+        'Phone', 'Fax', 'Email', 'OrganisationNumber', 'VatNumber', 'Number', 'Details', 'RegistrantDate',
+    ],
+}
+REDACTED = '*****'
+
+# can be merged into the argument-spec of modules
+API_LOG_ARGS = dict(
+    api_log=dict(type='str', default=None, choices=LOG_MODES, description='Log api-requests (default: ASCIO_API_LOG or off)'),
+    api_log_file=dict(type='str', default=None, description='File to log the api-requests to'),
+    api_log_sample_rate=dict(type='float', default=None, description="Share of requests to log in 'sampled' mode (0-1)"),
+)
+
+
+def _redact(value, fields: set):
+    if isinstance(value, dict):
+        return {key: REDACTED if key in fields and sub_value is not None else _redact(sub_value, fields) for key, sub_value in value.items()}
+
+    if isinstance(value, list):
+        return [_redact(entry, fields) for entry in value]
+
+    return value
+
+
+def _env_mode() -> str:
+    # a typo in the environment must not break the import of every module => the default is used instead
+    mode = environ.get('ASCIO_API_LOG', LOG_DEFAULTS['mode'])
+    if mode not in LOG_MODES:
+        warn(f"Unsupported ASCIO_API_LOG '{mode}' (supported: {', '.join(LOG_MODES)}) => using '{LOG_DEFAULTS['mode']}'")
+        return LOG_DEFAULTS['mode']
+
+    return mode
+
+
+def _env_sample_rate() -> float:
+    try:
+        return float(environ.get('ASCIO_API_LOG_SAMPLE_RATE', LOG_DEFAULTS['sample_rate']))
+
+    except ValueError:
+        warn(f"Invalid ASCIO_API_LOG_SAMPLE_RATE '{environ['ASCIO_API_LOG_SAMPLE_RATE']}' => using {LOG_DEFAULTS['sample_rate']}")
+        return LOG_DEFAULTS['sample_rate']
+
+
+class _JsonFormatter(Formatter):
+    def __init__(self, redact: set):
+        super().__init__()
+        self.redact = redact
+
+    def format(self, record) -> str:
+        # runs inside the writer-thread
+        return json_dumps({
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'pid': record.process,
+            'method': record.api_method,
+            'request': _redact(serialize_zeep_object(record.api_request, dict), self.redact),
+        }, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    def prepare(self, record):
+        # the record is formatted by the writer-thread instead of the calling one
+        return record
+
+
+class ApiLog:
+    def __init__(self):
+        self.settings = {}
+        self._listener = None
+        self._logger = getLogger('ascio_api_request')
+        self._logger.propagate = False
+        self._logger.setLevel(DEBUG)
+        self._lock = Lock()
+        self.configure()
+        atexit_register(self.stop)
+
+    def configure(self, mode: str = None, file: str = None, sample_rate: float = None, redact: list = None):
+        # unset settings fall back to the environment and the defaults
+        env_redact = environ.get('ASCIO_API_LOG_REDACT')
+        settings = {
+            'mode': mode or _env_mode(),
+            'file': file or environ.get('ASCIO_API_LOG_FILE', LOG_DEFAULTS['file']),
+            'sample_rate': sample_rate if sample_rate is not None else _env_sample_rate(),
+            'redact': redact if redact is not None else (LOG_DEFAULTS['redact'] if env_redact is None else env_redact.split(',')),
+        }
+
+        if settings['mode'] not in LOG_MODES:
+            raise ValueError(f"Unsupported api-log mode '{settings['mode']}'! Supported: {LOG_MODES}")
+
+        with self._lock:
+            if settings == self.settings:
+                return
+
+            self._stop()
+            self.settings = settings
+
+            if settings['mode'] != 'off':
+                # re-opens the file if it was rotated by another process
+                writer = WatchedFileHandler(settings['file'], encoding='utf-8', delay=True)
+                writer.setFormatter(_JsonFormatter(redact=set(settings['redact'])))
+                queue = SimpleQueue()
+                self._logger.addHandler(_DeferredQueueHandler(queue))
+                self._listener = QueueListener(queue, writer)
+                self._listener.start()
+
+    def configure_from_params(self, params: dict):
+        self.configure(mode=params.get('api_log'), file=params.get('api_log_file'), sample_rate=params.get('api_log_sample_rate'))
+
+    def log(self, method: str, request):
+        mode = self.settings['mode']
+
+        if mode == 'off' or (mode == 'sampled' and random() >= self.settings['sample_rate']):
+            return
+
+        self._logger.debug('', extra={'api_method': method, 'api_request': request})
+
+    def _stop(self):
+        for handler in list(self._logger.handlers):
+            self._logger.removeHandler(handler)
+
+        if self._listener is not None:
+            self._listener.stop()  # flushes the queued entries
+            for handler in self._listener.handlers:
+                handler.close()
+
+            self._listener = None
+
+    def stop(self):
+        with self._lock:
+            self._stop()
+
+
+API_LOG = ApiLog()
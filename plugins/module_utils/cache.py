@@ -0,0 +1,62 @@
+from contextlib import contextmanager
+from fcntl import flock, LOCK_EX, LOCK_UN
+from hashlib import sha256
+from os import path, makedirs, replace, unlink, fdopen, fsync
+from tempfile import mkstemp
+
+# helpers to safely share cache-files between multiple processes (ansible forks) on the controller
+
+
+def ensure_dir(directory: str):
+    # recursive and race-free
+    makedirs(directory, exist_ok=True)
+
+
+def account_file(directory: str, file: str, user: str) -> str:
+    # per-account file => accounts sharing a cache-directory do not overwrite or answer with each others data
+    #   the account-name is not written to the file-system
+    name, extension = path.splitext(file)
+    return f"{directory}/{name}_{sha256(user.encode('utf-8')).hexdigest()[:16]}{extension}"
+
+
+@contextmanager
+def file_lock(lock_file: str):
+    # exclusive lock across processes (and threads); blocks until the lock is released by its holder
+    ensure_dir(path.dirname(lock_file))
+
+    with open(lock_file, 'a+', encoding='utf-8') as lock:
+        flock(lock, LOCK_EX)
+
+        try:
+            yield
+
+        finally:
+            flock(lock, LOCK_UN)
+
+
+@contextmanager
+def atomic_file(file: str):
+    # readers will either see the old or the new file - never a half-written one
+    #   the file is only replaced if the block finished without an exception
+    directory = path.dirname(path.abspath(file))
+    ensure_dir(directory)
+    fd, tmp_file = mkstemp(dir=directory, prefix=f'.{path.basename(file)}.', suffix='.tmp')
+
+    try:
+        with fdopen(fd, 'w', encoding='utf-8', newline='') as tmp:
+            yield tmp
+            tmp.flush()
+            fsync(tmp.fileno())
+
+        replace(tmp_file, file)
+
+    except BaseException:
+        if path.exists(tmp_file):
+            unlink(tmp_file)
+
+        raise
+
+
+def atomic_write(file: str, content: str):
+    with atomic_file(file) as target:
+        target.write(content)
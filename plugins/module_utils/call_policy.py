@@ -0,0 +1,177 @@
+from asyncio import sleep as asyncio_sleep
+from json import dumps as json_dumps
+from json import loads as json_loads
+from os import environ, path
+from random import uniform
+from time import sleep, time
+
+from ansible.module_utils.common.warnings import warn
+from httpx import HTTPStatusError as HttpxStatusError
+from httpx import TransportError as HttpxTransportError
+from httpx import ConnectError as HttpxConnectError
+from httpx import ConnectTimeout as HttpxConnectTimeout
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import ConnectTimeout as RequestsConnectTimeout
+from requests.exceptions import HTTPError as RequestsHTTPError
+from requests.exceptions import Timeout as RequestsTimeout
+from zeep.exceptions import TransportError as ZeepTransportError
+
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils import config as api_config
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.cache import file_lock
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.metrics import METRICS
+
+# shared policy for all calls to the ASCIO API and TLDKit
+#   retries: transient faults are retried using exponential backoff with jitter
+#   rate-limit: token-bucket shared by all forks on the controller (state-file guarded by a file-lock)
+#   timeouts: per method
+
+CALL_RETRIES = int(environ.get('ASCIO_CALL_RETRIES', api_config.CALL_RETRIES))
+RATE_LIMIT_DIR = environ.get('ASCIO_RATE_LIMIT_DIR', api_config.CACHE_DIR)
+
+# the connection was never established => the request can not have been processed
+_NOT_SENT_ERRORS = (RequestsConnectTimeout, HttpxConnectError, HttpxConnectTimeout)
+_TRANSIENT_ERRORS = (RequestsConnectionError, RequestsTimeout, HttpxTransportError)
+
+
+def call_timeout(method: str) -> int:
+    return api_config.CALL_TIMEOUTS.get(method, api_config.CALL_TIMEOUT_DEFAULT)
+
+
+def _status_code(error: Exception) -> int:
+    if isinstance(error, ZeepTransportError):
+        return error.status_code
+
+    if isinstance(error, (RequestsHTTPError, HttpxStatusError)) and error.response is not None:
+        return error.response.status_code
+
+    return None
+
+
+def retryable(error: Exception, idempotent: bool = True) -> bool:
+    status = _status_code(error)
+    if status is not None:
+        if idempotent:
+            return status in api_config.CALL_RETRY_STATUS
+
+        return status in api_config.CALL_RETRY_STATUS_NON_IDEMPOTENT
+
+    if isinstance(error, _NOT_SENT_ERRORS):
+        return True
+
+    return idempotent and isinstance(error, _TRANSIENT_ERRORS)
+
+
+def backoff(attempt: int) -> float:
+    # full jitter => concurrent forks that failed at the same time will not retry at the same time
+    return uniform(0, min(api_config.CALL_BACKOFF_MAX, api_config.CALL_BACKOFF_BASE * 2 ** (attempt - 1)))
+
+
+class RateLimiter:
+    # token-bucket shared by all forks on the controller
+    #   a token is reserved (the bucket can go negative) => the lock is only held for the bookkeeping, not while waiting
+    def __init__(self, name: str, rate: float, burst: int, state_dir: str = RATE_LIMIT_DIR):
+        self.name = name
+        self.rate = rate
+        self.burst = max(1, burst)
+        state_dir = path.expanduser(state_dir)
+        self.state_file = f'{state_dir}/rate_limit_{name}.json'
+        self.lock_file = f'{state_dir}/rate_limit_{name}.lock'
+        self.disabled = False
+
+    def _read(self, now: float) -> tuple:
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as state:
+                data = json_loads(state.read())
+                return data['tokens'], data['updated']
+
+        except (OSError, ValueError, KeyError):
+            # first call or broken state => full bucket
+            return self.burst, now
+
+    def reserve(self) -> float:
+        # takes one token; returns how many seconds the caller has to wait until it is valid
+        if self.rate <= 0 or self.disabled:
+            return 0.0
+
+        try:
+            with file_lock(self.lock_file):
+                now = time()
+                tokens, updated = self._read(now)
+                tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate) - 1
+
+                with open(self.state_file, 'w', encoding='utf-8') as state:
+                    state.write(json_dumps({'tokens': tokens, 'updated': now}))
+
+        except OSError as error:
+            # the state can not be shared => the calls of this process are not limited instead of failing them
+            self.disabled = True
+            METRICS.count(name=f'ratelimit.{self.name}.disabled')
+            warn(f"Rate-limiting of the '{self.name}' calls is disabled as its state can not be written: {error}")
+            return 0.0
+
+        if tokens >= 0:
+            return 0.0
+
+        return -tokens / self.rate
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            METRICS.add_timing(name=f'ratelimit.{self.name}.wait', seconds=wait)
+            sleep(wait)
+
+    async def acquire_async(self):
+        wait = self.reserve()
+        if wait > 0:
+            METRICS.add_timing(name=f'ratelimit.{self.name}.wait', seconds=wait)
+            await asyncio_sleep(wait)
+
+
+def _rate_limiter(name: str, env_rate: str) -> RateLimiter:
+    return RateLimiter(
+        name=name,
+        rate=float(environ.get(env_rate, api_config.RATE_LIMITS[name]['rate'])),
+        burst=api_config.RATE_LIMITS[name]['burst'],
+    )
+
+
+API_RATE_LIMITER = _rate_limiter(name='api', env_rate='ASCIO_RATE_LIMIT')
+TLDKIT_RATE_LIMITER = _rate_limiter(name='tldkit', env_rate='ASCIO_TLDKIT_RATE_LIMIT')
+
+
+def call_with_retry(name: str, func, limiter: RateLimiter, idempotent: bool = True):
+    # name: used for the metrics; p.e. 'api.GetDomains'
+    attempt = 0
+
+    while True:
+        attempt += 1
+        limiter.acquire()
+
+        try:
+            return func()
+
+        except (ZeepTransportError, RequestsConnectionError, RequestsTimeout, RequestsHTTPError) as error:
+            if attempt > CALL_RETRIES or not retryable(error=error, idempotent=idempotent):
+                raise
+
+        METRICS.count(name=f'{name}.retries')
+        sleep(backoff(attempt))
+
+
+async def call_with_retry_async(name: str, coroutine_func, limiter: RateLimiter, idempotent: bool = True):
+    # coroutine_func: creates a new coroutine for every attempt
+    attempt = 0
+
+    while True:
+        attempt += 1
+        await limiter.acquire_async()
+
+        try:
+            return await coroutine_func()
+
+        except (ZeepTransportError, HttpxTransportError, HttpxStatusError) as error:
+            if attempt > CALL_RETRIES or not retryable(error=error, idempotent=idempotent):
+                raise
+
+        METRICS.count(name=f'{name}.retries')
+        await asyncio_sleep(backoff(attempt))
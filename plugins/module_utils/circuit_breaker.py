@@ -0,0 +1,84 @@
+from hashlib import sha256
+from json import dumps as json_dumps
+from json import loads as json_loads
+from os import environ, path
+from time import time
+
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils import config as api_config
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.cache import atomic_write
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.errors import DEFAULT_CLASSIFIER
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.metrics import METRICS
+
+# circuit-breaker shared by all forks on the controller
+#   account-level errors (p.e. exceeded balance, failed authentication) open the circuit of the account
+#   while it is open the calls of this account are skipped => the remaining forks of a run fail fast instead of
+#   sending their full sequence of calls just to fail the same way
+#   after the cool-down the next call is sent again; if it fails the same way the circuit is re-opened
+
+CIRCUIT_COOLDOWN = int(environ.get('ASCIO_CIRCUIT_COOLDOWN', api_config.CIRCUIT_BREAKER_COOLDOWN))
+CIRCUIT_DIR = environ.get('ASCIO_CIRCUIT_DIR', api_config.CACHE_DIR)
+
+
+def account_error(response: dict) -> tuple:
+    # (reason, error-message) of the first account-level error in the response; (None, None) if there is none
+    errors = (response.get('Errors') or {}).get('string') or []
+
+    for error in errors:
+        code, _ = DEFAULT_CLASSIFIER.classify(error)
+        if code in api_config.CIRCUIT_BREAKER_CODES:
+            return code, str(error)
+
+    reason = api_config.CIRCUIT_BREAKER_RESULT_CODES.get(response.get('ResultCode'))
+    if reason is not None:
+        return reason, errors[0] if len(errors) > 0 else response.get('ResultMessage')
+
+    return None, None
+
+
+class CircuitBreaker:
+    def __init__(self, cooldown: int = CIRCUIT_COOLDOWN, state_dir: str = CIRCUIT_DIR):
+        self.cooldown = cooldown
+        self.state_dir = path.expanduser(state_dir)
+
+    def _state_file(self, user: str, password: str) -> str:
+        # one circuit per account and password => a run with a mistyped password does not block the ones using the right one
+        #   neither the account-name nor the password are written to the file-system
+        key = sha256(f'{user}\0{password}'.encode('utf-8')).hexdigest()[:16]
+        return f'{self.state_dir}/circuit_{key}.json'
+
+    def open_state(self, user: str, password: str) -> dict:
+        # state of the open circuit; None if calls can be sent
+        if self.cooldown <= 0:
+            return None
+
+        try:
+            with open(self._state_file(user=user, password=password), 'r', encoding='utf-8') as state:
+                circuit = json_loads(state.read())
+
+        except (OSError, ValueError):
+            return None
+
+        if circuit.get('open_until', 0) <= time():
+            return None
+
+        return circuit
+
+    def record(self, user: str, password: str, response: dict):
+        # opens the circuit if the response holds an account-level error
+        if self.cooldown <= 0:
+            return
+
+        reason, error = account_error(response)
+        if reason is None:
+            return
+
+        # written atomically => the other forks will never read a half-written state; the last writer wins
+        atomic_write(self._state_file(user=user, password=password), json_dumps({
+            'reason': reason,
+            'error': error,
+            'open_until': time() + self.cooldown,
+        }))
+        METRICS.count(name=f'circuit.{reason}.opened')
+
+
+CIRCUIT_BREAKER = CircuitBreaker()
@@ -11,7 +11,117 @@ GET_DOMAINS_DEFAULTS = {
     'filter_comment': None,
     'filter_expire_from': None,
     'filter_expire_to': None,
+    'filter_creation_from': None,
+    'filter_creation_to': None,
+    'filter_handles': [],
+    'filter_owner_name': None,
+    'filter_owner_organization': None,
+    'filter_owner_email': None,
+    'filter_contact_first_name': None,
+    'filter_contact_last_name': None,
+    'filter_contact_organization': None,
+    'filter_contact_email': None,
+    'filter_nameserver_hostname': None,
+    'filter_nameserver_ipv4': None,
+    'filter_nameserver_ipv6': None,
+    'filter_customer_reference_id': None,
+    'filter_customer_reference_description': None,
     'results_page': 1,
     'results': 1000,
+    'all_pages': False,
+    'page_workers': 4,
+    'exclude_fields': None,
 }
+# sub-trees of the GetDomains response that are not needed to compare the domain-config => not converted
+GET_DOMAINS_COMPARE_EXCLUDE = ['DnsSecKeys', 'PrivacyProxy', 'Reseller', 'Trademark']
+NAMESERVER_MIGRATION_EXCLUDE = ['Owner', 'Admin', 'Tech', 'Billing', 'Reseller', 'DnsSecKeys', 'PrivacyProxy', 'Trademark']
 WHOIS_GDPR_TLDs = ['com', 'net', 'cc', 'tv']  # see: https://aws.ascio.info/gdpr-api.html
+
+API_WSDL = 'https://aws.ascio.com/v3/aws.wsdl'
+API_NAMESPACE = 'http://www.ascio.com/2013/02'
+CACHE_DIR = '~/.cache/ansible-module-ascio'
+WSDL_CACHE_FILE = f'{CACHE_DIR}/wsdl.sqlite'
+WSDL_CACHE_TTL = 86400  # seconds; the parsed wsdl/xsd documents are re-fetched after that time (0 = no disk cache)
+PORTFOLIO_INDEX_FILE = 'portfolio.sqlite'
+PORTFOLIO_FULL_SYNC_AGE = 7 * 86400  # seconds; incremental syncs cannot see changes made outside the collection
+PORTFOLIO_EXPIRE_WINDOW = 30  # days; domains expiring within this window are re-fetched on every sync (renewals/expiry)
+PORTFOLIO_SYNC_OVERLAP = 3600  # seconds; overlap of the sync-windows to compensate clock-skew
+AVAILABILITY_CACHE_FILE = 'availability.sqlite'
+AVAILABILITY_CACHE_TTL = 900  # seconds
+ORDER_LEDGER_FILE = 'orders.sqlite'
+ORDER_FINAL_STATUS = ['Completed', 'Failed', 'Invalid']  # orders in any other status are in flight
+ORDER_FAILED_STATUS = ['Failed', 'Invalid']
+ORDER_IN_FLIGHT_MAX_AGE = 14 * 86400  # seconds; older orders that were never polled do no longer block their domain
+ORDER_LEDGER_RETENTION = 30 * 86400  # seconds; finished orders are removed from the ledger after that time
+ORDER_RECHECK_AGE = 300  # seconds; orders in flight that were not polled since are polled once before they block their domain
+ORDER_RECHECK_CONCURRENCY = 10
+
+# call-policy (see call_policy.py)
+CALL_RETRIES = 3  # retries of transient faults (connection-errors, timeouts, HTTP 429/5xx)
+CALL_BACKOFF_BASE = 0.5  # seconds; exponential backoff with full jitter => random(0, base * 2^(attempt-1))
+CALL_BACKOFF_MAX = 15  # seconds
+CALL_RETRY_STATUS = [429, 500, 502, 503, 504]
+CALL_RETRY_STATUS_NON_IDEMPOTENT = [429, 503]  # the request was not processed => safe to send again
+NON_IDEMPOTENT_METHODS = ['CreateOrder']  # only retried if the request can not have been processed
+CALL_TIMEOUTS = {  # seconds
+    'GetDomains': 180,
+    'AvailabilityInfo': 30,
+    'CreateOrder': 90,
+    'GetOrder': 30,
+    'tldkit': 30,
+}
+CALL_TIMEOUT_DEFAULT = 60
+RATE_LIMITS = {  # token-bucket shared by all forks on the controller; rate = calls per second (0 = unlimited)
+    'api': {'rate': 20, 'burst': 40},
+    'tldkit': {'rate': 10, 'burst': 20},
+}
+
+# circuit-breaker (see circuit_breaker.py)
+CIRCUIT_BREAKER_COOLDOWN = 900  # seconds; calls of a blocked account are skipped for this time (0 = disabled)
+CIRCUIT_BREAKER_CODES = ['balance_exceeded', 'auth_failed']  # account-level errors => every further call would fail the same way
+CIRCUIT_BREAKER_RESULT_CODES = {401: 'auth_failed'}
+
+# contact-normalization (see contacts.py)
+CONTACT_ENTITY_TYPES = ['company', 'person']
+CONTACT_REQUIRED_FIELDS = ['FirstName', 'LastName', 'Address1', 'City', 'PostalCode', 'CountryCode', 'Phone', 'Email']
+CONTACT_FIELD_PATTERNS = {
+    'CountryCode': r'[A-Z]{2}',
+    'Phone': r'\+[0-9]{1,3}\.[0-9]{4,14}',
+    'Email': r'[^@\s]+@[^@\s]+\.[^@\s]+',
+}
+
+# error-classification (see errors.py); matched in this order => first match wins
+#   message: replaces the generic api-message (None = keep the original one)
+ERROR_CLASSES = {
+    'pending': {
+        'pattern': 'FO405',
+        'message': 'Domain is in Status PENDING => no changes can be made!',
+    },
+    'update_pending': {
+        'pattern': "Order rejected because of '.*?' order '.*?' on same object",  # ..Object status prohibits operation
+        'message': 'After contact/owner-updates it can take some minutes before another change can be performed!',
+    },
+    'balance_exceeded': {
+        'pattern': 'Partner .*? blocked',
+        'message': 'The monthly account-balance has exceeded a maximum threshold! '
+                   'You need to transfer some money to ASCIO to unblock your account!',
+    },
+    'auth_failed': {
+        'pattern': 'Authentication failed|Invalid (?:account|password|credentials)',
+        'message': None,
+    },
+    'account_blocked': {'pattern': 'Call skipped as the account is blocked', 'message': None},
+    'docs_required': {'pattern': 'Documentation is required', 'message': None},
+    'price_exceeded': {'pattern': 'Domain price was higher than you allowed', 'message': None},
+    'premium_not_allowed': {'pattern': "Domain is listed as 'premium'", 'message': None},
+    'not_available': {'pattern': 'Domain is not available for registration', 'message': None},
+    'plan_missing': {'pattern': 'No plan was created for this domain', 'message': None},
+    'plan_outdated': {'pattern': 'since the plan was created', 'message': None},
+    'not_in_account': {'pattern': 'Domain is not part of the account', 'message': None},
+    'missing_settings': {'pattern': 'Missing settings for domain', 'message': None},
+    'contact_invalid': {'pattern': 'Invalid contact', 'message': None},
+    'owner_change_conflict': {
+        'pattern': 'The owner cannot be changed and updated at the same time|The contacts and owner cannot be changed at the same time',
+        'message': None,
+    },
+}
@@ -0,0 +1,144 @@
+from json import loads as json_loads
+from re import compile as regex_compile
+
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.plan import fingerprint
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils import config as api_config
+
+# contact-normalization driven by the tld-config (see: tld_config.json)
+#   the config is compiled once into lookup-tables keyed by (tld, entity-type, role) => (allowed fields, forced values)
+#   the contacts of a batch are built once per (tld, entity-type) and copied to every domain using them
+
+FIELD_PATTERNS = {field: regex_compile(pattern) for field, pattern in api_config.CONTACT_FIELD_PATTERNS.items()}
+
+
+class ContactRules:
+    def __init__(self, config: dict):
+        default = config.get('default') or {}
+        overrides = config.get('country_overrides') or {}
+        self.roles = config['contact_keys']
+        self.default_type = default.get('type', api_config.CONTACT_ENTITY_TYPES[0])
+        self.defaults = {key: default.get(key) or {} for key in ['all', *self.roles]}
+        self.local_presence = {tld.lower() for tld, override in overrides.items() if override.get('local_presence', False)}
+        self.rules = {}
+
+        for entity in api_config.CONTACT_ENTITY_TYPES:
+            if entity not in config['fields']:
+                raise ValueError(f"The tld-config has no fields for the contact-type '{entity}'!")
+
+            for role in self.roles:
+                fields = config['fields'][entity]['owner' if role == 'owner' else 'all']
+                self.rules[(None, entity, role)] = (frozenset(fields), {})
+
+        # only TLDs with overrides get their own entries => all others use the default ones
+        for tld, override in overrides.items():
+            for entity in api_config.CONTACT_ENTITY_TYPES:
+                entity_override = override.get(entity)
+                if not entity_override:
+                    continue
+
+                for role in self.roles:
+                    fields, _ = self.rules[(None, entity, role)]
+                    self.rules[(tld.lower(), entity, role)] = (
+                        fields.union(entity_override.get('fields') or []),
+                        {**(entity_override.get('all') or {}), **(entity_override.get(role) or {})},
+                    )
+
+    def rule(self, tld: str, entity: str, role: str) -> tuple:
+        # (allowed fields, forced values)
+        return self.rules.get((tld, entity, role)) or self.rules[(None, entity, role)]
+
+    def contacts(self, tld: str, entity: str, custom: dict = None) -> tuple:
+        # ({'contact_<role>': contact}, errors)
+        #   custom: contact-values overwriting the defaults; 'all' or per role
+        custom = custom or {}
+        contacts, errors = {}, []
+
+        for role in self.roles:
+            fields, forced = self.rule(tld=tld, entity=entity, role=role)
+            # defaults of the config < values supplied for all contacts < values supplied for this role
+            source = {**self.defaults['all'], **self.defaults[role], **(custom.get('all') or {}), **(custom.get(role) or {})}
+            contact = {field: value for field, value in source.items() if field in fields}
+            contact.update(forced)
+            contacts[f'contact_{role}'] = contact
+            errors.extend(_validate(role=role, entity=entity, contact=contact))
+
+        return contacts, errors
+
+    def normalize(self, domains: list, contacts: dict = None) -> dict:
+        # domains: domain-names or dicts (domain, type, contacts & other register-settings that are passed through)
+        #   => {'domains': entries ready for the 'domains' param of the register-module, 'errors': {domain: errors}}
+        result = {'domains': [], 'errors': {}}
+        built = {}
+
+        for entry in domains:
+            if isinstance(entry, str):
+                entry = {'domain': entry}
+
+            name = entry['domain']
+            tld = name.rsplit('.', 1)[-1].lower()
+            entity = entry.get('type') or self.default_type
+
+            if entity not in api_config.CONTACT_ENTITY_TYPES:
+                result['errors'][name] = [
+                    f"Invalid contact-type '{entity}' (supported: {', '.join(api_config.CONTACT_ENTITY_TYPES)})"
+                ]
+                continue
+
+            if entry.get('contacts'):
+                custom = {
+                    key: {**((contacts or {}).get(key) or {}), **(entry['contacts'].get(key) or {})}
+                    for key in {'all', *self.roles}
+                }
+                domain_contacts, errors = self.contacts(tld=tld, entity=entity, custom=custom)
+
+            else:
+                if (tld, entity) not in built:
+                    built[(tld, entity)] = self.contacts(tld=tld, entity=entity, custom=contacts)
+
+                domain_contacts, errors = built[(tld, entity)]
+
+            if len(errors) > 0:
+                result['errors'][name] = list(errors)
+                continue
+
+            result['domains'].append({
+                **{key: value for key, value in entry.items() if key not in ['type', 'contacts']},
+                **{key: dict(contact) for key, contact in domain_contacts.items()},
+                'lp': entry.get('lp', tld in self.local_presence),
+            })
+
+        return result
+
+
+def _validate(role: str, entity: str, contact: dict) -> list:
+    required = api_config.CONTACT_REQUIRED_FIELDS
+    if entity == 'company' and role == 'owner':
+        required = [*required, 'OrgName']
+
+    errors = []
+    missing = [field for field in required if not contact.get(field)]
+    if len(missing) > 0:
+        errors.append(f"Invalid contact '{role}': missing {', '.join(missing)}")
+
+    for field, pattern in FIELD_PATTERNS.items():
+        if contact.get(field) and pattern.fullmatch(str(contact[field])) is None:
+            errors.append(f"Invalid contact '{role}': {field} '{contact[field]}' has an invalid format")
+
+    return errors
+
+
+_RULES = {}
+
+
+def contact_rules(config) -> ContactRules:
+    # config: tld-config as dict or path to the json-file
+    #   compiled once per config-content => filters are evaluated on every templating
+    if isinstance(config, str):
+        with open(config, 'r', encoding='utf-8') as config_file:
+            config = json_loads(config_file.read())
+
+    key = fingerprint(config)
+    if key not in _RULES:
+        _RULES[key] = ContactRules(config=config)
+
+    return _RULES[key]
@@ -0,0 +1,75 @@
+from collections import Counter
+from functools import lru_cache
+from re import compile as regex_compile
+from re import DOTALL
+
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils import config as api_config
+
+# classification of error-messages => every error gets a machine-readable code next to its message
+#   the first class of the table that matches anywhere in the message wins
+#   one combined pattern is used as pre-filter => errors without any known class are not matched against every class
+#   known api-errors can get a message that is more meaningful than the generic one of the api
+
+UNKNOWN_ERROR = 'unknown'
+
+
+class ErrorClassifier:
+    def __init__(self, classes: dict):
+        # classes: {error_code: {'pattern': regex, 'message': replacement-message or None}}
+        self.messages = {code: settings.get('message') for code, settings in classes.items()}
+        self.patterns = [(code, regex_compile(settings['pattern'], DOTALL)) for code, settings in classes.items()]
+        # without (named) groups => the regex-engine can skip to the positions a class could start at
+        self.pattern = regex_compile('|'.join(f"(?:{settings['pattern']})" for settings in classes.values()), DOTALL)
+
+    def classify(self, error: str) -> tuple:
+        # (error_code, message)
+        error = str(error)
+        if self.pattern.search(error) is None:
+            return UNKNOWN_ERROR, error
+
+        # only errors that matched any class are checked per class => in the order of the table
+        for code, pattern in self.patterns:
+            if pattern.search(error) is not None:
+                message = self.messages[code]
+                return code, error if message is None else message
+
+        return UNKNOWN_ERROR, error
+
+    def classify_all(self, errors: list) -> tuple:
+        # (messages, error_codes) => both lists keep the order of the errors
+        messages, codes = [], []
+
+        for error in errors:
+            code, message = self.classify(error)
+            codes.append(code)
+            messages.append(message)
+
+        return messages, codes
+
+
+@lru_cache(maxsize=16)
+def _classifier(custom: tuple) -> ErrorClassifier:
+    # custom classes come first => they can overrule the built-in ones
+    classes = {code: {'pattern': pattern, 'message': message} for code, pattern, message in custom}
+    for code, settings in api_config.ERROR_CLASSES.items():
+        classes.setdefault(code, settings)
+
+    return ErrorClassifier(classes=classes)
+
+
+DEFAULT_CLASSIFIER = ErrorClassifier(classes=api_config.ERROR_CLASSES)
+
+
+def error_classifier(error_patterns: list = None) -> ErrorClassifier:
+    # error_patterns: module-param => list of {'code': .., 'pattern': .., 'message': ..}
+    if not error_patterns:
+        return DEFAULT_CLASSIFIER
+
+    return _classifier(tuple(
+        (entry['code'], entry['pattern'], entry.get('message')) for entry in error_patterns
+    ))
+
+
+def count_error_codes(results: list) -> dict:
+    # {error_code: count} over the 'error_codes' of multiple results
+    return dict(Counter(code for result in results for code in result.get('error_codes', [])))
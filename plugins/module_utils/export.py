@@ -0,0 +1,88 @@
+from csv import DictWriter
+from json import dumps as json_dumps
+from contextlib import ExitStack
+
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.cache import atomic_file
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.projection import DomainProjection
+
+# streaming export of GetDomains results => every page is projected and written as soon as it was fetched
+#   so the memory usage does not depend on the size of the portfolio
+# csv: nested fields are flattened to dotted columns ('Owner.Email') and lists are joined using CSV_LIST_SEPARATOR
+
+CSV_LIST_SEPARATOR = ';'
+
+
+class ExportAborted(Exception):
+    # raised inside the export-context => the target files are left untouched
+    pass
+
+
+def _csv_value(value):
+    if isinstance(value, list):
+        return CSV_LIST_SEPARATOR.join(
+            json_dumps(entry, default=str) if isinstance(entry, (dict, list)) else str(entry) for entry in value if entry is not None
+        )
+
+    return value
+
+
+def flatten_record(record: dict, prefix: str = '', flat: dict = None) -> dict:
+    # {'Owner': {'Email': ..}} => {'Owner.Email': ..}
+    flat = {} if flat is None else flat
+
+    for field, value in record.items():
+        if isinstance(value, dict):
+            flatten_record(record=value, prefix=f'{prefix}{field}.', flat=flat)
+
+        else:
+            flat[f'{prefix}{field}'] = _csv_value(value)
+
+    return flat
+
+
+class DomainExport:
+    def __init__(self, ndjson_file: str = None, csv_file: str = None, projection: DomainProjection = None):
+        self.targets = {'ndjson_file': ndjson_file, 'csv_file': csv_file}
+        self.projection = DomainProjection() if projection is None else projection
+        self.records = 0
+        self._files = None
+        self._ndjson = None
+        self._csv = None
+        self._csv_writer = None
+
+    def __enter__(self):
+        self._files = ExitStack()
+
+        if self.targets['ndjson_file'] is not None:
+            self._ndjson = self._files.enter_context(atomic_file(self.targets['ndjson_file']))
+
+        if self.targets['csv_file'] is not None:
+            self._csv = self._files.enter_context(atomic_file(self.targets['csv_file']))
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # the target files are only replaced if the export succeeded
+        return self._files.__exit__(exc_type, exc_value, traceback)
+
+    def write_page(self, domains: list):
+        for domain in domains:
+            record = {'DomainName': domain['DomainName'], **self.projection(domain)}
+
+            if self._ndjson is not None:
+                self._ndjson.write(json_dumps(record, default=str) + '\n')
+
+            if self._csv is not None:
+                row = flatten_record(record)
+
+                if self._csv_writer is None:
+                    # all records share the schema of the api-response => columns of the first one
+                    self._csv_writer = DictWriter(self._csv, fieldnames=list(row.keys()), extrasaction='ignore')
+                    self._csv_writer.writeheader()
+
+                self._csv_writer.writerow(row)
+
+            self.records += 1
+
+    def summary(self) -> dict:
+        return {**self.targets, 'records': self.records}
@@ -0,0 +1,115 @@
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter, time
+from json import dumps as json_dumps
+from os import getpid, path
+
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.cache import atomic_write
+
+# opt-in instrumentation of api-calls and caches
+#   timings: per step (p.e. 'api.GetDomains.call') => count, total & max seconds
+#   counters: p.e. bytes sent/received, retries, cache hits/misses
+
+# can be merged into the argument-spec of modules
+METRICS_ARGS = dict(
+    metrics=dict(type='bool', default=False, description="Return timings, payload-sizes and cache-ratios under 'metrics'"),
+    metrics_file=dict(
+        type='str', default=None,
+        description="Also write the metrics to this file; '*.prom' => prometheus textfile, else appended as json line",
+    ),
+)
+
+
+class Metrics:
+    def __init__(self):
+        self.enabled = False
+        self.timings = {}
+        self.counters = {}
+        self._lock = Lock()
+
+    def configure_from_params(self, params: dict):
+        self.enabled = params.get('metrics', False) or params.get('metrics_file') is not None
+
+    @contextmanager
+    def timer(self, name: str):
+        if not self.enabled:
+            yield
+            return
+
+        start = perf_counter()
+
+        try:
+            yield
+
+        finally:
+            self.add_timing(name=name, seconds=perf_counter() - start)
+
+    def add_timing(self, name: str, seconds: float):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            timing = self.timings.setdefault(name, {'count': 0, 'total': 0.0, 'max': 0.0})
+            timing['count'] += 1
+            timing['total'] += seconds
+            timing['max'] = max(timing['max'], seconds)
+
+    def count(self, name: str, value: int = 1):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = dict(self.counters)
+            timings = {name: dict(timing) for name, timing in self.timings.items()}
+
+        ratios = {}
+        for cache in {name.rsplit('.', 1)[0] for name in counters if name.endswith('.hit') or name.endswith('.miss')}:
+            hits = counters.get(f'{cache}.hit', 0)
+            total = hits + counters.get(f'{cache}.miss', 0)
+            ratios[cache] = round(hits / total, 4) if total > 0 else None
+
+        return {'timings': timings, 'counters': counters, 'ratios': ratios}
+
+    def write(self, file: str):
+        file = path.expanduser(file)
+        snapshot = self.snapshot()
+
+        if file.endswith('.prom'):
+            atomic_write(file=file, content=self._prometheus(snapshot))
+
+        else:
+            with open(file, 'a', encoding='utf-8') as sink:
+                sink.write(json_dumps({'time': time(), 'pid': getpid(), **snapshot}) + '\n')
+
+    @staticmethod
+    def _prometheus(snapshot: dict) -> str:
+        lines = [
+            '# TYPE ascio_step_seconds_total counter',
+            *[f'ascio_step_seconds_total{{step="{name}"}} {timing["total"]}' for name, timing in snapshot['timings'].items()],
+            '# TYPE ascio_step_seconds_max gauge',
+            *[f'ascio_step_seconds_max{{step="{name}"}} {timing["max"]}' for name, timing in snapshot['timings'].items()],
+            '# TYPE ascio_step_count counter',
+            *[f'ascio_step_count{{step="{name}"}} {timing["count"]}' for name, timing in snapshot['timings'].items()],
+            '# TYPE ascio_counter counter',
+            *[f'ascio_counter{{name="{name}"}} {value}' for name, value in snapshot['counters'].items()],
+            '# TYPE ascio_cache_hit_ratio gauge',
+            *[f'ascio_cache_hit_ratio{{cache="{name}"}} {value}' for name, value in snapshot['ratios'].items() if value is not None],
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def result(self, params: dict) -> dict:
+        # to be merged into the module-result
+        if not self.enabled:
+            return {}
+
+        if params.get('metrics_file') is not None:
+            self.write(file=params['metrics_file'])
+
+        return {'metrics': self.snapshot()} if params.get('metrics', False) else {}
+
+
+METRICS = Metrics()
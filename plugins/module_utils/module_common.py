@@ -0,0 +1,15 @@
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.api_log import API_LOG, API_LOG_ARGS
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.metrics import METRICS, METRICS_ARGS
+
+# argument-spec and setup shared by all modules
+COMMON_ARGS = {**API_LOG_ARGS, **METRICS_ARGS}
+
+
+def configure_common(params: dict):
+    API_LOG.configure_from_params(params=params)
+    METRICS.configure_from_params(params=params)
+
+
+def common_result(params: dict) -> dict:
+    # to be merged into the module-result
+    return METRICS.result(params=params)
@@ -0,0 +1,216 @@
+from concurrent.futures import ThreadPoolExecutor
+from json import dumps as json_dumps
+from time import time
+
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.api_async import ascio_api_many
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.api_get_domains import ascio_get_domains
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.cache import atomic_write
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.errors import DEFAULT_CLASSIFIER, count_error_codes
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.orders import OrderLedger, pending_orders
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.tldkit import TLD
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils import config as api_config
+
+# bulk nameserver-migration => only the nameservers are compared and updated
+#   the TLDKit-rules are checked once per TLD and the orders are submitted concurrently in batches
+
+
+def build_nameservers(ns_list: list) -> dict:
+    # build nameserver-dict from supplied list
+    nameservers = {}
+
+    for i in range(1, len(ns_list) + 1):
+        _server = ns_list[i - 1]
+
+        if _server is not None:
+            if _server.endswith('.'):
+                _server = _server[:-1]
+
+            nameservers[f'NameServer{i}'] = {'HostName': _server}
+
+    return nameservers
+
+
+def current_nameservers(domain_info: dict) -> dict:
+    # nameservers of a GetDomains-record in the format of build_nameservers
+    return build_nameservers([
+        None if server is None else server.get('HostName') for server in (domain_info.get('NameServers') or {}).values()
+    ])
+
+
+def _hostnames(nameservers: dict) -> list:
+    return [server['HostName'] for server in nameservers.values()]
+
+
+class NameserverMigration:
+    def __init__(self, params: dict, check_mode: bool = False):
+        self.params = params
+        self.check_mode = check_mode
+        self.target = build_nameservers(ns_list=params['nameservers'])
+        self.ledger = OrderLedger(user=params['user'], cache_dir=params['tld_cache'])
+        self.domains = {}
+        self.summary = {'total': 0, 'changed': 0, 'unchanged': 0, 'skipped': 0, 'failed': 0, 'submitted': 0}
+
+    def run(self) -> dict:
+        # the selection is checked by the module => an empty one would match the whole account
+        response = self._fetch()
+        if response['ResultCode'] not in api_config.RESULT_CODE_SUCCESS or len(response['Errors']['string']) > 0:
+            messages, codes = DEFAULT_CLASSIFIER.classify_all(response['Errors']['string'])
+            return {'failed': True, 'changed': False, 'errors': messages, 'error_codes': codes}
+
+        infos = [] if response['DomainInfos'] is None else response['DomainInfos'].get('DomainInfo') or []
+        changed = self._diff(infos=infos)
+        self.summary['total'] = len(self.domains)
+        changed = self._docs_check(names=changed)
+
+        if self.check_mode:
+            self._progress(processed=0, total=0)
+            return {'failed': self.summary['failed'] > 0, 'changed': self.summary['changed'] > 0, 'errors': [], 'error_codes': []}
+
+        self._progress(processed=0, total=len(changed))
+        self._submit(names=changed)
+        return {'failed': self.summary['failed'] > 0, 'changed': self.summary['submitted'] > 0, 'errors': [], 'error_codes': []}
+
+    def result(self) -> dict:
+        # per-domain results and the summary of the migration
+        failed = [result for result in self.domains.values() if result['failed']]
+        return {'domains': self.domains, 'summary': {**self.summary, 'error_codes': count_error_codes(results=failed)}}
+
+    def _fetch(self) -> dict:
+        # only the nameservers are needed => the other sub-trees are not converted
+        params = {
+            'user': self.params['user'],
+            'password': self.params['password'],
+            'all_pages': True,
+            'exclude_fields': api_config.NAMESERVER_MIGRATION_EXCLUDE,
+            **(self.params['filter'] or {}),
+        }
+        if self.params['domains']:
+            params['filter_names'] = self.params['domains']
+
+        return ascio_get_domains(params=params)
+
+    def _domain_result(self, name: str, **kwargs) -> dict:
+        result = {'changed': False, 'failed': False, 'skipped': False, 'errors': [], 'error_codes': [], 'order': None, **kwargs}
+        self.domains[name] = result
+        return result
+
+    def _fail(self, name: str, errors: list):
+        result = self.domains[name]
+        messages, codes = DEFAULT_CLASSIFIER.classify_all(errors)
+        result['errors'].extend(messages)
+        result['error_codes'].extend(codes)
+        result['failed'] = True
+        self.summary['failed'] += 1
+
+    def _diff(self, infos: list) -> list:
+        pending = set()
+        if self.params['skip_pending_orders']:
+            orders = pending_orders(user=self.params['user'], password=self.params['password'], ledger=self.ledger)
+            pending = {order['domain'] for order in orders}
+
+        changed = []
+
+        for info in infos:
+            name = info['DomainName']
+            current = current_nameservers(info)
+
+            if name.lower() in pending:
+                self._domain_result(name=name, skipped=True)
+                self.summary['skipped'] += 1
+
+            elif current == self.target:
+                self._domain_result(name=name)
+                self.summary['unchanged'] += 1
+
+            else:
+                self._domain_result(name=name, changed=True, diff={'before': _hostnames(current), 'after': _hostnames(self.target)})
+                self.summary['changed'] += 1
+                changed.append(name)
+
+        # listed domains that are not part of the account
+        found = {name.lower() for name in self.domains}
+        for name in self.params['domains'] or []:
+            if name.lower() not in found:
+                self._domain_result(name=name)
+                self._fail(name=name, errors=['Domain is not part of the account!'])
+
+        return changed
+
+    def _docs_check(self, names: list) -> list:
+        # one TLDKit-lookup per TLD instead of one per domain; the TLDs are loaded concurrently
+        if self.params['force']:
+            return names
+
+        tlds = sorted({name.rsplit('.', 1)[-1].lower() for name in names})
+
+        def _docs_errors(tld: str) -> list:
+            try:
+                if TLD(
+                        user=self.params['user'],
+                        password=self.params['password'],
+                        domain=tld,
+                        action='NAMESERVER UPDATE',
+                        tld_cache=self.params['tld_cache'],
+                ).docs_required():
+                    return ['Documentation is required to update nameservers for this TLD! Execution can be forced.']
+
+                return []
+
+            # pylint: disable=W0718
+            except Exception as error:
+                return [f'Unable to load the TLDKit-rules of .{tld}: {error}']
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.params['concurrency'], len(tlds)))) as pool:
+            tld_errors = dict(zip(tlds, pool.map(_docs_errors, tlds)))
+
+        allowed = []
+        for name in names:
+            errors = tld_errors[name.rsplit('.', 1)[-1].lower()]
+            if len(errors) > 0:
+                self._fail(name=name, errors=errors)
+
+            else:
+                allowed.append(name)
+
+        return allowed
+
+    def _order_call(self, name: str) -> dict:
+        return {
+            'method': 'CreateOrder',
+            'user': self.params['user'],
+            'password': self.params['password'],
+            'request': {'Type': 'NameserverUpdate', 'Domain': {'Name': name, 'NameServers': self.target}},
+            'request_type': 'v3:DomainOrderRequest',
+        }
+
+    def _submit(self, names: list):
+        # batches => the progress can be reported while the orders are submitted
+        batch_size = self.params['batch_size']
+
+        for i in range(0, len(names), batch_size):
+            batch = names[i:i + batch_size]
+            responses = ascio_api_many(calls=[self._order_call(name) for name in batch], concurrency=self.params['concurrency'])
+
+            submitted = []
+
+            for name, response in zip(batch, responses):
+                if response.get('OrderInfo') is not None:
+                    self.domains[name]['order'] = response['OrderInfo']
+                    submitted.append((name, 'NameserverUpdate', response['OrderInfo']))
+
+                if response['ResultCode'] not in api_config.RESULT_CODE_SUCCESS or len(response['Errors']['string']) > 0:
+                    self._fail(name=name, errors=response['Errors']['string'])
+
+            self.ledger.record_many(orders=submitted)
+            self.summary['submitted'] += len(submitted)
+
+            self._progress(processed=i + len(batch), total=len(names))
+
+    def _progress(self, processed: int, total: int):
+        # progress-file => can be watched while the module is running
+        if self.params['progress_file'] is None:
+            return
+
+        atomic_write(self.params['progress_file'], json_dumps({
+            **self.summary, 'orders_processed': processed, 'orders_total': total, 'updated': int(time()),
+        }))
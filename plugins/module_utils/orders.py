@@ -0,0 +1,155 @@
+from sqlite3 import connect
+from contextlib import closing
+from os import path
+from time import time, sleep
+
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.api_async import ascio_api_many
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.cache import account_file, ensure_dir
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils import config as api_config
+
+# local ledger of the orders submitted by the collection
+#   every CreateOrder is recorded => domains with orders in flight can be skipped without asking the api
+#   the status of the orders is polled in batches (see the 'orders' module)
+
+_COLUMNS = ['order_id', 'domain', 'type', 'status', 'created', 'updated', 'message']
+
+
+def _order(row: tuple) -> dict:
+    return dict(zip(_COLUMNS, row))
+
+
+class OrderLedger:
+    def __init__(self, user: str, cache_dir: str = api_config.CACHE_DIR):
+        self.cache_dir = path.expanduser(cache_dir)
+        self.ledger_file = account_file(directory=self.cache_dir, file=api_config.ORDER_LEDGER_FILE, user=user)
+
+    def _connect(self):
+        ensure_dir(self.cache_dir)
+        connection = connect(self.ledger_file, timeout=30)
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS orders ('
+            'order_id TEXT PRIMARY KEY, domain TEXT NOT NULL, type TEXT, status TEXT, created REAL NOT NULL, '
+            'updated REAL NOT NULL, message TEXT, final INTEGER NOT NULL DEFAULT 0'
+            ')'
+        )
+        connection.execute('CREATE INDEX IF NOT EXISTS orders_in_flight ON orders (final, domain)')
+        return connection
+
+    def record(self, domain: str, order_type: str, order_info: dict):
+        # order_info: 'OrderInfo' of the CreateOrder-response
+        self.record_many(orders=[(domain, order_type, order_info)])
+
+    def record_many(self, orders: list):
+        # orders: list of (domain, order-type, order_info) => one transaction
+        now = time()
+        rows = [
+            (
+                order_info['OrderId'], domain.lower(), order_type, order_info.get('Status'), now, now,
+                int(order_info.get('Status') in api_config.ORDER_FINAL_STATUS),
+            )
+            for domain, order_type, order_info in orders if order_info is not None and order_info.get('OrderId') is not None
+        ]
+        if len(rows) == 0:
+            return
+
+        with closing(self._connect()) as connection:
+            with connection:
+                connection.executemany(
+                    'INSERT OR REPLACE INTO orders (order_id, domain, type, status, created, updated, final) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    rows,
+                )
+
+    def in_flight(self, names: list = None, order_ids: list = None) -> list:
+        # orders that did not reach a final status yet
+        if not path.isfile(self.ledger_file):
+            # no order was recorded yet => no need to create the ledger
+            return []
+
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM orders WHERE final = 0 AND created > ?"
+        values = [time() - api_config.ORDER_IN_FLIGHT_MAX_AGE]
+
+        for column, filter_values in [('domain', names), ('order_id', order_ids)]:
+            if filter_values is not None and len(filter_values) > 0:
+                sql += f" AND {column} IN ({', '.join(['?'] * len(filter_values))})"
+                values.extend([value.lower() if column == 'domain' else value for value in filter_values])
+
+        with closing(self._connect()) as connection:
+            return [_order(row) for row in connection.execute(f'{sql} ORDER BY created', values)]
+
+    def update(self, statuses: list):
+        # statuses: list of (order_id, status, message)
+        now = time()
+
+        with closing(self._connect()) as connection:
+            with connection:
+                connection.executemany(
+                    'UPDATE orders SET status = ?, message = ?, updated = ?, final = ? WHERE order_id = ?',
+                    [
+                        (status, message, now, int(status in api_config.ORDER_FINAL_STATUS), order_id)
+                        for order_id, status, message in statuses
+                    ],
+                )
+                connection.execute(
+                    'DELETE FROM orders WHERE final = 1 AND updated < ?', (now - api_config.ORDER_LEDGER_RETENTION,)
+                )
+
+
+def _poll_calls(params: dict, orders: list) -> list:
+    return [
+        {'method': 'GetOrder', 'user': params['user'], 'password': params['password'], 'request': {'OrderId': order['order_id']}}
+        for order in orders
+    ]
+
+
+def poll_orders(params: dict, ledger: OrderLedger, persist: bool = True) -> dict:
+    # polls the orders in flight until all of them reached a final status or the timeout is reached
+    #   params: user, password, concurrency, interval, timeout (0 => a single round) and the filters domains/order_ids
+    deadline = time() + params['timeout']
+    result = {'orders': {}, 'errors': {}, 'rounds': 0}
+    orders = ledger.in_flight(names=params['domains'], order_ids=params['order_ids'])
+
+    while len(orders) > 0:
+        result['rounds'] += 1
+        statuses = []
+
+        for order, response in zip(orders, ascio_api_many(calls=_poll_calls(params=params, orders=orders), concurrency=params['concurrency'])):
+            if response['ResultCode'] not in api_config.RESULT_CODE_SUCCESS or response.get('OrderInfo') is None:
+                result['errors'][order['order_id']] = response['Errors']['string']
+                continue
+
+            result['errors'].pop(order['order_id'], None)
+            order['status'] = response['OrderInfo']['Status']
+            order['message'] = response['ResultMessage']
+            result['orders'][order['order_id']] = order
+            statuses.append((order['order_id'], order['status'], order['message']))
+
+        if persist:
+            ledger.update(statuses=statuses)
+
+        orders = [order for order in orders if order['status'] not in api_config.ORDER_FINAL_STATUS]
+        if len(orders) == 0 or time() + params['interval'] > deadline:
+            break
+
+        sleep(params['interval'])
+
+    return result
+
+
+def pending_orders(user: str, password: str, ledger: OrderLedger, names: list = None) -> list:
+    # orders in flight that block their domain
+    #   orders that were not polled within ORDER_RECHECK_AGE are polled once first => orders that finished without
+    #   being polled by the 'orders' module do not block their domain until they expire from the ledger
+    orders = ledger.in_flight(names=names)
+    stale = [order['order_id'] for order in orders if time() - order['updated'] > api_config.ORDER_RECHECK_AGE]
+
+    if len(stale) > 0:
+        poll_orders(
+            params={
+                'user': user, 'password': password, 'concurrency': api_config.ORDER_RECHECK_CONCURRENCY,
+                'interval': 0, 'timeout': 0, 'domains': names, 'order_ids': stale,
+            },
+            ledger=ledger,
+        )
+        orders = ledger.in_flight(names=names)
+
+    return orders
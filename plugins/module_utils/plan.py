@@ -0,0 +1,41 @@
+from hashlib import sha256
+from json import dumps as json_dumps
+from json import loads as json_loads
+from time import time
+
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.cache import atomic_write, file_lock
+
+# plan/apply workflow of the register-module
+#   check-mode writes the reviewed changes (diff, orders, price) and a fingerprint of the observed state
+#   the apply-run only re-verifies the fingerprint and submits the planned orders => the domains are not checked twice
+
+PLAN_VERSION = 1
+
+
+def fingerprint(data) -> str:
+    return sha256(json_dumps(data, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def write_plan(file: str, domains: dict, merge: bool = False):
+    # domains: {domain-name: plan}
+    #   merge: the domains are added to the existing plan => single-domain tasks (loops, multiple hosts) build one plan together
+    with file_lock(f'{file}.lock'):
+        if merge:
+            try:
+                domains = {**read_plan(file), **domains}
+
+            except (OSError, ValueError):
+                # no (usable) plan yet => a new one is started
+                pass
+
+        atomic_write(file, json_dumps({'version': PLAN_VERSION, 'created': int(time()), 'domains': domains}, indent=2, default=str))
+
+
+def read_plan(file: str) -> dict:
+    with open(file, 'r', encoding='utf-8') as plan_file:
+        plan = json_loads(plan_file.read())
+
+    if plan.get('version') != PLAN_VERSION:
+        raise ValueError(f"Unsupported plan-version in '{file}' - create the plan again using check-mode")
+
+    return plan['domains']
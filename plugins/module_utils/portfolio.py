@@ -0,0 +1,202 @@
+from sqlite3 import connect
+from contextlib import closing
+from json import dumps as json_dumps
+from json import loads as json_loads
+from datetime import datetime, timezone
+from os import path
+from time import time
+
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.api_get_domains import ascio_get_domains
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.cache import account_file, ensure_dir, file_lock
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils import config as api_config
+
+# local index of the domain-portfolio => read-mostly runs can answer from it instead of querying the api for every domain
+#   full sync: all domains are fetched
+#   incremental sync: only domains created since the last sync and domains that are (or were) about to expire are re-fetched
+
+
+def _api_date(timestamp: float) -> str:
+    # format expected by the api, p.e. 2021-10-12T13:08:56.956+00:00
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat(timespec='milliseconds')
+
+
+def _timestamp(value: str) -> float:
+    if value in [None, '']:
+        return None
+
+    try:
+        return datetime.fromisoformat(value).timestamp()
+
+    except ValueError:
+        return None
+
+
+def _failed(response: dict) -> bool:
+    return response['ResultCode'] not in api_config.RESULT_CODE_SUCCESS or len(response['Errors']['string']) > 0
+
+
+def _domains(response: dict) -> list:
+    if response['DomainInfos'] is None or response['DomainInfos'].get('DomainInfo') is None:
+        return []
+
+    return response['DomainInfos']['DomainInfo']
+
+
+class PortfolioIndex:
+    def __init__(self, user: str, cache_dir: str = api_config.CACHE_DIR):
+        self.user = user
+        self.cache_dir = path.expanduser(cache_dir)
+        self.index_file = account_file(directory=self.cache_dir, file=api_config.PORTFOLIO_INDEX_FILE, user=user)
+        self.lock_file = account_file(directory=self.cache_dir, file='portfolio.lock', user=user)
+
+    def _connect(self):
+        ensure_dir(self.cache_dir)
+        connection = connect(self.index_file, timeout=30)
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS domains ('
+            'name TEXT PRIMARY KEY, tld TEXT NOT NULL, expires REAL, created REAL, synced REAL NOT NULL, data TEXT NOT NULL'
+            ')'
+        )
+        connection.execute('CREATE INDEX IF NOT EXISTS domains_tld ON domains (tld)')
+        connection.execute('CREATE INDEX IF NOT EXISTS domains_expires ON domains (expires)')
+        connection.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value REAL)')
+        return connection
+
+    def _meta(self, key: str) -> float:
+        with closing(self._connect()) as connection:
+            row = connection.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+
+        return None if row is None else row[0]
+
+    def age(self) -> float:
+        # seconds since the last successful sync
+        last_sync = self._meta('last_sync')
+        return None if last_sync is None else time() - last_sync
+
+    def fresh(self, max_age: int) -> bool:
+        age = self.age()
+        return age is not None and age <= max_age
+
+    def get(self, names: list) -> list:
+        return self.query(names=names)
+
+    def query(self, names: list = None, tlds: list = None) -> list:
+        sql = 'SELECT data FROM domains'
+        conditions = []
+        values = []
+
+        for column, filter_values in [('name', names), ('tld', tlds)]:
+            if filter_values is not None and len(filter_values) > 0:
+                conditions.append(f"{column} IN ({', '.join(['?'] * len(filter_values))})")
+                values.extend([value.lower() for value in filter_values])
+
+        if len(conditions) > 0:
+            sql += f" WHERE {' AND '.join(conditions)}"
+
+        with closing(self._connect()) as connection:
+            return [json_loads(row[0]) for row in connection.execute(f'{sql} ORDER BY created, name', values)]
+
+    def remove(self, names: list):
+        # invalidate entries we changed => they are fetched live until the next sync
+        with closing(self._connect()) as connection:
+            with connection:
+                connection.executemany('DELETE FROM domains WHERE name = ?', [(name.lower(),) for name in names])
+
+    def _store(self, domains: list, synced: float, replace_all: bool = False):
+        with closing(self._connect()) as connection:
+            with connection:
+                if replace_all:
+                    connection.execute('DELETE FROM domains')
+
+                connection.executemany(
+                    'INSERT OR REPLACE INTO domains (name, tld, expires, created, synced, data) VALUES (?, ?, ?, ?, ?, ?)',
+                    [
+                        (
+                            info['DomainName'].lower(),
+                            info['DomainName'].rsplit('.', 1)[-1].lower(),
+                            _timestamp(info.get('Expires')),
+                            _timestamp(info.get('Created')),
+                            synced,
+                            json_dumps(info),
+                        ) for info in domains
+                    ]
+                )
+                connection.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', ('last_sync', synced))
+
+                if replace_all:
+                    connection.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', ('last_full_sync', synced))
+
+    def _expiring(self, after: float, before: float) -> list:
+        # domains that expired before 'after' were already re-checked by an earlier sync
+        with closing(self._connect()) as connection:
+            return [
+                row[0] for row in connection.execute('SELECT name FROM domains WHERE expires > ? AND expires <= ?', (after, before))
+            ]
+
+    def sync(self, password: str, full: bool = False) -> dict:
+        # only one sync at a time across forks => the others wait and re-use the result
+        with file_lock(self.lock_file):
+            return self._sync(password=password, full=full)
+
+    def _fetch(self, password: str, params: dict) -> dict:
+        return ascio_get_domains(params={'user': self.user, 'password': password, 'all_pages': True, **params})
+
+    def _sync(self, password: str, full: bool) -> dict:
+        started = time()
+        last_sync = self._meta('last_sync')
+        last_full_sync = self._meta('last_full_sync')
+        result = {'full': False, 'fetched': 0, 'errors': []}
+
+        if full or last_sync is None or last_full_sync is None or started - last_full_sync > api_config.PORTFOLIO_FULL_SYNC_AGE:
+            response = self._fetch(password=password, params={})
+
+            if _failed(response):
+                result['errors'] = response['Errors']['string']
+                return result
+
+            self._store(domains=_domains(response), synced=started, replace_all=True)
+            result.update({'full': True, 'fetched': len(_domains(response))})
+            return result
+
+        return self._sync_incremental(password=password, started=started, last_sync=last_sync)
+
+    def _sync_incremental(self, password: str, started: float, last_sync: float) -> dict:
+        result = {'full': False, 'fetched': 0, 'errors': []}
+        since_timestamp = last_sync - api_config.PORTFOLIO_SYNC_OVERLAP
+        since = _api_date(since_timestamp)
+        expire_until = started + api_config.PORTFOLIO_EXPIRE_WINDOW * 86400
+        slices = [
+            {'filter_creation_from': since},
+            {'filter_expire_from': since, 'filter_expire_to': _api_date(expire_until)},
+        ]
+        fetched = {}
+
+        for slice_params in slices:
+            response = self._fetch(password=password, params=slice_params)
+
+            if _failed(response):
+                result['errors'] = response['Errors']['string']
+                return result
+
+            fetched.update({info['DomainName'].lower(): info for info in _domains(response)})
+
+        # domains that were about to expire might have been renewed => they are no longer part of the expiry-slice
+        renewed = [name for name in self._expiring(after=since_timestamp, before=expire_until) if name not in fetched]
+
+        for i in range(0, len(renewed), api_config.GET_DOMAINS_DEFAULTS['results']):
+            response = self._fetch(
+                password=password,
+                params={'filter_names': renewed[i:i + api_config.GET_DOMAINS_DEFAULTS['results']]},
+            )
+
+            if _failed(response):
+                result['errors'] = response['Errors']['string']
+                return result
+
+            fetched.update({info['DomainName'].lower(): info for info in _domains(response)})
+
+        # domains that are no longer returned have left the account
+        self.remove(names=[name for name in renewed if name not in fetched])
+        self._store(domains=list(fetched.values()), synced=started)
+        result['fetched'] = len(fetched)
+        return result
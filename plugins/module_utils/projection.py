@@ -0,0 +1,105 @@
+# per-record projection of GetDomains results => shared by the 'ascio_filter_results' filter and the export of the get-module
+#   fields can be selected (keep_fields) and/or removed (remove_fields); nested fields are addressed by path: 'Owner.Email'
+
+def flatten_nameservers(nameservers: dict) -> list:
+    # NameServer1-13 => flat list of their hostnames and addresses (unrolled as it runs for every record)
+    flat = []
+    if nameservers is None:
+        return flat
+
+    for ns in nameservers.values():
+        if ns is None:
+            continue
+
+        host_name, ipv4, ipv6 = ns.get('HostName'), ns.get('IpAddress'), ns.get('IpV6Address')
+        if host_name is not None:
+            flat.append(host_name)
+
+        if ipv4 is not None:
+            flat.append(ipv4)
+
+        if ipv6 is not None:
+            flat.append(ipv6)
+
+    return flat
+
+
+def path_tree(paths: list) -> dict:
+    # ['Owner.Email', 'Owner.Phone', 'Status'] => {'Owner': {'Email': None, 'Phone': None}, 'Status': None}
+    #   None => the whole field/sub-tree
+    tree = {}
+
+    for field_path in paths or []:
+        node = tree
+        parts = field_path.split('.')
+
+        for part in parts[:-1]:
+            if part in node and node[part] is None:
+                # parent is already selected as a whole
+                node = None
+                break
+
+            node = node.setdefault(part, {})
+
+        if node is not None:
+            node[parts[-1]] = None
+
+    return tree
+
+
+def _keep(value: dict, tree: dict) -> dict:
+    # missing fields are set to None => every record has the same schema (csv-columns)
+    record = {}
+
+    for field, sub_tree in tree.items():
+        sub_value = None if value is None else value.get(field)
+
+        if sub_tree is not None:
+            sub_value = _keep(value=sub_value if isinstance(sub_value, dict) else None, tree=sub_tree)
+
+        record[field] = sub_value
+
+    return record
+
+
+def _compile_remove(tree: dict) -> tuple:
+    # (fields to drop on this level, {field: compiled sub-tree})
+    return (
+        [field for field, sub_tree in tree.items() if sub_tree is None],
+        {field: _compile_remove(sub_tree) for field, sub_tree in tree.items() if sub_tree is not None},
+    )
+
+
+def _remove(record: dict, compiled: tuple):
+    # in-place => the record has to be a copy owned by the caller
+    drop, nested = compiled
+
+    for field in drop:
+        record.pop(field, None)
+
+    for field, sub_compiled in nested.items():
+        if isinstance(record.get(field), dict):
+            record[field] = record[field].copy()
+            _remove(record=record[field], compiled=sub_compiled)
+
+
+class DomainProjection:
+    # the field-selection is compiled once and applied to every record in a single pass
+    def __init__(self, remove_fields: list = None, keep_fields: list = None):
+        self.keep = path_tree(keep_fields) if keep_fields else None
+        self.remove = _compile_remove(path_tree(remove_fields))
+        # nameservers are only flattened if they are selected as a whole
+        self.flatten = self.keep is None or self.keep.get('NameServers', {}) is None
+
+    def __call__(self, domain: dict) -> dict:
+        record = domain.copy() if self.keep is None else _keep(value=domain, tree=self.keep)
+        _remove(record=record, compiled=self.remove)
+
+        if self.flatten and 'NameServers' in record:
+            record['NameServers'] = flatten_nameservers(record['NameServers'])
+
+        return record
+
+    def by_name(self, domains: list) -> dict:
+        # {domain-name: record}
+        return {domain['DomainName']: self(domain) for domain in domains}
@@ -0,0 +1,95 @@
+from sqlite3 import connect
+from contextlib import closing
+from json import dumps as json_dumps
+from json import loads as json_loads
+from hashlib import sha256
+from time import time
+
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.cache import ensure_dir
+
+# compiled tldkit-rules => only the flags the modules actually use are stored (one small row per tld)
+#   {'lp_offered': bool, 'lp_required': bool, 'contacts_permitted': bool, 'docs_required': {<command>: bool}}
+
+STORE_FILE = 'tld_rules.sqlite'
+CONTACTS_NOT_PERMITTED = ['not permitted', 'not supported', 'Contact roles does not exist']
+
+
+def compile_rules(info: dict) -> dict:
+    processes = {process['Command']: process for process in info['Processes']}
+    contact_update = processes.get('CONTACT UPDATE', {}).get('Procedure')
+    contacts_permitted = True
+
+    if contact_update is not None:
+        for bad in CONTACTS_NOT_PERMITTED:
+            if contact_update.find(bad) != -1:
+                contacts_permitted = False
+                break
+
+    return {
+        'lp_offered': info['LocalPresenceOffered'],
+        'lp_required': info['LocalPresenceRequired'],
+        'contacts_permitted': contacts_permitted,
+        'docs_required': {
+            command: process['DocumentationRequired'] is True for command, process in processes.items()
+        },
+    }
+
+
+def info_hash(info: dict) -> str:
+    return sha256(json_dumps(info, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class RulesStore:
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.store_file = f'{cache_dir}/{STORE_FILE}'
+
+    def _connect(self):
+        ensure_dir(self.cache_dir)
+        # the timeout lets concurrent forks wait for each others writes
+        connection = connect(self.store_file, timeout=30)
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS rules ('
+            'tld TEXT PRIMARY KEY, updated REAL NOT NULL, etag TEXT, last_modified TEXT, sha256 TEXT, rules TEXT NOT NULL'
+            ')'
+        )
+        return connection
+
+    def get(self, tld: str) -> dict:
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                'SELECT updated, etag, last_modified, sha256, rules FROM rules WHERE tld = ?', (tld,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return {
+            'updated': row[0],
+            'etag': row[1],
+            'last_modified': row[2],
+            'sha256': row[3],
+            'rules': json_loads(row[4]),
+        }
+
+    def put(self, tld: str, rules: dict, content_hash: str, *, etag: str = None, last_modified: str = None, updated: float = None):
+        # updated: time the document was fetched (default: now)
+        with closing(self._connect()) as connection:
+            with connection:
+                connection.execute(
+                    'INSERT OR REPLACE INTO rules (tld, updated, etag, last_modified, sha256, rules) VALUES (?, ?, ?, ?, ?, ?)',
+                    (
+                        tld, time() if updated is None else updated, etag, last_modified, content_hash,
+                        json_dumps(rules, separators=(',', ':')),
+                    ),
+                )
+
+    def touch(self, tld: str, *, etag: str = None, last_modified: str = None):
+        # reset the age of an unmodified entry; validators are only replaced if the server sent new ones
+        with closing(self._connect()) as connection:
+            with connection:
+                connection.execute(
+                    'UPDATE rules SET updated = ?, etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) '
+                    'WHERE tld = ?',
+                    (time(), etag, last_modified, tld),
+                )
@@ -1,47 +1,107 @@
-from requests import get
-from json import dumps as json_dumps
+from requests import get, Session
+from requests.adapters import HTTPAdapter
 from json import loads as json_loads
 from datetime import datetime
-from os import path, mkdir
+from os import path, environ
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
+from time import time
 
-TLDKIT_BASE_URL = 'https://tldkit.ascio.com/api/v1/Tldkit'
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.cache import file_lock
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.tld_rules import RulesStore, compile_rules, info_hash
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.metrics import METRICS
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.call_policy import TLDKIT_RATE_LIMITER, call_with_retry, call_timeout
+
+TLDKIT_BASE_URL = environ.get('ASCIO_TLDKIT_URL', 'https://tldkit.ascio.com/api/v1/Tldkit')
 CACHE_DIR = '~/.cache/ansible-module-ascio'
 MAX_CACHE_AGE = 180
 
+# per-process registry => the compiled rules of every tld are only loaded once per run
+#   {(cache_dir, tld): <compiled rules>}
+_REGISTRY = {}
+_REGISTRY_LOCKS = {}
+_REGISTRY_LOCK = Lock()
+
 
 class TLD:
     def __init__(self, user: str, password: str, domain: str, action: str = '', tld_cache: str = CACHE_DIR):
         self.user = user
         self.password = password
-        self.tld = domain.rsplit('.', 1)[1]
+        self.tld = domain.rsplit('.', 1)[-1]  # domain or plain tld
         self.action = action.upper()
         # REGISTER, DELETE, CONTACT UPDATE, NAMESERVER UPDATE, OWNER CHANGE, RENEW, TRANSFER, AUTORENEW, RESTORE
         # EXPIRE, REGISTRANT DETAILS UPDATE, TRANSFER AWAY
-        self.cache_dir = tld_cache
-        self.cache_file = f'{tld_cache}/{self.tld}.json'
+        cache_dir = path.expanduser(tld_cache)
+        self.store = RulesStore(cache_dir=cache_dir)
+        self.cache_file = f'{cache_dir}/{self.tld}.json'  # raw document of older versions
+        self.lock_file = f'{cache_dir}/{self.tld}.lock'
 
     def docs_required(self) -> bool:
-        req = self._get_action_attribute(attribute='DocumentationRequired')
-        return False if req is None else req
+        return self._get_rules()['docs_required'].get(self.action, False)
 
     def contacts_permitted(self) -> bool:
-        bad_list = ['not permitted', 'not supported', 'Contact roles does not exist']
-        update_todo = self._get_action_attribute(attribute='Procedure', action='CONTACT UPDATE')
-        permitted = True
+        return self._get_rules()['contacts_permitted']
 
-        if update_todo is not None:
-            for bad in bad_list:
-                if update_todo.find(bad) != -1:
-                    permitted = False
-                    break
+    def _fetch(self, session=None, headers: dict = None):
+        # transient faults are retried and the calls are rate-limited (see call_policy.py)
+        def _get():
+            response = (get if session is None else session.get)(
+                f"{TLDKIT_BASE_URL}/{self.tld}", auth=(self.user, self.password), headers=headers,
+                timeout=call_timeout('tldkit'),
+            )
+            response.raise_for_status()
+            return response
 
-        return permitted
+        return call_with_retry(name='tldkit', func=_get, limiter=TLDKIT_RATE_LIMITER)
 
     def _get_info_online(self) -> dict:
-        return get(
-            f"{TLDKIT_BASE_URL}/{self.tld}", auth=(self.user, self.password),
-            timeout=90,
-        ).json()
+        with METRICS.timer('tldkit.fetch'):
+            response = self._fetch()
+            METRICS.count(name='tldkit.response_bytes', value=len(response.content))
+            return response.json()
+
+    def refresh(self, session: Session, force: bool = False) -> bool:
+        # conditional refresh of the compiled rules => returns if the tld-rules have changed
+        with file_lock(self.lock_file):
+            changed = self._refresh(session=session, force=force)
+
+        with _REGISTRY_LOCK:
+            _REGISTRY.pop((self.store.cache_dir, self.tld), None)
+
+        return changed
+
+    def _refresh(self, session: Session, force: bool) -> bool:
+        entry = self.store.get(self.tld)
+        headers = {}
+
+        if not force and entry is not None:
+            if entry['etag'] is not None:
+                headers['If-None-Match'] = entry['etag']
+
+            if entry['last_modified'] is not None:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self._fetch(session=session, headers=headers)
+
+        if response.status_code == 304:
+            self.store.touch(self.tld)
+            return False
+
+        info = response.json()
+        content_hash = info_hash(info)
+        etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+
+        # servers without (working) validators send the full document => unchanged content only resets the age
+        if not force and entry is not None and entry['sha256'] == content_hash:
+            self.store.touch(self.tld, etag=etag, last_modified=last_modified)
+            return False
+
+        rules = compile_rules(info)
+        self.store.put(tld=self.tld, rules=rules, content_hash=content_hash, etag=etag, last_modified=last_modified)
+        return entry is None or entry['rules'] != rules
+
+    def _entry_valid(self, entry: dict) -> bool:
+        return entry is not None and (time() - entry['updated']) / 86400 <= MAX_CACHE_AGE
 
     def _cache_valid(self) -> bool:
         if path.exists(self.cache_file):
@@ -55,46 +115,100 @@ class TLD:
 
         return False
 
-    def _cache_write(self, data: dict) -> bool:
-        with open(self.cache_file, 'w', encoding='utf-8') as cache:
-            cache.write(json_dumps(data))
-            return True
-
     def _cache_read(self) -> dict:
         with open(self.cache_file, 'r', encoding='utf-8') as cache:
             return json_loads(cache.read())
 
-    def _get_info(self) -> dict:
-        if self._cache_valid():
-            return self._cache_read()
+    def _load_rules(self) -> dict:
+        entry = self.store.get(self.tld)
+        if self._entry_valid(entry):
+            METRICS.count(name='tldkit.store.hit')
+            return entry['rules']
+
+        METRICS.count(name='tldkit.store.miss')
+
+        # single-flight across processes => only one fork downloads the document, the others wait and re-use it
+        with file_lock(self.lock_file):
+            entry = self.store.get(self.tld)
+            if self._entry_valid(entry):
+                return entry['rules']
+
+            # documents cached by older versions are compiled without downloading them again
+            #   they keep their original fetch-time => stale documents are not treated as fresh
+            if self._cache_valid():
+                info, updated = self._cache_read(), path.getmtime(self.cache_file)
 
-        data = self._get_info_online()
+            else:
+                info, updated = self._get_info_online(), None
 
-        if not path.exists(self.cache_dir):
-            mkdir(self.cache_dir)
+            rules = compile_rules(info)
+            self.store.put(tld=self.tld, rules=rules, content_hash=info_hash(info), updated=updated)
+            return rules
 
-        self._cache_write(data=data)
-        return data
+    def _get_rules(self) -> dict:
+        key = (self.store.cache_dir, self.tld)
 
-    def _get_action_attribute(self, attribute: str, action: str = None):
-        if action is None:
-            action = self.action
+        with _REGISTRY_LOCK:
+            lock = _REGISTRY_LOCKS.setdefault(key, Lock())
 
-        for process in self._get_info()['Processes']:
-            if process['Command'] == action:
-                return process[attribute]
+        # lock per tld => concurrent lookups of the same tld will wait for the first one
+        with lock:
+            if key not in _REGISTRY:
+                METRICS.count(name='tldkit.registry.miss')
+                _REGISTRY[key] = self._load_rules()
 
-        return None
+            else:
+                METRICS.count(name='tldkit.registry.hit')
+
+            return _REGISTRY[key]
 
     def lp_needed(self):
         # not used since it is set to 'false' on some domains that require a LP.. don't know why that is
-        return self._get_info()['LocalPresenceRequired']
+        return self._get_rules()['lp_required']
 
     def lp_offered(self):
-        return self._get_info()['LocalPresenceOffered']
+        return self._get_rules()['lp_offered']
+
+
+def refresh_cache(user: str, password: str, tlds: list, *, tld_cache: str = CACHE_DIR, workers: int = 8, force: bool = False) -> dict:
+    # warm-up/refresh the cache of multiple tlds in parallel using one pooled http-session
+    refreshed = {'changed': [], 'unchanged': [], 'failed': {}}
+    tlds = sorted({tld.strip().lower().lstrip('.') for tld in tlds} - {''})
+
+    if len(tlds) == 0:
+        return refreshed
+
+    workers = max(1, min(workers, len(tlds)))
+    session = Session()
+    session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=workers))
+
+    def _refresh(tld: str) -> bool:
+        return TLD(user=user, password=password, domain=tld, tld_cache=tld_cache).refresh(session=session, force=force)
+
+    with session, ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {tld: pool.submit(_refresh, tld) for tld in tlds}
+
+        for tld, future in futures.items():
+            try:
+                refreshed['changed' if future.result() else 'unchanged'].append(tld)
+
+            # pylint: disable=W0718
+            except Exception as error:
+                refreshed['failed'][tld] = str(error)
+
+    return refreshed
 
 
 if __name__ == '__main__':
+    if input('Refresh the TLDKit cache? [yes/NO]\n > ').lower() in ['y', 'yes']:
+        print(refresh_cache(
+            user=input('Provide the ASCIO API-User:\n > '),
+            password=input('Provide the ASCIO API-Password:\n > '),
+            tlds=input('Provide the TLDs to refresh (comma separated):\n > ').split(','),
+            tld_cache=input(f'Provide the cache directory (default: {CACHE_DIR}):\n > ') or CACHE_DIR,
+        ))
+        raise SystemExit(0)
+
     result = TLD(
         user=input('Provide the ASCIO API-User:\n > '),
         password=input('Provide the ASCIO API-Password:\n > '),
@@ -0,0 +1,93 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2021, Rene Rath <rene.rath@niceshops.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.api_availability import ascio_get_availability_many, AvailabilityCache
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils import config as api_config
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.module_common import COMMON_ARGS, configure_common, common_result
+
+from sys import exc_info as sys_exc_info
+from traceback import format_exc
+
+# see: https://docs.ansible.com/ansible/latest/dev_guide/developing_program_flow_modules.html#ansiblemodule
+# for api see:
+#   https://aws.ascio.info/api-v3/python/availabilityinfo
+
+DOCUMENTATION = "https://github.com/niceshops/ansible-module-ascio"
+EXAMPLES = "https://github.com/niceshops/ansible-module-ascio"
+RETURN = "https://github.com/niceshops/ansible-module-ascio"
+
+
+def run_module():
+    # arguments we expect
+    module_args = dict(
+        user=dict(type='str', required=True),
+        password=dict(type='str', required=True, no_log=True),
+        **COMMON_ARGS,
+        domains=dict(type='list', elements='str', required=True, description='Domains to check'),
+        max_price=dict(type='float', default=None, description="Only list domains up to this price as 'matching'"),
+        concurrency=dict(type='int', default=20, description='How many domains should be checked concurrently'),
+        cache_ttl=dict(
+            type='int', default=api_config.AVAILABILITY_CACHE_TTL,
+            description='Seconds the results are re-used for (0 = no cache)',
+        ),
+        cache_dir=dict(type='str', default=api_config.CACHE_DIR, description='Directory used to cache the results'),
+    )
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True,
+    )
+
+    # custom conversion
+    domains = list(dict.fromkeys(domain.encode('idna').decode('utf-8').lower() for domain in module.params['domains']))
+    configure_common(params=module.params)
+
+    try:
+        results = ascio_get_availability_many(
+            user=module.params['user'],
+            password=module.params['password'],
+            domains=domains,
+            concurrency=module.params['concurrency'],
+            cache=AvailabilityCache(user=module.params['user'], cache_dir=module.params['cache_dir'], ttl=module.params['cache_ttl']),
+        )
+
+    # pylint: disable=W0718
+    except Exception as error:
+        exc_type, _, _ = sys_exc_info()
+        module.fail_json(
+            msg='Got an error while checking the availability!',
+            errors=[str(exc_type), str(error), str(format_exc())],
+        )
+
+    matching = [
+        domain for domain, result in results.items()
+        if result['available'] and (
+            module.params['max_price'] is None or
+            (result['price'] is not None and result['price'] <= module.params['max_price'])
+        )
+    ]
+    failed = [domain for domain, result in results.items() if result['failed']]
+
+    result = dict(
+        changed=False,
+        failed=len(failed) > 0,
+        domains=results,
+        matching=matching,
+        errors={domain: results[domain]['errors'] for domain in failed},
+    )
+
+    if result['failed']:
+        result['msg'] = 'The ASCIO-API returned an error!'
+
+    module.exit_json(**result, **common_result(params=module.params))
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -4,9 +4,16 @@
 # GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
+from os import path
+
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.niceshopsorg.ascio.plugins.module_utils.api_get_domains import ascio_get_domains
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.api_base import response_to_dict
 from ansible_collections.niceshopsorg.ascio.plugins.module_utils import config as api_config
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.module_common import COMMON_ARGS, configure_common, common_result
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.portfolio import PortfolioIndex
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.export import DomainExport, ExportAborted
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.projection import DomainProjection
 
 # see: https://docs.ansible.com/ansible/latest/dev_guide/developing_program_flow_modules.html#ansiblemodule
 # for api see:
@@ -17,6 +24,107 @@ DOCUMENTATION = "https://github.com/niceshops/ansible-module-ascio"
 EXAMPLES = "https://github.com/niceshops/ansible-module-ascio"
 RETURN = "https://github.com/niceshops/ansible-module-ascio"
 
+# filters that can only be answered by the api
+INDEX_UNSUPPORTED_FILTERS = [
+    'filter_type', 'filter_comment', 'filter_expire_from', 'filter_expire_to', 'filter_creation_from', 'filter_creation_to',
+    'filter_handles', 'filter_owner_name', 'filter_owner_organization', 'filter_owner_email', 'filter_contact_first_name',
+    'filter_contact_last_name', 'filter_contact_organization', 'filter_contact_email', 'filter_nameserver_hostname',
+    'filter_nameserver_ipv4', 'filter_nameserver_ipv6', 'filter_customer_reference_id', 'filter_customer_reference_description',
+]
+
+
+def index_supported(params: dict) -> bool:
+    if params.get('index_max_age') is None or params.get('filter_status', 'All') != 'All':
+        return False
+
+    return all(params.get(key) in [None, []] for key in INDEX_UNSUPPORTED_FILTERS)
+
+
+def index_check(params: dict) -> dict:
+    # answer from the local portfolio-index; it is synced (incrementally) if it is older than 'index_max_age'
+    index = PortfolioIndex(user=params['user'], cache_dir=params.get('cache_dir', api_config.CACHE_DIR))
+    errors = []
+
+    if not index.fresh(max_age=params['index_max_age']):
+        errors = index.sync(password=params['password'])['errors']
+
+    if len(errors) > 0:
+        return {'failed': True, 'data': None, 'count': 0, 'errors': errors}
+
+    domains = index.query(names=params.get('filter_names'), tlds=params.get('filter_tld'))
+    count = len(domains)
+
+    if not params.get('all_pages', False):
+        page_size = params.get('results', api_config.GET_DOMAINS_DEFAULTS['results'])
+        page_start = (params.get('results_page', 1) - 1) * page_size
+        domains = domains[page_start:page_start + page_size]
+
+    if params.get('exclude_fields'):
+        domains = response_to_dict(domains, exclude=params['exclude_fields'])
+
+    return {
+        'failed': False,
+        'data': {'DomainInfo': domains},
+        'count': count,
+        'errors': [],
+    }
+
+
+def _export_file(export: DomainExport, error: OSError) -> str:
+    # export-file the failed path (the file, its temporary file or a parent-directory) belongs to
+    failed = path.abspath(error.filename) if isinstance(error.filename, str) else None
+
+    for file in [file for file in export.targets.values() if file is not None]:
+        target = path.abspath(file)
+        if failed is None or target == failed or target.startswith(failed + path.sep) or (
+                path.dirname(failed) == path.dirname(target) and path.basename(failed).startswith(f'.{path.basename(target)}.')
+        ):
+            return file
+
+    return error.filename
+
+
+def export_check(params: dict) -> dict:
+    # every page is written to the export-files as soon as it was fetched => 'data' is not returned
+    export = DomainExport(
+        ndjson_file=params.get('export_ndjson'),
+        csv_file=params.get('export_csv'),
+        projection=DomainProjection(remove_fields=params.get('export_remove_fields'), keep_fields=params.get('export_keep_fields')),
+    )
+
+    try:
+        with export:
+            if index_supported(params=params):
+                result = index_check(params=params)
+                if not result['failed']:
+                    export.write_page(result['data']['DomainInfo'])
+
+            else:
+                response = ascio_get_domains(params=params, page_callback=export.write_page)
+                result = {
+                    'failed': response['ResultCode'] not in api_config.RESULT_CODE_SUCCESS or len(response['Errors']['string']) > 0,
+                    'count': response['TotalCount'],
+                    'errors': response['Errors']['string'],
+                }
+
+            if result['failed']:
+                raise ExportAborted()
+
+    except ExportAborted:
+        pass
+
+    except OSError as error:
+        # p.e. missing directory or permissions => the export-file is named instead of its temporary file
+        file = _export_file(export=export, error=error)
+        return {
+            'failed': True, 'data': None, 'count': 0, 'errors': [f"{error.strerror or error}: {file}"],
+            'msg': f"Unable to write the export-file '{file}'!",
+        }
+
+    result['data'] = None
+    result['export'] = export.summary()
+    return result
+
 
 def nice_check(module: AnsibleModule, params: dict = None) -> dict:
     # params var can be used to import this function from other modules
@@ -26,6 +134,12 @@ def nice_check(module: AnsibleModule, params: dict = None) -> dict:
     elif params is None:
         return {}
 
+    if params.get('export_ndjson') is not None or params.get('export_csv') is not None:
+        return export_check(params=params)
+
+    if index_supported(params=params):
+        return index_check(params=params)
+
     # run 'check-mode' tasks to find out if the state has changed
     failed = False
 
@@ -49,6 +163,7 @@ def run_module():
     module_args = dict(
         user=dict(type='str', required=True),
         password=dict(type='str', required=True, no_log=True),
+        **COMMON_ARGS,
         order_by=dict(
             type='str',
             description='How to sort the response entries',
@@ -93,6 +208,81 @@ def run_module():
             description='Expiration date stop to filter on, Format: 2021-10-12T15:08:56.956+02:00',
             default=api_config.GET_DOMAINS_DEFAULTS['filter_expire_to'],
         ),
+        filter_creation_from=dict(
+            type='str',
+            description='Creation date start to filter on, Format: 2021-10-12T13:08:56.956+02:00',
+            default=api_config.GET_DOMAINS_DEFAULTS['filter_creation_from'],
+        ),
+        filter_creation_to=dict(
+            type='str',
+            description='Creation date stop to filter on, Format: 2021-10-12T15:08:56.956+02:00',
+            default=api_config.GET_DOMAINS_DEFAULTS['filter_creation_to'],
+        ),
+        filter_handles=dict(
+            type='list', elements='str',
+            description='Domain Handles to filter on',
+            default=api_config.GET_DOMAINS_DEFAULTS['filter_handles'],
+        ),
+        filter_owner_name=dict(
+            type='str',
+            description='Name of the owner-contact to filter on',
+            default=api_config.GET_DOMAINS_DEFAULTS['filter_owner_name'],
+        ),
+        filter_owner_organization=dict(
+            type='str',
+            description='Organization of the owner-contact to filter on',
+            default=api_config.GET_DOMAINS_DEFAULTS['filter_owner_organization'],
+        ),
+        filter_owner_email=dict(
+            type='str',
+            description='E-Mail of the owner-contact to filter on',
+            default=api_config.GET_DOMAINS_DEFAULTS['filter_owner_email'],
+        ),
+        filter_contact_first_name=dict(
+            type='str',
+            description='First name of the admin/tech/billing contacts to filter on',
+            default=api_config.GET_DOMAINS_DEFAULTS['filter_contact_first_name'],
+        ),
+        filter_contact_last_name=dict(
+            type='str',
+            description='Last name of the admin/tech/billing contacts to filter on',
+            default=api_config.GET_DOMAINS_DEFAULTS['filter_contact_last_name'],
+        ),
+        filter_contact_organization=dict(
+            type='str',
+            description='Organization of the admin/tech/billing contacts to filter on',
+            default=api_config.GET_DOMAINS_DEFAULTS['filter_contact_organization'],
+        ),
+        filter_contact_email=dict(
+            type='str',
+            description='E-Mail of the admin/tech/billing contacts to filter on',
+            default=api_config.GET_DOMAINS_DEFAULTS['filter_contact_email'],
+        ),
+        filter_nameserver_hostname=dict(
+            type='str',
+            description='Nameserver hostname to filter on',
+            default=api_config.GET_DOMAINS_DEFAULTS['filter_nameserver_hostname'],
+        ),
+        filter_nameserver_ipv4=dict(
+            type='str',
+            description='Nameserver IPv4 address to filter on',
+            default=api_config.GET_DOMAINS_DEFAULTS['filter_nameserver_ipv4'],
+        ),
+        filter_nameserver_ipv6=dict(
+            type='str',
+            description='Nameserver IPv6 address to filter on',
+            default=api_config.GET_DOMAINS_DEFAULTS['filter_nameserver_ipv6'],
+        ),
+        filter_customer_reference_id=dict(
+            type='str',
+            description='External ID of the customer-reference to filter on',
+            default=api_config.GET_DOMAINS_DEFAULTS['filter_customer_reference_id'],
+        ),
+        filter_customer_reference_description=dict(
+            type='str',
+            description='Description of the customer-reference to filter on',
+            default=api_config.GET_DOMAINS_DEFAULTS['filter_customer_reference_description'],
+        ),
         results=dict(
             type='int',
             default=api_config.GET_DOMAINS_DEFAULTS['results'],
@@ -103,6 +293,54 @@ def run_module():
             default=api_config.GET_DOMAINS_DEFAULTS['results_page'],
             description="If more entries than 'results' exist => you can change the page"
         ),
+        all_pages=dict(
+            type='bool',
+            default=api_config.GET_DOMAINS_DEFAULTS['all_pages'],
+            description="Fetch all pages starting from 'results_page' and merge them into one result"
+        ),
+        page_workers=dict(
+            type='int',
+            default=api_config.GET_DOMAINS_DEFAULTS['page_workers'],
+            description="How many pages should be fetched concurrently if 'all_pages' is enabled"
+        ),
+        exclude_fields=dict(
+            type='list', elements='str',
+            default=api_config.GET_DOMAINS_DEFAULTS['exclude_fields'],
+            description="Fields to drop from the response on any level, like 'DnsSecKeys', 'PrivacyProxy', 'Reseller' or 'Trademark'",
+        ),
+        index_max_age=dict(
+            type='int',
+            default=None,
+            description='Answer from the local portfolio-index; it is synced incrementally if it is older than this many seconds. '
+                        'Only used if no filters except names and TLDs are set',
+        ),
+        cache_dir=dict(
+            type='str',
+            default=api_config.CACHE_DIR,
+            description='Directory used to store the portfolio-index',
+        ),
+        export_ndjson=dict(
+            type='path',
+            default=None,
+            description="Stream the domains page by page to this file (one JSON object per line) instead of returning them as 'data'",
+        ),
+        export_csv=dict(
+            type='path',
+            default=None,
+            description="Stream the domains page by page to this CSV file instead of returning them as 'data'",
+        ),
+        export_remove_fields=dict(
+            type='list', elements='str',
+            default=[],
+            description="Fields to remove from the exported records (like the 'ascio_filter_results' filter); "
+                        "nested fields can be addressed by path: 'Owner.Email'",
+        ),
+        export_keep_fields=dict(
+            type='list', elements='str',
+            default=[],
+            description="Only export these fields (like the 'ascio_filter_results' filter); "
+                        "nested fields can be addressed by path: 'Owner.Email'",
+        ),
     )
     module = AnsibleModule(
         argument_spec=module_args,
@@ -121,13 +359,15 @@ def run_module():
     module.params['filter_names'] = [name.encode('idna').decode('utf-8') for name in module.params['filter_names']]
     module.params['filter_tld'] = [tld.encode('idna').decode('utf-8') for tld in module.params['filter_tld']]
 
+    configure_common(params=module.params)
+
     # run check or do actual work
     _task_result = nice_check(module=module)
 
     # return status and changes to user
     if _task_result['failed']:
         module.fail_json(
-            msg='The ASCIO-API returned an error!',
+            msg=_task_result.get('msg', 'The ASCIO-API returned an error!'),
             result=dict(
                 errors=_task_result['errors'],
                 failed=True,
@@ -139,7 +379,10 @@ def run_module():
         result['errors'] = _task_result['errors']
         result['count'] = _task_result['count']
 
-        module.exit_json(**result)
+        if 'export' in _task_result:
+            result['export'] = _task_result['export']
+
+        module.exit_json(**result, **common_result(params=module.params))
 
 
 def main():
@@ -0,0 +1,79 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2021, Rene Rath <rene.rath@niceshops.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils import config as api_config
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.module_common import COMMON_ARGS, configure_common, common_result
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.nameservers import NameserverMigration
+
+# see: https://docs.ansible.com/ansible/latest/dev_guide/developing_program_flow_modules.html#ansiblemodule
+# for api see:
+#   https://aws.ascio.info/api-v3/python/createorder
+
+DOCUMENTATION = "https://github.com/niceshops/ansible-module-ascio"
+EXAMPLES = "https://github.com/niceshops/ansible-module-ascio"
+RETURN = "https://github.com/niceshops/ansible-module-ascio"
+
+FILTER_KEYS = [key for key in api_config.GET_DOMAINS_DEFAULTS if key.startswith('filter_') and key != 'filter_names']
+
+
+def run_module():
+    # arguments we expect
+    module_args = dict(
+        user=dict(type='str', required=True),
+        password=dict(type='str', required=True, no_log=True),
+        **COMMON_ARGS,
+        nameservers=dict(type='list', elements='str', required=True, description='Nameservers all domains should use'),
+        domains=dict(type='list', elements='str', default=None, description='Domains to update'),
+        filter=dict(
+            type='dict', default=None,
+            description="Select the domains using the filters of the 'get' module; p.e. {'filter_nameserver_hostname': 'ns1.old.net'}"
+        ),
+        all=dict(type='bool', default=False, description="Update all domains of the account; required if neither 'domains' nor 'filter' are set"),
+        tld_cache=dict(type='str', default=api_config.CACHE_DIR, description='Directory used to cache the TLDKit configurations and the order-ledger'),
+        force=dict(type='bool', default=False, description='Force changes if documentation is required'),
+        concurrency=dict(type='int', default=20, description='How many orders should be submitted concurrently'),
+        batch_size=dict(type='int', default=100, description="Orders per batch; the 'progress_file' is updated after every batch"),
+        skip_pending_orders=dict(type='bool', default=True, description='Skip domains that have orders in flight'),
+        progress_file=dict(type='path', default=None, description='JSON-file the progress of the migration is written to'),
+    )
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True,
+        required_one_of=[('domains', 'filter', 'all')],
+        mutually_exclusive=[('all', 'domains'), ('all', 'filter')],
+    )
+
+    configure_common(params=module.params)
+
+    if not 2 <= len(module.params['nameservers']) <= 13:
+        module.fail_json(msg='You need to supply between 2 and 13 nameservers!')
+
+    # empty selections would match the whole account => that has to be requested explicitly
+    if not module.params['all'] and not module.params['domains'] and not module.params['filter']:
+        module.fail_json(msg="No domains selected! Supply 'domains' or 'filter' - or set 'all: true' to update all domains of the account.")
+
+    unsupported = [key for key in (module.params['filter'] or {}) if key not in FILTER_KEYS]
+    if len(unsupported) > 0:
+        module.fail_json(msg=f"Unsupported filters: {', '.join(unsupported)} (supported: {', '.join(FILTER_KEYS)})")
+
+    module.params['domains'] = [domain.encode('idna').decode('utf-8') for domain in module.params['domains'] or []]
+    migration = NameserverMigration(params=module.params, check_mode=module.check_mode)
+    result = migration.run()
+    result.update(migration.result())
+
+    if result['failed']:
+        result['msg'] = 'The ASCIO-API returned an error!'
+
+    module.exit_json(**result, **common_result(params=module.params))
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2021, Rene Rath <rene.rath@niceshops.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils import config as api_config
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.module_common import COMMON_ARGS, configure_common, common_result
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.orders import OrderLedger, poll_orders
+
+# see: https://docs.ansible.com/ansible/latest/dev_guide/developing_program_flow_modules.html#ansiblemodule
+# for api see:
+#   https://aws.ascio.info/api-v3/python/getorder
+
+DOCUMENTATION = "https://github.com/niceshops/ansible-module-ascio"
+EXAMPLES = "https://github.com/niceshops/ansible-module-ascio"
+RETURN = "https://github.com/niceshops/ansible-module-ascio"
+
+
+def run_module():
+    # arguments we expect
+    module_args = dict(
+        user=dict(type='str', required=True),
+        password=dict(type='str', required=True, no_log=True),
+        **COMMON_ARGS,
+        tld_cache=dict(type='str', default=api_config.CACHE_DIR, description="Directory of the order-ledger (same as for the 'register' module)"),
+        domains=dict(type='list', elements='str', default=[], description='Only poll the orders of these domains'),
+        order_ids=dict(type='list', elements='str', default=[], description='Only poll these orders'),
+        concurrency=dict(type='int', default=10, description='How many orders should be polled concurrently'),
+        interval=dict(type='int', default=30, description="Seconds between the polling-rounds (see 'timeout')"),
+        timeout=dict(type='int', default=0, description='Poll until all orders have finished or this many seconds passed (0 = one round)'),
+    )
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True,
+    )
+
+    configure_common(params=module.params)
+    module.params['domains'] = [domain.encode('idna').decode('utf-8') for domain in module.params['domains']]
+    polled = poll_orders(
+        params=module.params,
+        ledger=OrderLedger(user=module.params['user'], cache_dir=module.params['tld_cache']),
+        persist=not module.check_mode,
+    )
+
+    orders = list(polled['orders'].values())
+    result = dict(
+        changed=False,
+        failed=len(polled['errors']) > 0,
+        orders=orders,
+        completed=[order['order_id'] for order in orders if order['status'] == 'Completed'],
+        failed_orders=[order['order_id'] for order in orders if order['status'] in api_config.ORDER_FAILED_STATUS],
+        pending=[order['order_id'] for order in orders if order['status'] not in api_config.ORDER_FINAL_STATUS],
+        errors=polled['errors'],
+        rounds=polled['rounds'],
+    )
+
+    if result['failed']:
+        result['msg'] = 'The ASCIO-API returned an error!'
+
+    module.exit_json(**result, **common_result(params=module.params))
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
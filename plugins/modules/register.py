@@ -7,12 +7,19 @@ __metaclass__ = type
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.niceshopsorg.ascio.plugins.module_utils.api_get_domains import ascio_get_domains
 from ansible_collections.niceshopsorg.ascio.plugins.module_utils.api_base import ascio_api
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.api_availability import ascio_get_availability
 from ansible_collections.niceshopsorg.ascio.plugins.module_utils import config as api_config
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.module_common import COMMON_ARGS, configure_common, common_result
 from ansible_collections.niceshopsorg.ascio.plugins.module_utils.tldkit import TLD
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.portfolio import PortfolioIndex
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.errors import error_classifier, count_error_codes
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.plan import fingerprint, write_plan, read_plan
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.orders import OrderLedger, pending_orders
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.nameservers import build_nameservers
 
 from sys import exc_info as sys_exc_info
 from traceback import format_exc
-from re import match as regex_match
+from concurrent.futures import ThreadPoolExecutor
 
 # see: https://docs.ansible.com/ansible/latest/dev_guide/developing_program_flow_modules.html#ansiblemodule
 
@@ -39,21 +46,30 @@ class Register:
         'contact_billing': 'Billing',
     }
 
-    HIDE_WHOIS_TLDs = ['com', 'cc', 'tv']  # .net did not work
-    KNOWN_ERRORS = {
-        'pending': 'FO405',
-        'update_pending': "Order rejected because of '.*?' order '.*?' on same object",  # ..Object status prohibits operation
-        'balance_exceeded': 'Partner (.*?) blocked',
+    ORDER_DOCS = {  # TLDKit-action and error-message per order-type
+        'Register': ('REGISTER', 'Documentation is required to register this TLD! Execution can be forced.'),
+        'NameserverUpdate': ('NAMESERVER UPDATE', 'Documentation is required to update nameservers for this TLD! Execution can be forced.'),
+        'ContactUpdate': ('CONTACT UPDATE', 'Documentation is required to update the contacts for this TLD! Execution can be forced.'),
+        'OwnerChange': ('OWNER CHANGE', 'Documentation is required to update the owner for this TLD! Execution can be forced.'),
+        'RegistrantDetailsUpdate': ('OWNER CHANGE', 'Documentation is required to update the owner for this TLD! Execution can be forced.'),
     }
 
+    HIDE_WHOIS_TLDs = ['com', 'cc', 'tv']  # .net did not work
     TRADEMARK_COUNTRY_TLDs = ['it']  # tld's that need the trademark country to be set (will be the owners country)
+    OWNER_ORDERS = ['Register', 'OwnerChange', 'RegistrantDetailsUpdate']
 
-    def __init__(self, module: AnsibleModule):
+    def __init__(self, module: AnsibleModule, params: dict = None, existing: dict = None):
+        # params can be supplied to process multiple domains using the same module
+        # existing can hold the pre-fetched GetDomains response for this domain
         self.module = module
+        self.params = module.params if params is None else params
+        self.existing = existing
         self.nameservers = None
+        self.local_presence = None
         self.result = {
             'failed': False,
             'errors': [],
+            'error_codes': [],
             'premium': False,
             'price': None,
             'price_currency': None,
@@ -61,6 +77,7 @@ class Register:
             'msg': False,
             'changed': False,
             'order': None,
+            'orders': [],
             'owner': False,
             'diff': {
                 'before': {},
@@ -74,325 +91,371 @@ class Register:
         #   if the domain is available
         #   if the relevant domain config has been changed
 
-        self.nameservers = self._build_nameservers(ns_list=self.module.params['nameservers'])
+        self.nameservers = build_nameservers(ns_list=self.params['nameservers'])
 
-        # get existing domains to check if we already registered the requested domain
-        response = ascio_get_domains(
-            params={
-                'user': self.module.params['user'],
-                'password': self.module.params['password'],
-                'filter_names': [self.module.params['domain']],
-            },
+        if self._orders_in_flight():
+            return self.result
+
+        # availability and price only matter if the domain can be registered
+        if self._observe(response=self._get_existing(indexed=True)) and not self.result['owner']:
+            self._get_availability()
+
+        if self.module.check_mode:
+            # output infos regarding documentation requirements => only for the orders the diff needs
+            orders = self._planned_orders()
+
+            for order in orders:
+                self._docs_required(order=order)
+
+            if self.params['plan_file'] is not None and not self.result['failed']:
+                self.result['plan'] = self._plan(orders=orders)
+
+        self._error_check()
+        return self.result
+
+    def set(self) -> dict:
+        # run 'check-mode' tasks to find out if the state has changed
+        self.check()
+        self._submit()
+        self._error_check()
+        return self.result
+
+    def apply(self, plan: dict) -> dict:
+        # submit exactly the orders of a reviewed plan => only the observed state is re-verified (no availability-/TLDKit-checks)
+        #   the live state is compared as the portfolio-index could be outdated
+        self.nameservers = build_nameservers(ns_list=self.params['nameservers'])
+
+        if plan is None:
+            self.result['errors'].append('No plan was created for this domain => run the check-mode again!')
+            self.result['failed'] = True
+
+        elif plan['settings'] != self._settings_fingerprint():
+            self.result['errors'].append('The settings of the domain were changed since the plan was created => run the check-mode again!')
+            self.result['failed'] = True
+
+        elif not self._orders_in_flight() and self._observe(response=self._get_existing(indexed=False)):
+            if plan['fingerprint'] != self._state_fingerprint():
+                self.result['errors'].append('The domain was changed since the plan was created => run the check-mode again!')
+                self.result['failed'] = True
+
+            else:
+                for key in ['available', 'premium', 'price', 'price_currency']:
+                    self.result[key] = plan[key]
+
+                self.local_presence = plan.get('local_presence')
+                self._submit(orders=plan['orders'])
+
+        self._error_check()
+        return self.result
+
+    def _orders_in_flight(self) -> bool:
+        # further orders on the same object would be rejected (FO405) => skipped without asking the api
+        if not self.params['skip_pending_orders']:
+            return False
+
+        pending = pending_orders(
+            user=self.params['user'], password=self.params['password'],
+            ledger=OrderLedger(user=self.params['user'], cache_dir=self.params['tld_cache']), names=[self.params['domain']],
         )
+        if len(pending) == 0:
+            return False
+
+        self.result['skipped'] = True
+        self.result['pending_orders'] = pending
+        self.result['msg'] = f"Skipped as the domain has {len(pending)} order(s) in flight => see the 'orders' module"
+        return True
+
+    def _get_existing(self, indexed: bool) -> dict:
+        # get existing domains to check if we already registered the requested domain
+        response = self.existing
+        if response is None and indexed:
+            response = self._get_indexed()
+
+        if response is None:
+            response = ascio_get_domains(
+                params={
+                    'user': self.params['user'],
+                    'password': self.params['password'],
+                    'filter_names': [self.params['domain']],
+                    'exclude_fields': api_config.GET_DOMAINS_COMPARE_EXCLUDE,
+                },
+            )
+
+        return response
+
+    def _observe(self, response: dict) -> bool:
         self.result['msg'] = response['ResultMessage']
 
         if response['ResultCode'] not in api_config.RESULT_CODE_SUCCESS or len(response['Errors']['string']) > 0:
             # fail if we were not able to retrieve the data
             self.result['failed'] = True
             self.result['errors'].extend(response['Errors']['string'])
+            return False
+
+        if response['TotalCount'] == 0:
+            self.result['changed'] = True
 
         else:
-            if response['TotalCount'] == 0:
-                self.result['changed'] = True
+            self.result['owner'] = True
+            self._compare_config(response=response)
+
+        return True
+
+    def _plan(self, orders: list) -> dict:
+        return {
+            'orders': orders,
+            'fingerprint': self._state_fingerprint(),
+            'settings': self._settings_fingerprint(),
+            # only the orders sending the owner can request a local-presence
+            'local_presence': any(order in self.OWNER_ORDERS for order in orders) and self._local_presence(),
+        }
 
-            else:
-                self.result['owner'] = True
-                self._compare_config(response=response)
+    def _planned_orders(self) -> list:
+        # order-types the set-run would submit
+        if not self.result['changed']:
+            return []
 
-            self._get_availability()
+        if not self.result['owner']:
+            return ['Register']
 
-        if self.module.check_mode:
-            # output infos regarding documentation requirements
-            if not self.result['owner']:
-                self._docs_required(
-                    action='REGISTER',
-                    msg='Documentation is required to register this TLD! Execution can be forced.'
-                )
-
-            elif self.result['changed']:
-                self._docs_required(
-                    action='NAMESERVER UPDATE',
-                    msg='Documentation is required to update nameservers for this TLD! Execution can be forced.'
-                )
-                self._docs_required(
-                    action='OWNER CHANGE',
-                    msg='Documentation is required to update the owner for this TLD! Execution can be forced.'
-                )
-                if self._contacts_permitted():
-                    self._docs_required(
-                        action='CONTACT UPDATE',
-                        msg='Documentation is required to update the contacts for this TLD! Execution can be forced.'
-                    )
+        return self._update_orders()
 
-        return self.result
+    def _update_orders(self) -> list:
+        # order-types of an owned domain => shared by the plan and the set-run
+        orders = []
+        if self._nameservers_changed():
+            orders.append('NameserverUpdate')
 
-    def set(self) -> dict:
-        # run 'check-mode' tasks to find out if the state has changed
-        self.check()
+        if self.params['update_only_ns']:
+            return orders
 
-        # run action if check succeeded and action is required
-        if not self.result['failed'] and self.result['changed']:
-            if self.module.params['max_price'] is not None and self.result['price'] is not None and \
-                    self.result['price'] > self.module.params['max_price']:
-                # if we defined a maximum price and the price is higher
-                self.result['errors'].append('Domain price was higher than you allowed it to be!')
-                self.result['failed'] = True
-                return self.result
+        contact_update = self._contacts_changed() and self._contacts_permitted()
+        if contact_update:
+            orders.append('ContactUpdate')
 
-            if self.result['premium'] and not self.module.params['premium']:
-                # if domain is premium and we don't allow registration of premium domains
-                self.result['errors'].append(
-                    "Domain is listed as 'premium' but you did not allow premium domains to be registered!"
-                )
-                self.result['failed'] = True
-                return self.result
+        if not self._owner_changed() or (contact_update and not self._docs_blocked(order='ContactUpdate')):
+            # the owner cannot be updated together with the contacts => only deferred if the contacts are actually sent
+            return orders
 
-            if not self.result['available'] and not self.result['owner']:
-                # if the domain is owned by someone else
-                self.result['errors'].append("Domain is not available for registration!")
-                self.result['failed'] = True
-                return self.result
+        owner_change, _ = self._owner_changes()
+        orders.append('OwnerChange' if owner_change else 'RegistrantDetailsUpdate')
+        return orders
+
+    def _state_fingerprint(self) -> str:
+        # observed state the plan is based on
+        return fingerprint({'owner': self.result['owner'], 'before': self.result['diff']['before']})
 
+    def _settings_fingerprint(self) -> str:
+        # requested state => the plan is only valid for the settings it was created with
+        return fingerprint({key: self.params[key] for key in ['domain'] + BULK_DOMAIN_PARAMS})
+
+    def _submit(self, orders: list = None):
+        # run action if check succeeded and action is required
+        #   orders: order-types of a reviewed plan => submitted as they are (the check-run did their TLDKit-checks)
+        if not self.result['failed'] and self.result['changed'] and self._order_allowed():
             # run the actual tasks to register the domain
-            if not self.result['owner']:
-                if not self._docs_required(
-                        action='REGISTER',
-                        msg='Documentation is required to register this TLD! Execution can be forced.'
-                ):
+            if orders is not None:
+                self._submit_orders(orders=orders)
+
+            elif not self.result['owner']:
+                if not self._docs_required(order='Register'):
                     self._create_call()
 
             else:
                 self._update_call()
 
-        self._error_check()
-        return self.result
+        if self.result['changed'] and not self.module.check_mode and self.params['index_max_age'] is not None:
+            PortfolioIndex(user=self.params['user'], cache_dir=self.params['tld_cache']).remove(names=[self.params['domain']])
+
+    def _order_allowed(self) -> bool:
+        if self.params['max_price'] is not None and self.result['price'] is not None and \
+                self.result['price'] > self.params['max_price']:
+            # if we defined a maximum price and the price is higher
+            self.result['errors'].append('Domain price was higher than you allowed it to be!')
+            self.result['failed'] = True
+            return False
+
+        if self.result['premium'] and not self.params['premium']:
+            # if domain is premium and we don't allow registration of premium domains
+            self.result['errors'].append(
+                "Domain is listed as 'premium' but you did not allow premium domains to be registered!"
+            )
+            self.result['failed'] = True
+            return False
+
+        if not self.result['available'] and not self.result['owner']:
+            # if the domain is owned by someone else
+            self.result['errors'].append("Domain is not available for registration!")
+            self.result['failed'] = True
+            return False
+
+        return True
+
+    def _get_indexed(self) -> dict:
+        # owned domains can be answered from a fresh portfolio-index; unknown ones are always checked live
+        if self.params['index_max_age'] is None:
+            return None
+
+        index = PortfolioIndex(user=self.params['user'], cache_dir=self.params['tld_cache'])
+        if not index.fresh(max_age=self.params['index_max_age']):
+            return None
+
+        existing = index.get(names=[self.params['domain']])
+        if len(existing) == 0:
+            return None
+
+        return domain_response(domains=existing, message='Answered from the portfolio-index')
 
     def _error_check(self):
-        # replacing generic error messages with ones that actually have a meaning
-        new_errors = []
+        # replacing generic error messages with ones that actually have a meaning and adding their error-codes
+        #   errors that were already classified are skipped => can run after check and set
+        classified = len(self.result['error_codes'])
+        messages, codes = error_classifier(self.params['error_patterns']).classify_all(self.result['errors'][classified:])
+        self.result['errors'][classified:] = messages
+        self.result['error_codes'].extend(codes)
+
+    def _update_call(self):
+        # update calls => the same orders the plan shows
+        orders = self._update_orders()
 
-        for error in self.result['errors']:
-            if regex_match(f".*{self.KNOWN_ERRORS['pending']}.*", error) is not None:
-                new_errors.append('Domain is in Status PENDING => no changes can be made!')
+        for order in orders:
+            if not self._docs_required(order=order):
+                self._create_order(self._update_request(order=order))
 
-            elif regex_match(f".*{self.KNOWN_ERRORS['update_pending']}.*", error) is not None:
-                new_errors.append(
-                    'After contact/owner-updates it can take some minutes before another change can be performed!'
-                )
+        self._owner_errors(orders=orders)
 
-            elif regex_match(f".*{self.KNOWN_ERRORS['balance_exceeded']}.*", error) is not None:
-                new_errors.append(
-                    'The monthly account-balance has exceeded a maximum threshold! '
-                    'You need to transfer some money to ASCIO to unblock your account!'
-                )
+    def _submit_orders(self, orders: list):
+        for order in orders:
+            if order == 'Register':
+                self._create_call()
 
             else:
-                new_errors.append(error)
+                self._create_order(self._update_request(order=order))
 
-        self.result['errors'] = new_errors
+        if self.result['owner']:
+            self._owner_errors(orders=orders)
 
-    def _update_call(self):
-        # update calls
-        #   update nameservers
-        if self.result['diff']['before']['nameservers'] != self.result['diff']['after']['nameservers']:
-            if not self._docs_required(
-                    action='NAMESERVER UPDATE',
-                    msg='Documentation is required to update nameservers for this TLD! Execution can be forced.'
-            ):
-                response = ascio_api(
-                    method='CreateOrder',
-                    user=self.module.params['user'],
-                    password=self.module.params['password'],
-                    request={
-                        'Type': 'NameserverUpdate',
-                        'Domain': {
-                            'Name': self.module.params['domain'],
-                            'NameServers': self.nameservers,
-                        }
-                    },
-                    request_type='v3:DomainOrderRequest',
-                )
-
-                self.result['msg'] = response['ResultMessage']
-                self.result['errors'].extend(response['Errors']['string'])
-
-                if response['ResultCode'] not in api_config.RESULT_CODE_SUCCESS:
-                    self.result['failed'] = True
-
-        if not self.module.params['update_only_ns']:
-            #   update contacts
-            contact_update = False
-
-            if self.result['diff']['before']['contact_billing'] != self.result['diff']['after']['contact_billing'] or \
-                    self.result['diff']['before']['contact_admin'] != self.result['diff']['after']['contact_admin'] or \
-                    self.result['diff']['before']['contact_tech'] != self.result['diff']['after']['contact_tech']:
-
-                if not self._docs_required(
-                        action='CONTACT UPDATE',
-                        msg='Documentation is required to update the contacts for this TLD! Execution can be forced.'
-                ) and self._contacts_permitted():
-                    contact_update = True
-                    response = ascio_api(
-                        method='CreateOrder',
-                        user=self.module.params['user'],
-                        password=self.module.params['password'],
-                        request={
-                            'Type': 'ContactUpdate',
-                            'Domain': {
-                                'Name': self.module.params['domain'],
-                                'Admin': self.module.params['contact_admin'],
-                                'Tech': self.module.params['contact_tech'],
-                                'Billing': self.module.params['contact_billing'],
-                            }
-                        },
-                        request_type='v3:DomainOrderRequest',
-                    )
-
-                    self.result['msg'] = response['ResultMessage']
-                    self.result['errors'].extend(response['Errors']['string'])
-
-                    if response['ResultCode'] not in api_config.RESULT_CODE_SUCCESS:
-                        self.result['failed'] = True
-
-            #   update registrant
-            owner_change = False
-            owner_details = False
-
-            if self.result['diff']['before']['contact_owner'] != self.result['diff']['after']['contact_owner']:
-                if contact_update:
-                    self.result['errors'].append(
-                        'The contacts and owner cannot be changed at the same time => '
-                        'you need to run the update again after the current changes have been completed.'
-                    )
-
-                elif not self._docs_required(
-                        action='OWNER CHANGE',
-                        msg='Documentation is required to update the owner for this TLD! Execution can be forced.'
-                ):
-                    # first we check if a owner-change is needed
-
-                    for field in self.result['diff']['before']['contact_owner']:
-                        if field in self.OWNER_CHANGE_FIELDS and \
-                                self.result['diff']['before']['contact_owner'][field] != self.result['diff']['after']['contact_owner'][field]:
-
-                            owner_change = True
-
-                        elif self.result['diff']['before']['contact_owner'][field] != self.result['diff']['after']['contact_owner'][field]:
-                            owner_details = True
-
-                    if owner_change:
-                        response = ascio_api(
-                            method='CreateOrder',
-                            user=self.module.params['user'],
-                            password=self.module.params['password'],
-                            request=self._registration_special_cases({
-                                'Type': 'OwnerChange',
-                                'Domain': {
-                                    'Name': self.module.params['domain'],
-                                    'Owner': self.module.params['contact_owner'],
-                                }
-                            }),
-                            request_type='v3:DomainOrderRequest',
-                        )
-
-                    else:
-                        response = ascio_api(
-                            method='CreateOrder',
-                            user=self.module.params['user'],
-                            password=self.module.params['password'],
-                            request=self._registration_special_cases({
-                                'Type': 'RegistrantDetailsUpdate',
-                                'Domain': {
-                                    'Name': self.module.params['domain'],
-                                    'Owner': self.module.params['contact_owner'],
-                                }
-                            }),
-                            request_type='v3:DomainOrderRequest',
-                        )
-
-                    if owner_details and owner_change:
-                        self.result['errors'].append(
-                            'The owner cannot be changed and updated at the same time => '
-                            'you need to run the update again after the current changes have been completed.'
-                        )
-
-                    self.result['msg'] = response['ResultMessage']
-                    self.result['errors'].extend(response['Errors']['string'])
-
-                    if response['ResultCode'] not in api_config.RESULT_CODE_SUCCESS:
-                        self.result['failed'] = True
+    def _owner_errors(self, orders: list):
+        # owner-updates that have to wait for the submitted orders
+        if not self.params['update_only_ns'] and self._owner_changed() and not any(order in self.OWNER_ORDERS for order in orders):
+            self.result['errors'].append(
+                'The contacts and owner cannot be changed at the same time => '
+                'you need to run the update again after the current changes have been completed.'
+            )
 
-    def _create_call(self):
-        # register/create call
-        request = self._registration_special_cases({
-            'Type': 'Register',
-            'Domain': {
-                'Name': self.module.params['domain'],
-                'Owner': self.module.params['contact_owner'],
-                'Admin': self.module.params['contact_admin'],
-                'Tech': self.module.params['contact_tech'],
-                'Billing': self.module.params['contact_billing'],
-                'NameServers': self.nameservers,
-            }
-        })
+        if 'OwnerChange' in orders and self._owner_changes()[1]:
+            self.result['errors'].append(
+                'The owner cannot be changed and updated at the same time => '
+                'you need to run the update again after the current changes have been completed.'
+            )
+
+    def _update_request(self, order: str) -> dict:
+        domain = {'Name': self.params['domain']}
+
+        if order == 'NameserverUpdate':
+            domain['NameServers'] = self.nameservers
+
+        elif order == 'ContactUpdate':
+            domain.update(Admin=self.params['contact_admin'], Tech=self.params['contact_tech'], Billing=self.params['contact_billing'])
 
+        else:
+            # 'OwnerChange' or 'RegistrantDetailsUpdate'
+            domain['Owner'] = self.params['contact_owner']
+            return self._registration_special_cases({'Type': order, 'Domain': domain})
+
+        return {'Type': order, 'Domain': domain}
+
+    def _create_order(self, request: dict) -> dict:
+        # every submitted order is recorded in the ledger => the domain is skipped until the order has finished
         response = ascio_api(
             method='CreateOrder',
-            user=self.module.params['user'],
-            password=self.module.params['password'],
+            user=self.params['user'],
+            password=self.params['password'],
             request=request,
             request_type='v3:DomainOrderRequest',
         )
 
-        self.result['order'] = response['OrderInfo']
+        if response['OrderInfo'] is not None:
+            self.result['orders'].append(response['OrderInfo'])
+            OrderLedger(user=self.params['user'], cache_dir=self.params['tld_cache']).record(
+                domain=self.params['domain'], order_type=request['Type'], order_info=response['OrderInfo'],
+            )
+
         self.result['msg'] = response['ResultMessage']
         self.result['errors'].extend(response['Errors']['string'])
 
         if response['ResultCode'] not in api_config.RESULT_CODE_SUCCESS:
             self.result['failed'] = True
 
-    def _get_availability(self):
-        # check availability of domain and its price
-        response = ascio_api(
-            method='AvailabilityInfo',
-            user=self.module.params['user'],
-            password=self.module.params['password'],
-            request={
-                "DomainName": self.module.params['domain'],
-                "Quality": "QualityTest",
-            }
+        return response
+
+    def _nameservers_changed(self) -> bool:
+        return self.result['diff']['before']['nameservers'] != self.result['diff']['after']['nameservers']
+
+    def _contacts_changed(self) -> bool:
+        return any(
+            self.result['diff']['before'][contact] != self.result['diff']['after'][contact]
+            for contact in ['contact_billing', 'contact_admin', 'contact_tech']
         )
 
-        self.result['msg'] = response['ResultMessage']
-        if response['ResultMessage'] == api_config.DOMAIN_AVAILABLE_RESULT:
-            self.result['available'] = True
+    def _owner_changed(self) -> bool:
+        return self.result['diff']['before']['contact_owner'] != self.result['diff']['after']['contact_owner']
 
-        if response['ResultCode'] in api_config.RESULT_CODE_SUCCESS and len(response['Errors']['string']) == 0:
-            if response['DomainType'] != api_config.DOMAIN_TYPE_STANDARD:
-                self.result['premium'] = True
+    def _owner_changes(self) -> tuple:
+        # (owner-change, owner-details) => changes of the OWNER_CHANGE_FIELDS require an owner-change
+        owner_change = False
+        owner_details = False
 
-            for info in response['Prices']['PriceInfo']:
-                if info['Product']['OrderType'] == 'Register':
-                    self.result['price'] = float(info['Price'])
+        for field in self.result['diff']['before']['contact_owner']:
+            if field in self.OWNER_CHANGE_FIELDS and \
+                    self.result['diff']['before']['contact_owner'][field] != self.result['diff']['after']['contact_owner'][field]:
 
-            self.result['price_currency'] = response['Currency']
+                owner_change = True
 
-        else:
-            self.result['errors'].extend(response['Errors']['string'])
+            elif self.result['diff']['before']['contact_owner'][field] != self.result['diff']['after']['contact_owner'][field]:
+                owner_details = True
+
+        return owner_change, owner_details
+
+    def _create_call(self):
+        # register/create call
+        request = self._registration_special_cases({
+            'Type': 'Register',
+            'Domain': {
+                'Name': self.params['domain'],
+                'Owner': self.params['contact_owner'],
+                'Admin': self.params['contact_admin'],
+                'Tech': self.params['contact_tech'],
+                'Billing': self.params['contact_billing'],
+                'NameServers': self.nameservers,
+            }
+        })
+
+        self.result['order'] = self._create_order(request)['OrderInfo']
+
+    def _get_availability(self):
+        # check availability of domain and its price
+        availability = ascio_get_availability(
+            user=self.params['user'],
+            password=self.params['password'],
+            domain=self.params['domain'],
+        )
+
+        self.result['msg'] = availability['msg']
+        for key in ['available', 'premium', 'price', 'price_currency']:
+            self.result[key] = availability[key]
+
+        if availability['failed']:
+            self.result['errors'].extend(availability['errors'])
             self.result['failed'] = True
 
     def _registration_special_cases(self, request: dict) -> dict:
         _tld = request['Domain']['Name'].rsplit('.', 1)[1]
 
-        if self.module.params['whois_hide'] and _tld in self.HIDE_WHOIS_TLDs:
+        if self.params['whois_hide'] and _tld in self.HIDE_WHOIS_TLDs:
             request['Domain']['DiscloseSocialData'] = 'false'
 
-        if self.module.params['lp'] and TLD(
-                user=self.module.params['user'],
-                password=self.module.params['password'],
-                domain=self.module.params['domain'],
-                tld_cache=self.module.params['tld_cache'],
-        ).lp_offered():
+        if self._local_presence():
             request['Domain']['LocalPresence'] = 'true'
 
         if _tld in self.TRADEMARK_COUNTRY_TLDs:
@@ -400,14 +463,26 @@ class Register:
 
         return request
 
+    def _local_presence(self) -> bool:
+        # looked up once; apply-runs use the one of the plan
+        if self.local_presence is None:
+            self.local_presence = self.params['lp'] and TLD(
+                user=self.params['user'],
+                password=self.params['password'],
+                domain=self.params['domain'],
+                tld_cache=self.params['tld_cache'],
+            ).lp_offered()
+
+        return self.local_presence
+
     def _contacts_permitted(self):
         # some tld's don't support contact-data
         result = TLD(
-                user=self.module.params['user'],
-                password=self.module.params['password'],
-                domain=self.module.params['domain'],
+                user=self.params['user'],
+                password=self.params['password'],
+                domain=self.params['domain'],
                 action='CONTACT UPDATE',
-                tld_cache=self.module.params['tld_cache'],
+                tld_cache=self.params['tld_cache'],
         ).contacts_permitted()
 
         if not result:
@@ -415,16 +490,20 @@ class Register:
 
         return result
 
-    def _docs_required(self, action: str, msg: str):
+    def _docs_blocked(self, order: str) -> bool:
+        # documentation is required for the order and it has not been forced
+        return not self.params['force'] and TLD(
+            user=self.params['user'],
+            password=self.params['password'],
+            domain=self.params['domain'],
+            action=self.ORDER_DOCS[order][0],
+            tld_cache=self.params['tld_cache'],
+        ).docs_required()
+
+    def _docs_required(self, order: str):
         # checking if documentation is required for the current action or it has been forced
-        if TLD(
-                user=self.module.params['user'],
-                password=self.module.params['password'],
-                domain=self.module.params['domain'],
-                action=action,
-                tld_cache=self.module.params['tld_cache'],
-        ).docs_required() and not self.module.params['force']:
-            self.result['errors'].append(msg)
+        if self._docs_blocked(order=order):
+            self.result['errors'].append(self.ORDER_DOCS[order][1])
             self.result['failed'] = True
             return True
 
@@ -445,8 +524,8 @@ class Register:
                 else:
                     self.result['diff']['before'][module_key][attribute] = None
 
-                if attribute in self.module.params[module_key]:
-                    self.result['diff']['after'][module_key][attribute] = self.module.params[module_key][attribute]
+                if attribute in self.params[module_key]:
+                    self.result['diff']['after'][module_key][attribute] = self.params[module_key][attribute]
 
                 else:
                     self.result['diff']['after'][module_key][attribute] = None
@@ -456,27 +535,212 @@ class Register:
         for value in existing_config['NameServers'].values():
             _before_nameservers.append(value[self.DIFF_COMPARE_FILTER['nameservers'][0]])
 
-        self.result['diff']['before']['nameservers'] = self._build_nameservers(ns_list=_before_nameservers)
+        self.result['diff']['before']['nameservers'] = build_nameservers(ns_list=_before_nameservers)
         self.result['diff']['after']['nameservers'] = self.nameservers
 
         if self.result['diff']['before'] != self.result['diff']['after']:
             self.result['changed'] = True
 
-    @staticmethod
-    def _build_nameservers(ns_list: list) -> dict:
-        # build nameserver-dict from supplied list
-        nameservers = {}
 
-        for i in range(1, len(ns_list) + 1):
-            _server = ns_list[i - 1]
+BULK_REQUIRED_PARAMS = ['nameservers', 'contact_owner', 'contact_tech', 'contact_admin', 'contact_billing']
+BULK_DOMAIN_PARAMS = BULK_REQUIRED_PARAMS + ['premium', 'max_price', 'whois_hide', 'update_only_ns', 'force', 'lp']
+PLAN_RESULT_FIELDS = ['changed', 'owner', 'diff', 'available', 'premium', 'price', 'price_currency']
+
+
+def _bulk_params(module: AnsibleModule) -> tuple:
+    # every entry inherits the task-level settings and can overwrite the domain-specific ones
+    #   => (domain_params, problems of invalid entries)
+    domain_params, problems = [], []
+
+    for i, entry in enumerate(module.params['domains']):
+        if isinstance(entry, str):
+            entry = {'domain': entry}
+
+        if not isinstance(entry, dict) or not isinstance(entry.get('domain'), str) or entry['domain'].strip() == '':
+            problems.append(f"Entry {i} of 'domains' has no 'domain': {entry}")
+            continue
+
+        unsupported = [key for key in entry if key != 'domain' and key not in BULK_DOMAIN_PARAMS]
+        if len(unsupported) > 0:
+            problems.append(f"Entry {i} of 'domains' ({entry['domain']}) has unsupported settings: {', '.join(unsupported)}")
+            continue
+
+        params = {**module.params, **{key: value for key, value in entry.items() if key in BULK_DOMAIN_PARAMS}}
+        params['domains'] = None
+
+        try:
+            params['domain'] = entry['domain'].encode('idna').decode('utf-8')
+
+        except UnicodeError as error:
+            problems.append(f"Entry {i} of 'domains' has an invalid domain-name '{entry['domain']}': {error}")
+            continue
+
+        domain_params.append(params)
+
+    return domain_params, problems
+
+
+def domain_response(domains: list, message: str = None) -> dict:
+    # build a successful GetDomains response from already known domains
+    return {
+        'DomainInfos': {'DomainInfo': domains},
+        'TotalCount': len(domains),
+        'Errors': {'string': []},
+        'ResultCode': api_config.RESULT_CODE_SUCCESS[0],
+        'ResultMessage': message,
+    }
+
+
+def _domains_by_name(domains: list) -> dict:
+    # built once per run => the lookup per domain does not scan the whole list
+    by_name = {}
+    for info in domains:
+        by_name.setdefault(info['DomainName'].lower(), []).append(info)
+
+    return by_name
+
+
+def _bulk_existing(domains: dict, domain: str) -> dict:
+    # build a single-domain GetDomains response from the batched one
+    #   domains: {domain-name (lower): [infos]}
+    return domain_response(domains=domains.get(domain.lower(), []))
+
 
-            if _server is not None:
-                if _server.endswith('.'):
-                    _server = _server[:-1]
+def _bulk_error(params: dict, errors: list) -> dict:
+    messages, codes = error_classifier(params['error_patterns']).classify_all(errors)
+    return {'failed': True, 'changed': False, 'errors': messages, 'error_codes': codes}
 
-                nameservers[f'NameServer{i}'] = {'HostName': _server}
 
-        return nameservers
+def _plan_domains(results: dict) -> dict:
+    # {domain: plan} of the domains that were checked successfully
+    return {
+        domain: {**result['plan'], **{key: result[key] for key in PLAN_RESULT_FIELDS}}
+        for domain, result in results.items() if 'plan' in result
+    }
+
+
+def _bulk_run(module: AnsibleModule, params: dict, existing: dict, plans: dict = None) -> dict:
+    try:
+        missing = [key for key in BULK_REQUIRED_PARAMS if params[key] is None]
+        if len(missing) > 0:
+            return _bulk_error(params=params, errors=[f"Missing settings for domain: {', '.join(missing)}"])
+
+        register = Register(module=module, params=params, existing=existing)
+
+        if module.check_mode:
+            return register.check()
+
+        if plans is not None:
+            return register.apply(plan=plans.get(params['domain']))
+
+        return register.set()
+
+    # pylint: disable=W0718
+    except Exception as error:
+        exc_type, _, _ = sys_exc_info()
+        return _bulk_error(params=params, errors=[str(exc_type), str(error), str(format_exc())])
+
+
+def _read_plan(module: AnsibleModule) -> dict:
+    try:
+        return read_plan(module.params['plan_file'])
+
+    except (OSError, ValueError) as error:
+        module.fail_json(msg=f"Unable to read the plan-file '{module.params['plan_file']}'!", errors=[str(error)])
+        return {}
+
+
+def bulk_register(module: AnsibleModule) -> dict:
+    # one batched GetDomains for all domains => the orders are processed concurrently
+    domain_params, problems = _bulk_params(module=module)
+    if len(problems) > 0:
+        module.fail_json(msg="Invalid entries in 'domains'!", errors=problems)
+
+    result = {
+        'failed': False,
+        'changed': False,
+        'errors': [],
+        'error_codes': [],
+        'msg': None,
+        'domains': {},
+        'summary': {
+            'total': len(domain_params), 'changed': 0, 'failed': 0, 'skipped': 0, 'registered': 0, 'updated': 0, 'error_codes': {},
+        },
+    }
+
+    if len(domain_params) == 0:
+        return result
+
+    names = [params['domain'] for params in domain_params]
+    domains = []
+    plans = _read_plan(module=module) if module.params['apply_plan'] else None
+
+    if module.params['index_max_age'] is not None and plans is None:
+        # owned domains can be answered from a fresh portfolio-index; unknown ones are always checked live
+        index = PortfolioIndex(user=module.params['user'], cache_dir=module.params['tld_cache'])
+
+        if index.fresh(max_age=module.params['index_max_age']):
+            domains = index.get(names=names)
+            indexed = {info['DomainName'].lower() for info in domains}
+            names = [name for name in names if name.lower() not in indexed]
+
+    if len(names) > 0:
+        response = ascio_get_domains(
+            params={
+                'user': module.params['user'],
+                'password': module.params['password'],
+                'filter_names': names,
+                'all_pages': True,
+                'exclude_fields': api_config.GET_DOMAINS_COMPARE_EXCLUDE,
+            },
+        )
+        result['msg'] = response['ResultMessage']
+
+        if response['ResultCode'] not in api_config.RESULT_CODE_SUCCESS or len(response['Errors']['string']) > 0:
+            result.update(_bulk_error(params=module.params, errors=response['Errors']['string']))
+            result['changed'] = False
+            return result
+
+        if response['DomainInfos'] is not None and response['DomainInfos'].get('DomainInfo') is not None:
+            domains.extend(response['DomainInfos']['DomainInfo'])
+
+    by_name = _domains_by_name(domains=domains)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(module.params['concurrency'], len(domain_params)))) as pool:
+        domain_results = pool.map(
+            lambda params: _bulk_run(
+                module=module,
+                params=params,
+                existing=_bulk_existing(domains=by_name, domain=params['domain']),
+                plans=plans,
+            ),
+            domain_params,
+        )
+
+        for params, domain_result in zip(domain_params, domain_results):
+            result['domains'][params['domain']] = domain_result
+
+            if domain_result['failed']:
+                result['summary']['failed'] += 1
+
+            elif domain_result.get('skipped'):
+                result['summary']['skipped'] += 1
+
+            elif domain_result['changed']:
+                result['summary']['changed'] += 1
+                result['summary']['updated' if domain_result.get('owner') else 'registered'] += 1
+
+    if module.check_mode and module.params['plan_file'] is not None:
+        write_plan(file=module.params['plan_file'], domains=_plan_domains(results=result['domains']))
+        result['plan_file'] = module.params['plan_file']
+
+    # failures grouped by their error-code
+    result['summary']['error_codes'] = count_error_codes(
+        results=[domain_result for domain_result in result['domains'].values() if domain_result['failed']]
+    )
+    result['failed'] = result['summary']['failed'] > 0
+    result['changed'] = result['summary']['changed'] > 0
+    return result
 
 
 def run_module():
@@ -484,12 +748,19 @@ def run_module():
     module_args = dict(
         user=dict(type='str', required=True),
         password=dict(type='str', required=True, no_log=True),
-        nameservers=dict(type='list', required=True),
-        contact_owner=dict(type='dict', required=True),
-        contact_tech=dict(type='dict', required=True),
-        contact_admin=dict(type='dict', required=True),
-        contact_billing=dict(type='dict', required=True),
-        domain=dict(type='str', required=True, description='Domain to register'),
+        **COMMON_ARGS,
+        nameservers=dict(type='list'),
+        contact_owner=dict(type='dict'),
+        contact_tech=dict(type='dict'),
+        contact_admin=dict(type='dict'),
+        contact_billing=dict(type='dict'),
+        domain=dict(type='str', description='Domain to register'),
+        domains=dict(
+            type='list', elements='raw',
+            description="Domains to register/update in one run; entries can be domain-names or dicts with 'domain' and "
+                        "domain-specific settings (nameservers, contact_*, premium, max_price, whois_hide, update_only_ns, force, lp)"
+        ),
+        concurrency=dict(type='int', default=5, description="How many domains of 'domains' should be processed concurrently"),
         premium=dict(type='bool', default=False, description='If premium domains should be registered (higher costs)'),
         max_price=dict(type='float', default=None, description='Set the maximal price of the domain'),
         whois_hide=dict(type='bool', default=False, description='If the contact data should be hidden in whois lookups'),
@@ -497,12 +768,64 @@ def run_module():
         force=dict(type='bool', default=False, description='Force changes if documentation is required'),
         tld_cache=dict(type='str', required=True, description='Directory used to cache the TLDKit configurations'),
         lp=dict(type='bool', default=False, description='If ascio should be used as a local presence'),
+        error_patterns=dict(
+            type='list', elements='dict', default=None,
+            options=dict(
+                code=dict(type='str', required=True),
+                pattern=dict(type='str', required=True),
+                message=dict(type='str', default=None),
+            ),
+            description="Additional error-classes as list of dicts with 'code', 'pattern' (regex) and optional 'message' "
+                        "that replaces the matched error; they are matched before the built-in ones"
+        ),
+        plan_file=dict(
+            type='path', default=None,
+            description="Check-mode writes the planned changes and a fingerprint of the observed state to this file; "
+                        "see 'apply_plan'"
+        ),
+        apply_plan=dict(
+            type='bool', default=False,
+            description="Submit the orders of the reviewed 'plan_file' => the state is only re-verified against the "
+                        "fingerprint instead of being checked again"
+        ),
+        skip_pending_orders=dict(
+            type='bool', default=True,
+            description="Skip domains that have orders in flight (recorded inside 'tld_cache'); see the 'orders' module"
+        ),
+        index_max_age=dict(
+            type='int', default=None,
+            description="Answer the lookup of owned domains from the portfolio-index (inside 'tld_cache') if it was synced "
+                        "less than this many seconds ago; see the 'get' module"
+        ),
     )
     module = AnsibleModule(
         argument_spec=module_args,
         supports_check_mode=True,
+        required_one_of=[('domain', 'domains')],
+        mutually_exclusive=[('domain', 'domains')],
+        required_by={'domain': BULK_REQUIRED_PARAMS},
+        required_if=[('apply_plan', True, ('plan_file',))],
     )
 
+    configure_common(params=module.params)
+
+    if module.params['domains'] is not None:
+        try:
+            result = bulk_register(module=module)
+
+        # pylint: disable=W0718
+        except Exception as error:
+            exc_type, _, _ = sys_exc_info()
+            module.fail_json(
+                msg='Got an error while processing the registrations!',
+                errors=[str(exc_type), str(error), str(format_exc())],
+            )
+
+        if result['failed']:
+            result['msg'] = 'The ASCIO-API returned an error!'
+
+        module.exit_json(**result, **common_result(params=module.params))
+
     # custom conversion
     module.params['domain'] = module.params['domain'].encode('idna').decode('utf-8')
 
@@ -520,6 +843,13 @@ def run_module():
         if module.check_mode:
             result = Register(module=module).check()
 
+            if module.params['plan_file'] is not None:
+                write_plan(file=module.params['plan_file'], domains=_plan_domains(results={module.params['domain']: result}), merge=True)
+                result['plan_file'] = module.params['plan_file']
+
+        elif module.params['apply_plan']:
+            result = Register(module=module).apply(plan=_read_plan(module=module).get(module.params['domain']))
+
         else:
             result = Register(module=module).set()
 
@@ -527,7 +857,7 @@ def run_module():
         if result['failed']:
             result['msg'] = 'The ASCIO-API returned an error!'
 
-        module.exit_json(**result)
+        module.exit_json(**result, **common_result(params=module.params))
 
     # pylint: disable=W0718
     except Exception as error:
@@ -0,0 +1,100 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2021, Rene Rath <rene.rath@niceshops.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.api_get_domains import ascio_get_domains
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils import config as api_config
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.module_common import COMMON_ARGS, configure_common, common_result
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.tldkit import refresh_cache
+
+# see: https://docs.ansible.com/ansible/latest/dev_guide/developing_program_flow_modules.html#ansiblemodule
+# for api see:
+#   https://tldkit.ascio.com/api/v1/Tldkit/<TLD>
+
+DOCUMENTATION = "https://github.com/niceshops/ansible-module-ascio"
+EXAMPLES = "https://github.com/niceshops/ansible-module-ascio"
+RETURN = "https://github.com/niceshops/ansible-module-ascio"
+
+
+def portfolio_tlds(module: AnsibleModule) -> list:
+    # all tlds we currently have domains registered in
+    response = ascio_get_domains(
+        params={
+            'user': module.params['user'],
+            'password': module.params['password'],
+            'all_pages': True,
+        },
+    )
+
+    if response['ResultCode'] not in api_config.RESULT_CODE_SUCCESS or len(response['Errors']['string']) > 0:
+        module.fail_json(
+            msg='The ASCIO-API returned an error!',
+            result=dict(
+                errors=response['Errors']['string'],
+                failed=True,
+            )
+        )
+
+    if response['DomainInfos'] is None or response['DomainInfos'].get('DomainInfo') is None:
+        return []
+
+    return sorted({info['DomainName'].rsplit('.', 1)[-1].lower() for info in response['DomainInfos']['DomainInfo']})
+
+
+def run_module():
+    # arguments we expect
+    module_args = dict(
+        user=dict(type='str', required=True),
+        password=dict(type='str', required=True, no_log=True),
+        **COMMON_ARGS,
+        tlds=dict(type='list', elements='str', default=[], description='TLDs to refresh; all TLDs of the portfolio if empty'),
+        tld_cache=dict(type='str', default=api_config.CACHE_DIR, description='Directory used to cache the TLDKit configurations'),
+        workers=dict(type='int', default=8, description='How many TLDs should be refreshed concurrently'),
+        force=dict(type='bool', default=False, description='Re-download the TLDKit configurations even if they were not modified'),
+    )
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True,
+    )
+
+    configure_common(params=module.params)
+    tlds = [tld.encode('idna').decode('utf-8') for tld in module.params['tlds']]
+    if len(tlds) == 0:
+        tlds = portfolio_tlds(module=module)
+
+    if module.check_mode:
+        module.exit_json(changed=False, tlds=tlds, changed_tlds=[], unchanged_tlds=[], failed_tlds={})
+
+    refreshed = refresh_cache(
+        user=module.params['user'],
+        password=module.params['password'],
+        tlds=tlds,
+        tld_cache=module.params['tld_cache'],
+        workers=module.params['workers'],
+        force=module.params['force'],
+    )
+
+    result = dict(
+        changed=len(refreshed['changed']) > 0,
+        failed=len(refreshed['failed']) > 0,
+        tlds=tlds,
+        changed_tlds=refreshed['changed'],
+        unchanged_tlds=refreshed['unchanged'],
+        failed_tlds=refreshed['failed'],
+    )
+
+    if result['failed']:
+        result['msg'] = 'Got an error while refreshing the TLDKit cache!'
+
+    module.exit_json(**result, **common_result(params=module.params))
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
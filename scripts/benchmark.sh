@@ -0,0 +1,11 @@
+#!/usr/bin/env bash
+
+set -e
+
+cd "$(dirname "$0")/.."
+
+echo ''
+echo 'RUNNING benchmarks (offline)'
+echo ''
+
+python3 benchmarks/run.py "$@"
@@ -0,0 +1,75 @@
+from os import path
+from sys import path as sys_path
+from shutil import rmtree
+from tempfile import mkdtemp
+
+import pytest
+
+# the unit-tests run against the local fake-server of the benchmarks (see: benchmarks/fake_server.py)
+#   it is started once per session before the test-modules get collected (they import the collection)
+#   and the environment is restored once the session ends
+
+BENCHMARKS_DIR = path.join(path.dirname(path.dirname(path.dirname(path.abspath(__file__)))), 'benchmarks')
+
+
+def pytest_configure(config):
+    sys_path.insert(0, BENCHMARKS_DIR)
+    import run  # noqa: E402 pylint: disable=C0415,E0401
+
+    config.ascio_tmp_dir = mkdtemp()
+    config.ascio_fake = run.FakeEnvironment(tmp_dir=config.ascio_tmp_dir, portfolio_size=50, latency=0.0)
+    config.ascio_credentials = dict(run.CREDENTIALS)
+    config.ascio_benchmarks = run
+
+
+def pytest_unconfigure(config):
+    if not hasattr(config, 'ascio_fake'):
+        return
+
+    config.ascio_fake.close()
+    rmtree(config.ascio_tmp_dir, ignore_errors=True)
+    if BENCHMARKS_DIR in sys_path:
+        sys_path.remove(BENCHMARKS_DIR)
+
+
+@pytest.fixture(scope='session')
+def credentials(pytestconfig) -> dict:
+    return pytestconfig.ascio_credentials
+
+
+@pytest.fixture(scope='session')
+def tmp_dir(pytestconfig) -> str:
+    # the directory the fake-environment keeps its state in (wsdl-cache, rate-limiter, circuit-breaker)
+    return pytestconfig.ascio_tmp_dir
+
+
+@pytest.fixture
+def register_module(pytestconfig, tmp_path):
+    # factory of module stand-ins using the register-params of the benchmarks; the supplied params overwrite them
+    def _module(check_mode: bool = True, **params):
+        benchmarks = pytestconfig.ascio_benchmarks
+        return benchmarks.FakeModule(params={**benchmarks.register_params(tmp_dir=str(tmp_path)), **params}, check_mode=check_mode)
+
+    return _module
+
+
+@pytest.fixture
+def register(register_module):  # pylint: disable=W0621
+    # factory of Register-instances => see 'register_module'
+    from ansible_collections.niceshopsorg.ascio.plugins.modules.register import Register  # pylint: disable=C0415
+
+    def _register(check_mode: bool = True, **params):
+        return Register(module=register_module(check_mode=check_mode, **params))
+
+    return _register
+
+
+@pytest.fixture
+def metrics():
+    from ansible_collections.niceshopsorg.ascio.plugins.module_utils.metrics import METRICS  # pylint: disable=C0415
+
+    METRICS.enabled = True
+    METRICS.timings.clear()
+    METRICS.counters.clear()
+    yield METRICS
+    METRICS.enabled = False
@@ -0,0 +1,17 @@
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.api_async import ascio_api_many
+
+
+def _get_domains_call(credentials: dict) -> dict:
+    return {'method': 'GetDomains', **credentials, 'request': {'PageInfo': {'PageIndex': 1, 'PageSize': 10}}}
+
+
+def test_async_calls_are_metered(metrics, credentials):
+    responses = ascio_api_many(calls=[_get_domains_call(credentials), _get_domains_call(credentials)], concurrency=2)
+    assert [response['ResultCode'] for response in responses] == [200, 200]
+
+    snapshot = metrics.snapshot()
+    for step in ['prepare', 'call', 'network', 'convert']:
+        assert snapshot['timings'][f'api.GetDomains.{step}']['count'] == 2
+
+    assert snapshot['counters']['api.GetDomains.request_bytes'] > 0
+    assert snapshot['counters']['api.GetDomains.response_bytes'] > 0
@@ -0,0 +1,47 @@
+from time import sleep
+
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils import api_get_domains
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.api_get_domains import ascio_get_domains
+
+PAGES = {
+    1: ['a.com', 'b.com'],
+    2: ['c.com', 'd.com'],
+    3: ['d.com', 'e.com'],  # 'd.com' moved to the next page as a domain was added while paging
+    4: ['f.com'],
+}
+
+
+def _fake_page(parameters: dict, page: int) -> dict:  # pylint: disable=W0613
+    # earlier pages answer slower => the pages finish out of order
+    sleep((len(PAGES) - page) * 0.02)
+    return {
+        'DomainInfos': {'DomainInfo': [{'DomainName': name} for name in PAGES[page]]}, 'TotalCount': 7,
+        'Errors': {'string': []}, 'ResultCode': 200, 'ResultMessage': None,
+    }
+
+
+def test_pages_are_merged_in_order_without_duplicates(monkeypatch, credentials):
+    monkeypatch.setattr(api_get_domains, '_get_page', _fake_page)
+    response = ascio_get_domains(params={**credentials, 'all_pages': True, 'results': 2, 'page_workers': 3})
+
+    assert [info['DomainName'] for info in response['DomainInfos']['DomainInfo']] == ['a.com', 'b.com', 'c.com', 'd.com', 'e.com', 'f.com']
+
+
+def test_streamed_pages_are_passed_in_order_without_duplicates(monkeypatch, credentials):
+    monkeypatch.setattr(api_get_domains, '_get_page', _fake_page)
+    pages = []
+    response = ascio_get_domains(
+        params={**credentials, 'all_pages': True, 'results': 2, 'page_workers': 3},
+        page_callback=lambda domains: pages.append([info['DomainName'] for info in domains]),
+    )
+
+    assert response['DomainInfos'] is None
+    assert pages == [['a.com', 'b.com'], ['c.com', 'd.com'], ['e.com'], ['f.com']]
+
+
+def test_all_pages_of_the_fake_server(credentials):
+    response = ascio_get_domains(params={**credentials, 'all_pages': True, 'results': 7, 'page_workers': 4})
+    names = [info['DomainName'] for info in response['DomainInfos']['DomainInfo']]
+
+    assert len(names) == response['TotalCount'] == 50
+    assert names == [f'domain{i:06d}.{name.rsplit(".", 1)[1]}' for i, name in enumerate(names)]
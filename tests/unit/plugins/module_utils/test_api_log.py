@@ -0,0 +1,10 @@
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.api_log import ApiLog
+
+
+def test_invalid_environment_falls_back_to_the_defaults(monkeypatch):
+    monkeypatch.setenv('ASCIO_API_LOG', 'verbose')
+    monkeypatch.setenv('ASCIO_API_LOG_SAMPLE_RATE', 'half')
+    api_log = ApiLog()
+
+    assert api_log.settings['mode'] == 'off'
+    assert api_log.settings['sample_rate'] == 0.1
@@ -0,0 +1,21 @@
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.api_availability import AvailabilityCache, ascio_get_availability_many
+
+
+def test_only_uncached_domains_are_checked(tmp_path, credentials, metrics):
+    cache = AvailabilityCache(user=credentials['user'], cache_dir=str(tmp_path))
+    first = ascio_get_availability_many(**credentials, domains=['free-1.com', 'domain000001.net'], cache=cache)
+    assert [result['available'] for result in first.values()] == [True, False]
+    assert not any(result['cached'] for result in first.values())
+
+    second = ascio_get_availability_many(**credentials, domains=['domain000001.net', 'free-1.com', 'free-2.com'], cache=cache)
+    assert list(second) == ['domain000001.net', 'free-1.com', 'free-2.com']
+    assert [result['cached'] for result in second.values()] == [True, True, False]
+    assert metrics.snapshot()['timings']['api.AvailabilityInfo.call']['count'] == 3
+
+
+def test_accounts_do_not_share_the_cache(tmp_path, credentials):
+    ascio_get_availability_many(
+        **credentials, domains=['free-1.com'], cache=AvailabilityCache(user=credentials['user'], cache_dir=str(tmp_path)),
+    )
+
+    assert AvailabilityCache(user='other-account', cache_dir=str(tmp_path)).get(domains=['free-1.com']) == {}
@@ -0,0 +1,117 @@
+from asyncio import run as asyncio_run
+
+import pytest
+from ansible.module_utils.common.warnings import get_warning_messages
+from requests.exceptions import ConnectTimeout, ReadTimeout
+from zeep.exceptions import TransportError
+
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils import call_policy
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils import config as api_config
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.call_policy import RateLimiter, backoff, call_with_retry, \
+    call_with_retry_async, retryable
+
+UNLIMITED = RateLimiter(name='test', rate=0, burst=1)
+
+
+class _Flaky:
+    # fails the first 'failures' calls
+    def __init__(self, failures: int, error: Exception):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+
+        return 'ok'
+
+
+@pytest.fixture(name='sleeps')
+def _sleeps(monkeypatch) -> list:
+    slept = []
+    monkeypatch.setattr(call_policy, 'sleep', slept.append)
+    return slept
+
+
+def test_only_transient_faults_are_retried():
+    assert retryable(TransportError(status_code=503)) is True
+    assert retryable(TransportError(status_code=400)) is False
+    assert retryable(ReadTimeout()) is True
+
+    # orders are only re-sent if they can not have been processed
+    assert retryable(TransportError(status_code=500), idempotent=False) is False
+    assert retryable(TransportError(status_code=429), idempotent=False) is True
+    assert retryable(ReadTimeout(), idempotent=False) is False
+    assert retryable(ConnectTimeout(), idempotent=False) is True
+
+
+def test_backoff_is_bounded():
+    for attempt in range(1, 12):
+        limit = min(api_config.CALL_BACKOFF_MAX, api_config.CALL_BACKOFF_BASE * 2 ** (attempt - 1))
+        assert all(0 <= backoff(attempt) <= limit for _ in range(50))
+
+
+def test_transient_faults_are_retried_with_backoff(sleeps, metrics):
+    func = _Flaky(failures=2, error=TransportError(status_code=503))
+
+    assert call_with_retry(name='api.Test', func=func, limiter=UNLIMITED) == 'ok'
+    assert func.calls == 3
+    assert len(sleeps) == 2
+    assert metrics.snapshot()['counters']['api.Test.retries'] == 2
+
+
+def test_retries_are_limited(sleeps):
+    func = _Flaky(failures=call_policy.CALL_RETRIES + 1, error=TransportError(status_code=503))
+
+    with pytest.raises(TransportError):
+        call_with_retry(name='api.Test', func=func, limiter=UNLIMITED)
+
+    assert func.calls == call_policy.CALL_RETRIES + 1
+    assert len(sleeps) == call_policy.CALL_RETRIES
+
+
+def test_permanent_faults_are_not_retried(sleeps):
+    func = _Flaky(failures=1, error=TransportError(status_code=400))
+
+    with pytest.raises(TransportError):
+        call_with_retry(name='api.Test', func=func, limiter=UNLIMITED)
+
+    assert func.calls == 1
+    assert sleeps == []
+
+
+def test_async_calls_are_retried(monkeypatch):
+    async def _no_sleep(_):
+        return None
+
+    monkeypatch.setattr(call_policy, 'asyncio_sleep', _no_sleep)
+    func = _Flaky(failures=1, error=TransportError(status_code=502))
+
+    async def _call():
+        return func()
+
+    assert asyncio_run(call_with_retry_async(name='api.Test', coroutine_func=_call, limiter=UNLIMITED)) == 'ok'
+    assert func.calls == 2
+
+
+def test_token_bucket_is_shared_by_processes(tmp_path):
+    limiter = RateLimiter(name='test', rate=10, burst=2, state_dir=str(tmp_path))
+    assert [limiter.reserve() for _ in range(2)] == [0.0, 0.0]
+
+    # another fork uses the same state => it has to wait for the tokens already taken
+    other = RateLimiter(name='test', rate=10, burst=2, state_dir=str(tmp_path))
+    assert 0.08 < other.reserve() <= 0.1
+    assert 0.18 < limiter.reserve() <= 0.2
+
+
+def test_unwritable_state_disables_the_limiter(tmp_path, metrics):
+    blocking_file = tmp_path / 'state'
+    blocking_file.write_text('not a directory', encoding='utf-8')
+    limiter = RateLimiter(name='test', rate=1, burst=1, state_dir=str(blocking_file))
+
+    assert [limiter.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.disabled is True
+    assert metrics.snapshot()['counters']['ratelimit.test.disabled'] == 1
+    assert any("Rate-limiting of the 'test' calls is disabled" in message for message in get_warning_messages())
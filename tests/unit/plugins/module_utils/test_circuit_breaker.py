@@ -0,0 +1,10 @@
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.api_base import error_response
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.circuit_breaker import CircuitBreaker
+
+
+def test_failed_authentication_does_not_block_other_passwords(tmp_path):
+    breaker = CircuitBreaker(cooldown=900, state_dir=str(tmp_path))
+    breaker.record(user='account', password='mistyped', response=error_response(errors=['Authentication failed']))
+
+    assert breaker.open_state(user='account', password='mistyped')['reason'] == 'auth_failed'
+    assert breaker.open_state(user='account', password='correct') is None
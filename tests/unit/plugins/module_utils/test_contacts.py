@@ -0,0 +1,29 @@
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.contacts import ContactRules
+
+CONFIG = {
+    'contact_keys': ['owner', 'billing'],
+    'fields': {
+        'company': {'owner': ['FirstName', 'Email', 'OrgName', 'Type'], 'all': ['FirstName', 'Email', 'Type']},
+        'person': {'owner': ['FirstName', 'Email', 'Type'], 'all': ['FirstName', 'Email', 'Type']},
+    },
+    'country_overrides': {'it': {'company': {'all': {'Type': '7'}}}},
+    'default': {
+        'type': 'company',
+        'all': {'FirstName': 'Max', 'Email': 'domains@example.org', 'OrgName': 'Example'},
+        'billing': {'Email': 'billing@example.org'},
+    },
+}
+
+
+def test_supplied_values_overrule_the_role_defaults_of_the_config():
+    contacts, _ = ContactRules(config=CONFIG).contacts(tld='org', entity='company', custom={'all': {'Email': 'me@example.org'}})
+
+    assert contacts['contact_billing']['Email'] == 'me@example.org'
+    assert contacts['contact_owner']['Email'] == 'me@example.org'
+
+
+def test_role_defaults_apply_without_supplied_values():
+    contacts, _ = ContactRules(config=CONFIG).contacts(tld='it', entity='company')
+
+    assert contacts['contact_billing'] == {'FirstName': 'Max', 'Email': 'billing@example.org', 'Type': '7'}
+    assert contacts['contact_owner']['OrgName'] == 'Example'
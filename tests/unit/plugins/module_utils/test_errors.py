@@ -0,0 +1,25 @@
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.errors import DEFAULT_CLASSIFIER, UNKNOWN_ERROR, error_classifier
+
+
+def test_custom_class_overrides_built_in():
+    classifier = error_classifier(error_patterns=[{'code': 'blocked', 'pattern': 'blocked', 'message': 'Account blocked!'}])
+
+    assert classifier.classify('Partner 123 blocked') == ('blocked', 'Account blocked!')
+
+
+def test_custom_class_wins_over_earlier_match_in_message():
+    classifier = error_classifier(error_patterns=[{'code': 'same_object', 'pattern': 'on same object'}])
+    error = "Order rejected because of 'Register' order 'TEST123' on same object"
+
+    assert classifier.classify(error) == ('same_object', error)
+
+
+def test_table_order_decides():
+    # 'pending' comes before 'update_pending' in the table, even if it is found later in the message
+    error = "Order rejected because of 'Register' order 'TEST123' on same object: FO405"
+
+    assert DEFAULT_CLASSIFIER.classify(error)[0] == 'pending'
+
+
+def test_unknown_error():
+    assert DEFAULT_CLASSIFIER.classify('Something else') == (UNKNOWN_ERROR, 'Something else')
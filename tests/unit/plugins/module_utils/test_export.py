@@ -0,0 +1,32 @@
+from csv import DictReader
+
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.export import DomainExport
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.projection import DomainProjection
+
+
+def _domain(name: str, email: str) -> dict:
+    return {
+        'DomainName': name,
+        'Status': 'ACTIVE',
+        'Owner': {'Email': email, 'Phone': '+43.1234567'},
+        'NameServers': {
+            'NameServer1': {'HostName': 'ns1.example.net', 'IpAddress': None, 'IpV6Address': None},
+            'NameServer2': {'HostName': 'ns2.example.net', 'IpAddress': None, 'IpV6Address': None},
+        },
+    }
+
+
+def test_csv_flattens_nested_fields(tmp_path):
+    csv_file = tmp_path / 'domains.csv'
+    projection = DomainProjection(keep_fields=['Owner.Email', 'NameServers', 'Status'])
+
+    with DomainExport(csv_file=str(csv_file), projection=projection) as export:
+        export.write_page([_domain('example.org', 'a@example.org'), _domain('example.net', 'b@example.org')])
+
+    with open(csv_file, 'r', encoding='utf-8') as exported:
+        rows = list(DictReader(exported))
+
+    assert list(rows[0].keys()) == ['DomainName', 'Owner.Email', 'NameServers', 'Status']
+    assert rows[0]['Owner.Email'] == 'a@example.org'
+    assert rows[0]['NameServers'] == 'ns1.example.net;ns2.example.net'
+    assert rows[1]['DomainName'] == 'example.net'
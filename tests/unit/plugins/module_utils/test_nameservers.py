@@ -0,0 +1,57 @@
+from json import loads as json_loads
+
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.nameservers import NameserverMigration
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.tldkit import TLD
+
+
+def _params(tmp_path, credentials: dict, **params) -> dict:
+    return {
+        **credentials, 'nameservers': ['ns1.other.net', 'ns2.other.net'], 'domains': None, 'filter': None, 'all': False,
+        'tld_cache': str(tmp_path), 'skip_pending_orders': False, 'force': False, 'concurrency': 4, 'batch_size': 2,
+        'progress_file': None, **params,
+    }
+
+
+def test_only_differing_nameservers_are_changed(tmp_path, credentials):
+    # the fake-server returns ns1/ns2.example.net for all domains; trailing dots are ignored
+    domains = ['domain000001.net', 'domain000002.org', 'missing.com']
+    migration = NameserverMigration(params=_params(tmp_path, credentials, domains=domains), check_mode=True)
+    assert migration.run()['changed'] is True
+    assert migration.domains['domain000001.net']['diff'] == {
+        'before': ['ns1.example.net', 'ns2.example.net'], 'after': ['ns1.other.net', 'ns2.other.net'],
+    }
+    assert migration.domains['missing.com']['failed'] is True
+
+    unchanged = NameserverMigration(
+        params=_params(tmp_path, credentials, domains=domains, nameservers=['ns1.example.net.', 'ns2.example.net']), check_mode=True,
+    )
+    unchanged.run()
+    assert unchanged.summary['unchanged'] == 2
+    assert unchanged.summary['changed'] == 0
+
+
+def test_docs_are_checked_per_tld(tmp_path, credentials, monkeypatch):
+    monkeypatch.setattr(TLD, 'docs_required', lambda self: self.tld == 'it')
+    domains = ['domain000001.net', 'domain000005.it', 'domain000013.it']
+    migration = NameserverMigration(params=_params(tmp_path, credentials, domains=domains))
+    migration.run()
+
+    assert migration.domains['domain000001.net']['order'] is not None
+    assert [migration.domains[name]['error_codes'] for name in domains[1:]] == [['docs_required'], ['docs_required']]
+    assert migration.summary['submitted'] == 1
+
+    forced = NameserverMigration(params=_params(tmp_path, credentials, domains=domains, force=True))
+    forced.run()
+    assert forced.summary['submitted'] == 3
+
+
+def test_progress_is_written_per_batch(tmp_path, credentials):
+    progress_file = str(tmp_path / 'progress.json')
+    domains = ['domain000001.net', 'domain000002.org', 'domain000003.de']
+    NameserverMigration(params=_params(tmp_path, credentials, domains=domains, progress_file=progress_file, batch_size=2)).run()
+
+    with open(progress_file, 'r', encoding='utf-8') as progress:
+        state = json_loads(progress.read())
+
+    assert state['orders_processed'] == state['orders_total'] == 3
+    assert state['submitted'] == 3
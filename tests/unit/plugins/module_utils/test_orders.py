@@ -0,0 +1,46 @@
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils import config as api_config
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.orders import OrderLedger, pending_orders, poll_orders
+
+
+def _ledger(tmp_path, credentials: dict) -> OrderLedger:
+    ledger = OrderLedger(user=credentials['user'], cache_dir=str(tmp_path))
+    ledger.record_many(orders=[
+        ('example.com', 'Register', {'OrderId': 'TEST1', 'Status': 'Received'}),
+        ('example.net', 'Register', {'OrderId': 'TEST2', 'Status': 'Completed'}),
+    ])
+    return ledger
+
+
+def test_only_unfinished_orders_are_in_flight(tmp_path, credentials):
+    ledger = _ledger(tmp_path=tmp_path, credentials=credentials)
+
+    assert [order['order_id'] for order in ledger.in_flight()] == ['TEST1']
+    assert ledger.in_flight(names=['EXAMPLE.net']) == []
+    assert OrderLedger(user='other-account', cache_dir=str(tmp_path)).in_flight() == []
+
+
+def test_polled_orders_are_finalized(tmp_path, credentials):
+    ledger = _ledger(tmp_path=tmp_path, credentials=credentials)
+    result = poll_orders(
+        params={**credentials, 'concurrency': 2, 'interval': 0, 'timeout': 0, 'domains': None, 'order_ids': None}, ledger=ledger,
+    )
+
+    assert result['orders']['TEST1']['status'] == 'Completed'
+    assert result['rounds'] == 1
+    assert ledger.in_flight() == []
+
+
+def test_recently_recorded_orders_are_not_polled(tmp_path, credentials, metrics):
+    ledger = _ledger(tmp_path=tmp_path, credentials=credentials)
+
+    assert [order['order_id'] for order in pending_orders(**credentials, ledger=ledger)] == ['TEST1']
+    assert 'api.GetOrder.call' not in metrics.snapshot()['timings']
+
+
+def test_stale_orders_completed_outside_the_ledger_are_rechecked(tmp_path, credentials, monkeypatch):
+    # the order finished without the 'orders' module polling it => it must not block its domain for days
+    ledger = _ledger(tmp_path=tmp_path, credentials=credentials)
+    monkeypatch.setattr(api_config, 'ORDER_RECHECK_AGE', -1)
+
+    assert pending_orders(**credentials, ledger=ledger, names=['example.com']) == []
+    assert ledger.in_flight() == []
@@ -0,0 +1,17 @@
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.plan import read_plan, write_plan
+
+
+def test_single_domain_plans_are_merged(tmp_path):
+    plan_file = str(tmp_path / 'plan.json')
+    write_plan(file=plan_file, domains={'example.org': {'orders': ['Register']}}, merge=True)
+    write_plan(file=plan_file, domains={'example.net': {'orders': []}}, merge=True)
+
+    assert set(read_plan(plan_file)) == {'example.org', 'example.net'}
+
+
+def test_bulk_plan_replaces_the_existing_one(tmp_path):
+    plan_file = str(tmp_path / 'plan.json')
+    write_plan(file=plan_file, domains={'example.org': {'orders': ['Register']}})
+    write_plan(file=plan_file, domains={'example.net': {'orders': []}})
+
+    assert set(read_plan(plan_file)) == {'example.net'}
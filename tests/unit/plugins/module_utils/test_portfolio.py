@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta, timezone
+
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.portfolio import PortfolioIndex
+
+
+def _info(name: str, expires_in: int) -> dict:
+    now = datetime.now(tz=timezone.utc)
+    return {'DomainName': name, 'Created': (now - timedelta(days=10)).isoformat(), 'Expires': (now + timedelta(days=expires_in)).isoformat()}
+
+
+def _response(domains: list) -> dict:
+    return {'ResultCode': 200, 'Errors': {'string': []}, 'DomainInfos': {'DomainInfo': domains}}
+
+
+class _FakeApi:
+    # 'renewed.com' got renewed and 'expired.com' left the account since the full sync => both fell out of the expiry-slice
+    def __init__(self):
+        self.calls = []
+
+    def fetch(self, password: str, params: dict) -> dict:  # pylint: disable=W0613
+        self.calls.append(params)
+
+        if 'filter_names' in params:
+            return _response([_info('renewed.com', 370)])
+
+        if 'filter_expire_from' in params:
+            return _response([])
+
+        if 'filter_creation_from' in params:
+            return _response([_info('new.com', 365)])
+
+        return _response([_info('renewed.com', 5), _info('expired.com', 3), _info('later.com', 200)])
+
+
+def test_incremental_sync_rechecks_expiring_domains(tmp_path, monkeypatch):
+    index = PortfolioIndex(user='account', cache_dir=str(tmp_path))
+    api = _FakeApi()
+    monkeypatch.setattr(index, '_fetch', api.fetch)
+
+    assert index.sync(password='secret')['full'] is True
+    result = index.sync(password='secret')
+
+    assert result == {'full': False, 'fetched': 2, 'errors': []}
+    assert [call for call in api.calls if 'filter_creation_from' in call]
+    assert sorted(api.calls[-1]['filter_names']) == ['expired.com', 'renewed.com']
+    assert [info['DomainName'] for info in index.query()] == ['later.com', 'new.com', 'renewed.com']
+    renewed = datetime.fromisoformat(index.get(names=['renewed.com'])[0]['Expires'])
+    assert renewed > datetime.now(tz=timezone.utc) + timedelta(days=300)
+
+
+def test_accounts_do_not_share_the_index(tmp_path, monkeypatch):
+    index = PortfolioIndex(user='account', cache_dir=str(tmp_path))
+    monkeypatch.setattr(index, '_fetch', _FakeApi().fetch)
+    index.sync(password='secret')
+
+    other = PortfolioIndex(user='other-account', cache_dir=str(tmp_path))
+    assert other.fresh(max_age=3600) is False
+    assert other.query() == []
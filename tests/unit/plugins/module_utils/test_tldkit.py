@@ -0,0 +1,63 @@
+from json import dumps as json_dumps
+from os import utime
+from time import time
+
+from requests import Session
+
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.tldkit import TLD, MAX_CACHE_AGE
+
+
+def _legacy_document(tmp_path, tld: str, age_days: float, lp_offered: bool) -> float:
+    # raw document as cached by older versions (<tld>.json)
+    document = tmp_path / f'{tld}.json'
+    document.write_text(json_dumps({
+        'LocalPresenceOffered': lp_offered,
+        'LocalPresenceRequired': False,
+        'Processes': [
+            {'Command': 'OWNER CHANGE', 'DocumentationRequired': True, 'Procedure': 'Send the documents.'},
+            {'Command': 'CONTACT UPDATE', 'DocumentationRequired': False, 'Procedure': 'Contact roles does not exist'},
+        ],
+    }), encoding='utf-8')
+    modified = time() - age_days * 86400
+    utime(document, (modified, modified))
+    return modified
+
+
+def test_unchanged_document_is_not_compiled_again(tmp_path, credentials):
+    tld = TLD(**credentials, domain='example.com', tld_cache=str(tmp_path))
+    with Session() as session:
+        assert tld.refresh(session=session) is True
+
+        # server-side validators got lost => the full document is sent again; the marker shows it was not re-compiled
+        entry = tld.store.get('com')
+        rules = {**entry['rules'], 'marker': True}
+        tld.store.put(tld='com', rules=rules, content_hash=entry['sha256'], updated=entry['updated'] - 3600)
+        assert tld.refresh(session=session) is False
+
+    refreshed = tld.store.get('com')
+    assert refreshed['rules'] == rules
+    assert refreshed['updated'] > entry['updated']
+    assert refreshed['etag'] is not None
+
+
+def test_legacy_documents_are_migrated_without_downloading_them(tmp_path, credentials):
+    # the fake-server does not know the tld => a download would fail
+    modified = _legacy_document(tmp_path=tmp_path, tld='xy', age_days=3, lp_offered=True)
+    tld = TLD(**credentials, domain='example.xy', action='OWNER CHANGE', tld_cache=str(tmp_path))
+
+    assert tld.docs_required() is True
+    assert tld.contacts_permitted() is False
+    assert tld.lp_offered() is True
+
+    entry = tld.store.get('xy')
+    assert entry['rules']['docs_required'] == {'OWNER CHANGE': True, 'CONTACT UPDATE': False}
+    assert abs(entry['updated'] - modified) < 1  # keeps the age of the document
+
+
+def test_outdated_legacy_documents_are_downloaded_again(tmp_path, credentials):
+    _legacy_document(tmp_path=tmp_path, tld='de', age_days=MAX_CACHE_AGE + 2, lp_offered=False)
+    tld = TLD(**credentials, domain='example.de', action='OWNER CHANGE', tld_cache=str(tmp_path))
+
+    assert tld.lp_offered() is True
+    assert tld.docs_required() is False
+    assert tld.store.get('de')['updated'] > time() - 60
@@ -0,0 +1,12 @@
+from ansible_collections.niceshopsorg.ascio.plugins.modules.get import export_check
+
+
+def test_unwritable_export_is_reported_with_its_path(tmp_path, credentials):
+    blocking_file = tmp_path / 'exports'
+    blocking_file.write_text('not a directory', encoding='utf-8')
+    csv_file = str(blocking_file / 'domains.csv')
+
+    result = export_check(params={**credentials, 'all_pages': True, 'export_csv': csv_file})
+
+    assert result['failed'] is True
+    assert csv_file in result['msg']
@@ -0,0 +1,79 @@
+import pytest
+
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.orders import OrderLedger
+from ansible_collections.niceshopsorg.ascio.plugins.module_utils.tldkit import TLD
+from ansible_collections.niceshopsorg.ascio.plugins.modules.register import PLAN_RESULT_FIELDS, bulk_register, _bulk_params
+
+
+def test_domains_with_orders_in_flight_are_skipped(register, tmp_path, credentials):
+    OrderLedger(user=credentials['user'], cache_dir=str(tmp_path)).record(
+        domain='domain000001.net', order_type='NameserverUpdate', order_info={'OrderId': 'TEST1', 'Status': 'Received'},
+    )
+    result = register(skip_pending_orders=True, nameservers=['ns1.other.net', 'ns2.other.net']).check()
+
+    assert result['skipped'] is True
+    assert [order['order_id'] for order in result['pending_orders']] == ['TEST1']
+    assert result['changed'] is False
+
+
+def test_apply_submits_the_planned_orders_without_tldkit_lookups(register, tmp_path, metrics):
+    plan_file = str(tmp_path / 'plan.json')
+    nameservers = ['ns1.other.net', 'ns2.other.net']
+    checked = register(plan_file=plan_file, nameservers=nameservers).check()
+    plan = {**checked['plan'], **{key: checked[key] for key in PLAN_RESULT_FIELDS}}
+    assert plan['orders'][0] == 'NameserverUpdate'
+
+    metrics.counters.clear()
+    result = register(check_mode=False, nameservers=nameservers).apply(plan={**plan, 'orders': ['NameserverUpdate']})
+
+    assert result['failed'] is False
+    assert [order['Type'] for order in result['orders']] == ['NameserverUpdate']
+    assert not [name for name in metrics.snapshot()['counters'] if name.startswith('tldkit.')]
+
+
+def test_owner_is_not_deferred_by_a_contact_update_that_needs_documentation(register, monkeypatch):
+    # the contact-update is not sent => the owner-update has nothing to wait for
+    monkeypatch.setattr(TLD, 'docs_required', lambda self: self.action == 'CONTACT UPDATE')
+    result = register(check_mode=False, domain='domain000003.de').set()
+
+    submitted = [order['Type'] for order in result['orders']]
+    assert 'ContactUpdate' not in submitted
+    assert 'OwnerChange' in submitted or 'RegistrantDetailsUpdate' in submitted
+    assert result['error_codes'] == ['docs_required']
+
+
+def test_bulk_entries_are_validated(register_module):
+    module = register_module(domains=[
+        'domain000001.net',
+        {'domain': 'bücher.de', 'force': True},
+        {'domain': ''},
+        ['not', 'a', 'dict'],
+        {'domain': 'example.com', 'contacts': {}},
+        {'domain': 'a..com'},
+    ])
+    domain_params, problems = _bulk_params(module=module)
+
+    assert [params['domain'] for params in domain_params] == ['domain000001.net', 'xn--bcher-kva.de']
+    assert domain_params[1]['force'] is True and domain_params[0]['force'] is False
+    assert [problem.split(' ', 2)[1] for problem in problems] == ['2', '3', '4', '5']
+    assert 'unsupported settings: contacts' in problems[2]
+
+
+def test_bulk_run_fails_on_invalid_entries(register_module):
+    with pytest.raises(RuntimeError, match="Invalid entries in 'domains'"):
+        bulk_register(module=register_module(domains=['domain000001.net', {'domain': ''}], concurrency=2))
+
+
+def test_bulk_run_summarizes_the_domains(register_module):
+    result = bulk_register(module=register_module(
+        domains=['domain000001.net', 'free-domain.com', {'domain': 'domain000002.org', 'update_only_ns': True}], concurrency=2,
+        nameservers=['ns1.other.net', 'ns2.other.net'],
+    ))
+
+    assert list(result['domains']) == ['domain000001.net', 'free-domain.com', 'domain000002.org']
+    assert result['domains']['domain000001.net']['owner'] is True
+    assert result['domains']['free-domain.com']['available'] is True
+    assert result['summary']['total'] == 3
+    assert result['summary']['changed'] == 3
+    assert result['summary']['updated'] == 2
+    assert result['summary']['registered'] == 1